@@ -1,20 +1,14 @@
 import streamlit as st
-import pdfplumber
-import re
-import unicodedata
-from datetime import datetime, timedelta
-import pandas as pd
-import hashlib
-import json
-import time
-import sqlite3
-import secrets
-import string
-from typing import Optional, Tuple, List, Dict, Any
+import html
 import hmac
-import numpy as np
-from difflib import SequenceMatcher
-import math
+from datetime import datetime
+from typing import Optional, Tuple
+
+from burocrata import autenticacao
+
+# Módulos pesados (pdfplumber, pandas, numpy e o motor de detecção) são importados
+# no primeiro uso: o Streamlit reexecuta este script a cada interação e a tela de
+# login não precisa de nenhum deles (perfil: python -m benchmarks.importacao)
 
 # --------------------------------------------------
 # CONFIGURAÇÃO DE PÁGINA
@@ -112,1087 +106,41 @@ st.markdown(hide_streamlit_style, unsafe_allow_html=True)
 # --------------------------------------------------
 
 class SistemaCriptografia:
-    """Sistema de criptografia ultra seguro"""
+    """Sistema de criptografia ultra seguro
+    
+    O cálculo fica em burocrata.autenticacao; no app, logins passam pelo
+    serviço compartilhado (obter_servico_autenticacao), que limita quantos
+    hashes rodam ao mesmo tempo e atualiza o custo das senhas antigas.
+    """
     
     @staticmethod
     def gerar_salt():
         """Gera salt aleatório de 32 bytes"""
-        return secrets.token_hex(32)
+        return autenticacao.gerar_salt()
     
     @staticmethod
     def hash_senha(senha: str, salt: Optional[str] = None) -> Tuple[str, str]:
-        """Cria hash ultra seguro com 1.000.000 iterações"""
+        """Cria hash ultra seguro com 1.000.000 iterações (formato antigo: hash e salt separados)"""
         if salt is None:
             salt = SistemaCriptografia.gerar_salt()
         
-        senha_bytes = senha.encode('utf-8')
-        salt_bytes = salt.encode('utf-8')
-        
-        hash_bytes = hashlib.pbkdf2_hmac(
-            'sha512',
-            senha_bytes,
-            salt_bytes,
-            1000000,
-            dklen=64
-        )
-        
-        hash_hex = hash_bytes.hex()
-        return hash_hex, salt
+        return autenticacao.derivar(senha, salt, autenticacao.ITERACOES_PADRAO), salt
     
     @staticmethod
     def verificar_senha(senha: str, hash_armazenado: str, salt: str) -> bool:
         """Verificação ultra segura"""
         novo_hash, _ = SistemaCriptografia.hash_senha(senha, salt)
         return hmac.compare_digest(novo_hash, hash_armazenado)
-
-# --------------------------------------------------
-# SISTEMA DE DETECÇÃO SUPER AVANÇADO
-# --------------------------------------------------
-
-class SistemaDetecçãoAvancado:
-    """Sistema de detecção com eficiência máxima"""
-    
-    def __init__(self):
-        self.padroes = self._carregar_padroes_completos()
-        self.cache_deteccoes = {}
-        self.contador_analises = 0
-        
-    def _limpar_texto_profundo(self, texto):
-        """Limpeza ultra profunda"""
-        if not texto:
-            return ""
-        
-        # Remover todos os caracteres inválidos
-        texto = re.sub(r'[\x00-\x08\x0b\x0c\x0e-\x1f\x7f-\x9f\u200b-\u200f\u2028-\u202f]', '', texto)
-        
-        # Remover caracteres especiais do PDF
-        caracteres_invalidos = [
-            '', '', '', '', '', '', '', '', '', '',
-            '', '', '', '', '', '', '', '', '', '',
-            '', '', '', '', '', '', '', '', '', ''
-        ]
-        for char in caracteres_invalidos:
-            texto = texto.replace(char, ' ')
-        
-        # Normalização avançada
-        texto = texto.lower()
-        texto = unicodedata.normalize('NFKD', texto)
-        texto = ''.join([c for c in texto if not unicodedata.combining(c)])
-        
-        # Remover espaços múltiplos e normalizar
-        texto = re.sub(r'\s+', ' ', texto)
-        texto = re.sub(r'[\r\n\t]+', ' ', texto)
-        
-        return texto.strip()
-    
-    def _extrair_valores_monetarios_completos(self, texto):
-        """Extrai TODOS os valores monetários com precisão máxima"""
-        padroes_valores = [
-            # R$ 1.234,56
-            r'R\$\s*(\d{1,3}(?:\.\d{3})*(?:,\d{2})?)',
-            # R$1.234,56
-            r'R\$(\d{1,3}(?:\.\d{3})*(?:,\d{2})?)',
-            # 1.234,56 reais
-            r'(\d{1,3}(?:\.\d{3})*(?:,\d{2})?)\s*reais',
-            # valor de 1.234,56
-            r'valor\s*(?:de\s*)?(\d{1,3}(?:\.\d{3})*(?:,\d{2})?)',
-            # US$ 1,234.56
-            r'US\$\s*(\d{1,3}(?:,\d{3})*(?:\.\d{2})?)',
-            # € 1.234,56
-            r'€\s*(\d{1,3}(?:\.\d{3})*(?:,\d{2})?)',
-            # salário: R$ 1.234,56
-            r'sal[áa]rio\s*[:\-]?\s*R?\$?\s*(\d{1,3}(?:\.\d{3})*(?:,\d{2})?)',
-            # aluguel: R$ 1.234,56
-            r'aluguel\s*[:\-]?\s*R?\$?\s*(\d{1,3}(?:\.\d{3})*(?:,\d{2})?)',
-            # multa: R$ 1.234,56
-            r'multa\s*[:\-]?\s*R?\$?\s*(\d{1,3}(?:\.\d{3})*(?:,\d{2})?)',
-        ]
-        
-        valores = []
-        for padrao in padroes_valores:
-            for match in re.finditer(padrao, texto, re.IGNORECASE):
-                valor_str = match.group(1)
-                try:
-                    # Converter para float
-                    if ',' in valor_str and '.' in valor_str:
-                        # Formato 1.234,56
-                        valor_str = valor_str.replace('.', '').replace(',', '.')
-                    elif ',' in valor_str:
-                        # Formato 1,234.56 (US)
-                        valor_str = valor_str.replace(',', '')
-                    
-                    valor = float(valor_str)
-                    valores.append({
-                        'valor': valor,
-                        'texto': match.group(0),
-                        'posicao': match.start(),
-                        'tipo': self._identificar_tipo_valor(match.group(0))
-                    })
-                except:
-                    continue
-        
-        return valores
-    
-    def _identificar_tipo_valor(self, texto_valor):
-        """Identifica o tipo de valor monetário"""
-        texto = texto_valor.lower()
-        if 'salário' in texto or 'salario' in texto:
-            return 'salario'
-        elif 'aluguel' in texto:
-            return 'aluguel'
-        elif 'multa' in texto:
-            return 'multa'
-        elif 'caução' in texto or 'cauçao' in texto or 'garantia' in texto:
-            return 'caução'
-        elif 'honorário' in texto or 'honorario' in texto:
-            return 'honorário'
-        else:
-            return 'valor_genérico'
-    
-    def _extrair_datas_completas(self, texto):
-        """Extrai TODAS as datas com precisão máxima"""
-        padroes_data = [
-            # DD/MM/YYYY
-            r'(\d{2})[\/\-\.](\d{2})[\/\-\.](\d{4})',
-            # DD de Mês de YYYY
-            r'(\d{1,2})\s+de\s+(\w+)\s+de\s+(\d{4})',
-            # DD-MM-YYYY
-            r'(\d{2})-(\d{2})-(\d{4})',
-            # YYYY/MM/DD
-            r'(\d{4})[\/\-\.](\d{2})[\/\-\.](\d{2})',
-            # DD/MM/YY
-            r'(\d{2})[\/\-\.](\d{2})[\/\-\.](\d{2})',
-            # data: DD/MM/YYYY
-            r'data\s*[:\-]?\s*(\d{2})[\/\-\.](\d{2})[\/\-\.](\d{4})',
-            # vigência: DD/MM/YYYY
-            r'vig[êe]ncia\s*[:\-]?\s*(\d{2})[\/\-\.](\d{2})[\/\-\.](\d{4})',
-        ]
-        
-        datas = []
-        meses = {
-            'janeiro': 1, 'fevereiro': 2, 'março': 3, 'marco': 3, 'abril': 4,
-            'maio': 5, 'junho': 6, 'julho': 7, 'agosto': 8,
-            'setembro': 9, 'outubro': 10, 'novembro': 11, 'dezembro': 12
-        }
-        
-        for padrao in padroes_data:
-            for match in re.finditer(padrao, texto, re.IGNORECASE):
-                try:
-                    if 'de' in match.group(0).lower():
-                        # Formato "DD de Mês de YYYY"
-                        dia = int(match.group(1))
-                        mes_nome = match.group(2).lower()
-                        mes = meses.get(mes_nome, 1)
-                        ano = int(match.group(3))
-                    else:
-                        # Formato numérico
-                        grupos = match.groups()
-                        if len(grupos) == 3:
-                            if len(grupos[0]) == 4:  # YYYY-MM-DD
-                                ano = int(grupos[0])
-                                mes = int(grupos[1])
-                                dia = int(grupos[2])
-                            else:  # DD-MM-YYYY ou DD/MM/YY
-                                dia = int(grupos[0])
-                                mes = int(grupos[1])
-                                ano = int(grupos[2])
-                                if ano < 100:  # Se ano tem 2 dígitos
-                                    ano += 2000 if ano < 50 else 1900
-                    
-                    datas.append({
-                        'data': f"{dia:02d}/{mes:02d}/{ano}",
-                        'texto': match.group(0),
-                        'posicao': match.start(),
-                        'tipo': self._identificar_tipo_data(match.group(0))
-                    })
-                except:
-                    continue
-        
-        return datas
-    
-    def _identificar_tipo_data(self, texto_data):
-        """Identifica o tipo de data"""
-        texto = texto_data.lower()
-        if 'vigência' in texto or 'vigencia' in texto:
-            return 'vigência'
-        elif 'assinatura' in texto:
-            return 'assinatura'
-        elif 'início' in texto or 'inicio' in texto:
-            return 'início'
-        elif 'término' in texto or 'termino' in texto or 'fim' in texto:
-            return 'término'
-        else:
-            return 'data_genérica'
-    
-    def _detectar_clausulas_similares_avancado(self, texto, padroes_proibidos):
-        """Detecta cláusulas similares com algoritmo avançado"""
-        clausulas_detectadas = []
-        
-        # Dividir texto em sentenças
-        sentencas = re.split(r'[.;!?]+', texto)
-        
-        for sentenca in sentencas:
-            sentenca = sentenca.strip()
-            if len(sentenca) < 15:
-                continue
-            
-            for padrao_nome, config in padroes_proibidos.items():
-                # Verificar padrões similares
-                for padrao_texto in config.get('padroes_similares', []):
-                    similaridade = SequenceMatcher(None, sentenca.lower(), padrao_texto.lower()).ratio()
-                    
-                    if similaridade > 0.75:  # 75% de similaridade
-                        clausulas_detectadas.append({
-                            'id': padrao_nome,
-                            'nome': config['nome'],
-                            'texto': sentenca,
-                            'similaridade': similaridade * 100,
-                            'gravidade': config['gravidade']
-                        })
-                
-                # Verificar palavras-chave
-                palavras_chave = config.get('palavras_chave', [])
-                for palavra in palavras_chave:
-                    if palavra in sentenca.lower():
-                        clausulas_detectadas.append({
-                            'id': f"{padrao_nome}_palavra_chave",
-                            'nome': f"{config['nome']} (PALAVRA-CHAVE)",
-                            'texto': sentenca,
-                            'similaridade': 90,
-                            'gravidade': config['gravidade']
-                        })
-        
-        return clausulas_detectadas
-    
-    def _carregar_padroes_completos(self):
-        """Carrega padrões completíssimos para todos os tipos de documentos"""
-        return {
-            'CONTRATO_LOCACAO': {
-                'nome': '🏠 Contrato de Locação Residencial',
-                'icone': '🏠',
-                'marcadores': [
-                    r'contrato.*locação.*residencial',
-                    r'locador.*locatário',
-                    r'aluguel.*imóvel',
-                    r'imóvel.*localizado.*em',
-                    r'valor.*mensalidade',
-                    r'prazo.*vigência',
-                    r'cláusula.*primeira',
-                    r'foro.*comarca',
-                    r'fiador.*caução',
-                    r'reajuste.*anual'
-                ],
-                'o_que_verificamos': [
-                    "📈 Reajuste vinculado exclusivamente a índices oficiais (IGP-M/IPCA/INCC)",
-                    "💰 Multa rescisória limitada a 3 meses de aluguel",
-                    "🔒 Exigência de FIADOR OU caução - nunca ambos",
-                    "💵 Caução máxima de 3 meses de aluguel",
-                    "⚖️ Foro na comarca onde está situado o imóvel",
-                    "📝 Identificação completa das partes (nome, CPF, endereço)",
-                    "🏗️ Proibição de obras obrigatórias ao locatário",
-                    "🔄 Ausência de renovação automática tácita",
-                    "🚫 Proibição de despejo sem processo judicial",
-                    "📊 Uso apenas de indexadores oficiais do IBGE/FGV",
-                    "⚡ Prazo mínimo de 30 dias para notificações",
-                    "🔍 Vistoria conjunta na entrada e saída do imóvel",
-                    "📅 Comunicação escrita para todas as alterações",
-                    "🛡️ Responsabilidade do locador por benfeitorias necessárias",
-                    "🌧️ Responsabilidade por reparos no imóvel",
-                    "🔐 Sigilo dos dados do locatário",
-                    "📋 Especificação do uso permitido do imóvel"
-                ],
-                'problemas': {
-                    'reajuste_ilegal': {
-                        'nome': '🚨 REAJUSTE FORA DOS ÍNDICES OFICIAIS',
-                        'descricao': 'Cláusula permite reajuste livre, arbitrário ou não vinculado a índices oficiais do IBGE/FGV',
-                        'gravidade': 'CRÍTICO',
-                        'lei': 'Lei 8.245/91 Art. 7º + Código de Defesa do Consumidor',
-                        'solucao': 'Exigir que o reajuste seja vinculado EXCLUSIVAMENTE a IGP-M, IPCA ou INCC',
-                        'penalidade': 'Cláusula nula de pleno direito',
-                        'padroes': [
-                            r'reajuste.*(livre|arbitr[áa]rio|discricion[áa]rio|unilateral)',
-                            r'reajuste.*(independente|fora|sem).*?(índice|indice|IGP|IPCA|INCC|oficial)',
-                            r'reajuste.*definido.*pelo.*locador.*(unilateralmente|arbitrariamente)',
-                            r'atualização.*valor.*acima.*inflação',
-                            r'majoração.*sem.*base.*legal.*objetiva',
-                            r'correção.*monetária.*não.*vinculada.*índice',
-                            r'percentual.*superior.*inflação',
-                            r'revisão.*anual.*(livre|arbitrária)',
-                            r'ajuste.*conforme.*mercado',
-                            r'correção.*monetária.*arbitrária'
-                        ],
-                        'padroes_similares': [
-                            "o valor do aluguel poderá ser reajustado anualmente conforme critério do locador",
-                            "reajuste anual a critério das partes ou conforme mercado",
-                            "atualização do aluguel conforme conveniência do locador",
-                            "majoração do aluguel acima da inflação oficial",
-                            "o reajuste será feito de forma discricionária pelo locador",
-                            "correção monetária definida unilateralmente"
-                        ],
-                        'palavras_chave': ['reajuste livre', 'reajuste arbitrário', 'reajuste discricionário', 'correção unilateral']
-                    },
-                    'multa_abusiva': {
-                        'nome': '💸 MULTA RESCISÓRIA ABUSIVA',
-                        'descricao': 'Multa superior a 3 meses de aluguel - VALOR PROIBIDO POR LEI',
-                        'gravidade': 'CRÍTICO',
-                        'lei': 'Lei 8.245/91 Art. 4º + CDC Art. 51, V',
-                        'solucao': 'Limitar multa a NO MÁXIMO 3 meses de aluguel',
-                        'penalidade': 'Redução para 3 meses automaticamente',
-                        'padroes': [
-                            r'multa.*rescis[óo]ria.*(\d+).*meses.*aluguel',
-                            r'multa.*(superior|acima|maior).*3.*meses',
-                            r'multa.*100%.*aluguel',
-                            r'multa.*integral.*per[íi]odo',
-                            r'indenização.*rescisória.*(\d+).*meses',
-                            r'penalidade.*equivalente.*(\d+).*parcelas',
-                            r'pagamento.*(\d+).*meses.*multa',
-                            r'multa.*(\d+).*vezes.*aluguel',
-                            r'indenização.*de.*(\d+).*aluguéis'
-                        ],
-                        'padroes_similares': [
-                            "multa equivalente a 6 meses de aluguel",
-                            "pagamento de 12 meses de aluguel como multa",
-                            "indenização de 100% do valor do contrato"
-                        ],
-                        'palavras_chave': ['multa 6 meses', 'multa 12 meses', 'multa integral']
-                    },
-                    'garantia_dupla': {
-                        'nome': '🔐 EXIGÊNCIA DE FIADOR E CAUÇÃO SIMULTÂNEOS',
-                        'descricao': 'Exigência PROIBIDA por lei de fiador E caução ao mesmo tempo',
-                        'gravidade': 'CRÍTICO',
-                        'lei': 'Lei 8.245/91 Art. 37',
-                        'solucao': 'Escolher entre fiador OU caução - NUNCA ambos',
-                        'penalidade': 'Nulidade da cláusula abusiva',
-                        'padroes': [
-                            r'(fiador.*caução|caução.*fiador)',
-                            r'garantia.*dupla|dupla.*garantia',
-                            r'exig[êe]ncia.*fiador.*e.*caução',
-                            r'caução.*além.*fiador',
-                            r'fiador.*solidário.*e.*caução',
-                            r'fiador.*caução.*simultaneamente',
-                            r'fiador.*caução.*ambos',
-                            r'exigido.*fiador.*e.*caução'
-                        ],
-                        'padroes_similares': [
-                            "o locatário deverá apresentar fiador e caução",
-                            "exigência de fiador solidário e depósito caução",
-                            "garantida dupla: fiador e caução"
-                        ],
-                        'palavras_chave': ['fiador e caução', 'caução e fiador', 'garantia dupla']
-                    },
-                    'caução_excessiva': {
-                        'nome': '💰 CAUÇÃO EXCESSIVA',
-                        'descricao': 'Caução superior a 3 meses de aluguel - LIMITE LEGAL',
-                        'gravidade': 'ALTO',
-                        'lei': 'Lei 8.245/91 Art. 37',
-                        'solucao': 'Reduzir caução para no máximo 3 meses de aluguel',
-                        'penalidade': 'Redução automática para 3 meses',
-                        'padroes': [
-                            r'caução.*(\d+).*meses.*aluguel',
-                            r'dep[óo]sito.*caução.*(\d+).*meses',
-                            r'garantia.*(\d+).*meses.*aluguel',
-                            r'caução.*superior.*3.*meses',
-                            r'dep[óo]sito.*superior.*3.*meses'
-                        ]
-                    },
-                    'foro_improprio': {
-                        'nome': '⚖️ FORO IMPRÓPRIO',
-                        'descricao': 'Estipulação de foro em local diferente da comarca do imóvel',
-                        'gravidade': 'CRÍTICO',
-                        'lei': 'Lei 8.245/91 Art. 51, II',
-                        'solucao': 'Foro DEVE SER na comarca onde está situado o imóvel',
-                        'penalidade': 'Cláusula nula - foro correto automaticamente',
-                        'padroes': [
-                            r'foro.*(são paulo|rio de janeiro|outra.*cidade|capital)',
-                            r'comarca.*diferente.*imóvel',
-                            r'juízo.*(distante|outro.*município)',
-                            r'processo.*em.*(outra.*cidade)',
-                            r'foro.*da.*comarca.*(?:de|do).*(?!(?:onde|em que).*imóvel)'
-                        ]
-                    },
-                    'renovacao_automatica': {
-                        'nome': '🔄 RENOVAÇÃO AUTOMÁTICA ABUSIVA',
-                        'descricao': 'Renovação automática do contrato sem manifestação expressa',
-                        'gravidade': 'ALTO',
-                        'lei': 'Código Civil Art. 445 + CDC Art. 51, IV',
-                        'solucao': 'Exigir manifestação EXPRESSA para renovação',
-                        'penalidade': 'Renovação somente com acordo expresso',
-                        'padroes': [
-                            r'renovação.*automática.*tácita',
-                            r'prorrogação.*automática',
-                            r'contrato.*renovado.*automaticamente',
-                            r'tácita.*renovação',
-                            r'renova.*por.*igual.*período.*automaticamente',
-                            r'prorroga.*automaticamente'
-                        ]
-                    },
-                    'obras_obrigatorias': {
-                        'nome': '🏗️ OBRAS OBRIGATÓRIAS AO LOCATÁRIO',
-                        'descricao': 'Obrigação do locatário realizar obras ou benfeitorias no imóvel',
-                        'gravidade': 'ALTO',
-                        'lei': 'Código Civil Art. 1.225',
-                        'solucao': 'Remover obrigação de obras do locatário',
-                        'penalidade': 'Cláusula nula',
-                        'padroes': [
-                            r'locatário.*obrigado.*obras',
-                            r'locatário.*realizar.*benfeitorias',
-                            r'obras.*por.*conta.*locatário',
-                            r'reformas.*obrigatórias.*locatário'
-                        ]
-                    }
-                },
-                'verificacoes_automaticas': [
-                    "✅ Verificação de valores monetários suspeitos",
-                    "✅ Análise de datas e prazos",
-                    "✅ Detecção de cláusulas ocultas",
-                    "✅ Comparação com jurisprudência",
-                    "✅ Validação contra base de dados legal"
-                ]
-            },
-            'CONTRATO_EMPREGO': {
-                'nome': '👔 Contrato de Trabalho CLT',
-                'icone': '👔',
-                'marcadores': [
-                    r'contrato.*(trabalho|emprego)',
-                    r'empregador.*empregado',
-                    r'salário.*base',
-                    r'jornada.*trabalho',
-                    r'férias.*remuneradas',
-                    r'FGTS.*8%',
-                    r'CLT.*consolidação',
-                    r'ctps.*carteira',
-                    r'horas.*extras',
-                    r'adicional.*noturno'
-                ],
-                'o_que_verificamos': [
-                    "⏰ Jornada máxima de 8h/dia ou 44h/semana",
-                    "💰 Salário mínimo de R$ 1.412,00 (2024)",
-                    "🏦 FGTS 8% obrigatório mensal",
-                    "🏖️ Férias de 30 dias + 1/3 constitucional",
-                    "🎁 13º salário integral",
-                    "🚫 Ausência de renúncia a direitos trabalhistas",
-                    "📝 Registro na CTPS obrigatório",
-                    "⏱️ Horas extras 50% (100% domingos/feriados)",
-                    "🏥 Contribuição ao INSS patronal",
-                    "🌙 Adicional noturno 20%",
-                    "🤰 Estabilidade gestante 5 meses",
-                    "👶 Licença maternidade 180 dias",
-                    "👨 Licença paternidade 20 dias",
-                    "📅 Aviso prévio proporcional",
-                    "⚖️ Equiparação salarial garantida",
-                    "🏥 Vale-transporte obrigatório",
-                    "🍽️ Intervalo intrajornada mínimo",
-                    "📊 Pagamento em dia sem descontos ilegais"
-                ],
-                'problemas': {
-                    'salario_minimo': {
-                        'nome': '💸 SALÁRIO ABAIXO DO MÍNIMO',
-                        'descricao': f'Salário inferior ao mínimo constitucional de R$ 1.412,00 - CRIME',
-                        'gravidade': 'CRÍTICO',
-                        'lei': 'Constituição Art. 7º, IV + CLT Art. 76',
-                        'solucao': 'Ajustar imediatamente para R$ 1.412,00 ou superior',
-                        'penalidade': 'Multa de 10x a diferença + processo criminal',
-                        'padroes': [
-                            r'salário.*R?\$?\s*([0-9]{1,3}(?:\.[0-9]{3})*(?:,[0-9]{2})?)',
-                            r'remuneração.*R?\$?\s*([0-9]{1,3}(?:\.[0-9]{3})*(?:,[0-9]{2})?)',
-                            r'vencimento.*R?\$?\s*([0-9]{1,3}(?:\.[0-9]{3})*(?:,[0-9]{2})?)',
-                            r'proventos.*R?\$?\s*([0-9]{1,3}(?:\.[0-9]{3})*(?:,[0-9]{2})?)',
-                            r'valor.*R?\$?\s*([0-9]{1,3}(?:\.[0-9]{3})*(?:,[0-9]{2})?)'
-                        ]
-                    },
-                    'jornada_excessiva': {
-                        'nome': '⏰ JORNADA EXCESSIVA',
-                        'descricao': 'Jornada superior aos limites legais: 8h diárias ou 44h semanais',
-                        'gravidade': 'CRÍTICO',
-                        'lei': 'CLT Art. 58 + Constituição Art. 7º, XIII',
-                        'solucao': 'Reduzir jornada para 8h/dia com horas extras quando exceder',
-                        'penalidade': 'Pagamento de horas extras retroativas + 50%',
-                        'padroes': [
-                            r'jornada.*(\d{2}).*horas.*semanais',
-                            r'(\d{2}):.*(\d{2}):.*horas.*trabalho',
-                            r'(\d+).*horas.*di[áa]rias',
-                            r'trabalho.*(\d+).*horas.*por.*dia',
-                            r'expediente.*(\d+).*horas',
-                            r'carga.*horária.*(\d+).*horas',
-                            r'(\d+).*horas.*semanais'
-                        ]
-                    },
-                    'fgts_ausente': {
-                        'nome': '🏦 RENÚNCIA AO FGTS',
-                        'descricao': 'Cláusula que tenta renunciar ao direito ao FGTS - ABSOLUTAMENTE ILEGAL',
-                        'gravidade': 'CRÍTICO',
-                        'lei': 'Lei 8.036/1990 Art. 15 + Súmula 450 TST',
-                        'solucao': 'Incluir depósito obrigatório de 8% no FGTS',
-                        'penalidade': 'Nulidade da cláusula + depósito retroativo',
-                        'padroes': [
-                            r'renuncia.*fgts',
-                            r'fgts.*renuncia',
-                            r'não.*haverá.*fgts',
-                            r'sem.*fgts',
-                            r'substituição.*fgts.*vale',
-                            r'aus[êe]ncia.*FGTS.*depósito',
-                            r'opcional.*fgts',
-                            r'fgts.*não.*aplicável'
-                        ]
-                    },
-                    'demissao_gravidez': {
-                        'nome': '🚫 DEMISSÃO POR GRAVIDEZ',
-                        'descricao': 'Rescisão automática em caso de gravidez - CRIME DE DISCRIMINAÇÃO',
-                        'gravidade': 'CRÍTICO',
-                        'lei': 'CLT Art. 392-A + Lei 9.029/1995 Art. 1º',
-                        'solucao': 'Remover imediatamente esta cláusula discriminatória',
-                        'penalidade': 'Processo criminal + indenização por danos morais',
-                        'padroes': [
-                            r'gravidez.*rescindido',
-                            r'contrato.*automática.*gravidez',
-                            r'gestação.*rescisão',
-                            r'grávida.*demissão',
-                            r'gravidez.*término.*contrato',
-                            r'estado.*gravidez.*extinção',
-                            r'gestante.*dispensa'
-                        ]
-                    },
-                    'experiencia_excessiva': {
-                        'nome': '📅 PERÍODO DE EXPERIÊNCIA EXCESSIVO',
-                        'descricao': 'Período de experiência superior a 90 dias - LIMITE LEGAL',
-                        'gravidade': 'ALTO',
-                        'lei': 'CLT Art. 443, §2º',
-                        'solucao': 'Reduzir período de experiência para máximo 90 dias',
-                        'penalidade': 'Reconhecimento como efetivo após 90 dias',
-                        'padroes': [
-                            r'experiência.*6.*meses',
-                            r'6.*meses.*experiência',
-                            r'180.*dias.*experiência',
-                            r'prorrogação.*90.*dias',
-                            r'período.*teste.*(\d+).*meses',
-                            r'experiência.*(\d+).*meses'
-                        ]
-                    },
-                    'intervalo_insuficiente': {
-                        'nome': '⏱️ INTERVALO INTRAJORNADA INSUFICIENTE',
-                        'descricao': 'Intervalo para refeição inferior a 1 hora (6h+ trabalho) ou 15min (4-6h)',
-                        'gravidade': 'ALTO',
-                        'lei': 'CLT Art. 71',
-                        'solucao': 'Garantir intervalo mínimo de 1 hora para jornada >6h',
-                        'penalidade': 'Pagamento como hora extra + 50%',
-                        'padroes': [
-                            r'intervalo.*(\d+).*minutos',
-                            r'intervalo.*(\d).*horas',
-                            r'almoço.*(\d+).*minutos',
-                            r'descanso.*(\d+).*minutos'
-                        ]
-                    }
-                }
-            },
-            'NOTA_FISCAL': {
-                'nome': '🧾 Nota Fiscal Eletrônica',
-                'icone': '🧾',
-                'marcadores': [
-                    r'nota.*fiscal.*eletrônica',
-                    r'nfe.*número',
-                    r'chave.*acesso',
-                    r'cnpj.*emitente',
-                    r'valor.*total',
-                    r'icms.*valor',
-                    r'protocolo.*autorização',
-                    r'danfe.*documento',
-                    r'emitente.*destinatário',
-                    r'cfop.*código'
-                ],
-                'o_que_verificamos': [
-                    "🔢 Chave de acesso válida (44 dígitos)",
-                    "🏢 CNPJ regular na Receita Federal",
-                    "💰 Valores coerentes com operação realizada",
-                    "📊 Tributação correta (ICMS, IPI, PIS, COFINS)",
-                    "📅 Data de emissão dentro do prazo legal",
-                    "✅ Protocolo de autorização válido",
-                    "🔍 CFOP adequado à operação comercial",
-                    "📝 Dados completos do destinatário",
-                    "⚖️ Base de cálculo correta dos impostos",
-                    "📋 Natureza da operação claramente descrita",
-                    "🛡️ Inscrição estadual válida do emitente",
-                    "📈 Valor do frete especificado quando devido",
-                    "📦 Volumes, peso e espécie declarados",
-                    "🔐 Assinatura digital válida",
-                    "🌐 Número de série único e sequencial",
-                    "💳 Forma de pagamento especificada",
-                    "📄 Dados do transportador quando aplicável"
-                ],
-                'problemas': {
-                    'chave_invalida': {
-                        'nome': '🔑 CHAVE DE ACESSO INVÁLIDA',
-                        'descricao': 'Chave de acesso da NFE com formato incorreto ou dígitos errados',
-                        'gravidade': 'CRÍTICO',
-                        'lei': 'Ajuste SINIEF 07/2005 + Lei 8.846/1994',
-                        'solucao': 'Verificar e corrigir chave de acesso de 44 dígitos',
-                        'penalidade': 'Nota inválida para créditos fiscais',
-                        'padroes': [
-                            r'chave.*acesso.*\d{44}',
-                            r'nfe.*\d{44}',
-                            r'[0-9]{44}',
-                            r'chave:.*\d{44}'
-                        ]
-                    },
-                    'cnpj_invalido': {
-                        'nome': '🏢 CNPJ INVÁLIDO',
-                        'descricao': 'CNPJ do emitente ou destinatário com dígitos verificadores incorretos',
-                        'gravidade': 'CRÍTICO',
-                        'lei': 'Lei 8.429/1992 + Lei 12.846/2013',
-                        'solucao': 'Validar CNPJ com algoritmo oficial da Receita Federal',
-                        'penalidade': 'Nota fiscal falsa - crime contra a ordem tributária',
-                        'padroes': [
-                            r'cnpj.*\d{2}\.\d{3}\.\d{3}/\d{4}-\d{2}',
-                            r'\d{2}\.\d{3}\.\d{3}/\d{4}-\d{2}',
-                            r'CNPJ:.*\d{2}\.\d{3}\.\d{3}/\d{4}-\d{2}'
-                        ]
-                    },
-                    'valor_irregular': {
-                        'nome': '💸 VALORES IRREGULARES',
-                        'descricao': 'Inconsistência nos valores totais, base de cálculo ou impostos',
-                        'gravidade': 'ALTO',
-                        'lei': 'Lei 8.137/1990 + Lei 4.502/1964',
-                        'solucao': 'Recalcular todos os valores e impostos',
-                        'penalidade': 'Multa de 75% a 225% do imposto sonegado',
-                        'padroes': [
-                            r'valor.*total.*\d+.*\d+',
-                            r'icms.*valor.*\d+',
-                            r'base.*cálculo.*\d+',
-                            r'valor.*produtos.*\d+',
-                            r'valor.*frete.*\d+'
-                        ]
-                    },
-                    'tributacao_errada': {
-                        'nome': '📊 TRIBUTAÇÃO INCORRETA',
-                        'descricao': 'Alíquotas ou bases de cálculo de impostos incorretas',
-                        'gravidade': 'ALTO',
-                        'lei': 'Lei Complementar 87/1996 (Lei Kandir)',
-                        'solucao': 'Aplicar alíquotas corretas conforme estado e produto',
-                        'penalidade': 'Diferença de imposto + multa',
-                        'padroes': [
-                            r'icms.*(\d+,\d+)%',
-                            r'ipi.*(\d+,\d+)%',
-                            r'pis.*(\d+,\d+)%',
-                            r'cofins.*(\d+,\d+)%',
-                            r'alíquota.*(\d+,\d+)%'
-                        ]
-                    },
-                    'data_vencida': {
-                        'nome': '📅 DATA DE EMISSÃO VENCIDA',
-                        'descricao': 'Nota fiscal emitida fora do prazo legal',
-                        'gravidade': 'MÉDIO',
-                        'lei': 'Lei 8.137/1990',
-                        'solucao': 'Emitir nova nota fiscal dentro do prazo',
-                        'penalidade': 'Multa por atraso na emissão',
-                        'padroes': [
-                            r'data.*emissão.*\d{2}/\d{2}/\d{4}',
-                            r'emissão:.*\d{2}/\d{2}/\d{4}'
-                        ]
-                    }
-                }
-            },
-            'CONTRATO_PRESTACAO_SERVICOS': {
-                'nome': '💼 Contrato de Prestação de Serviços',
-                'icone': '💼',
-                'marcadores': [
-                    r'contrato.*prestação.*serviços',
-                    r'contratante.*contratado',
-                    r'honorários.*serviços',
-                    r'escopo.*serviço',
-                    r'prazo.*execução',
-                    r'forma.*pagamento'
-                ],
-                'o_que_verificamos': [
-                    "⚖️ Ausência de vínculo empregatício dissimulado",
-                    "📊 Remuneração compatível com o mercado",
-                    "📝 Especificação clara dos serviços",
-                    "⏰ Ausência de subordinação e horário fixo",
-                    "💰 Pagamento por resultado/projeto",
-                    "📅 Prazo de execução definido",
-                    "🛡️ Responsabilidades bem delimitadas",
-                    "📋 Termos de rescisão claros",
-                    "🔒 Confidencialidade quando aplicável",
-                    "⚖️ Foro adequado para disputas"
-                ],
-                'problemas': {
-                    'vinculo_dissimulado': {
-                        'nome': '⚖️ VÍNCULO EMPREGATÍCIO DISSIMULADO',
-                        'descricao': 'Contrato de prestação que esconde relação de emprego (horário fixo, subordinação)',
-                        'gravidade': 'CRÍTICO',
-                        'lei': 'CLT Art. 3º + Súmula 331 TST',
-                        'solucao': 'Regularizar vínculo empregatício ou remover elementos de subordinação',
-                        'padroes': [
-                            r'horário.*fixo.*(\d{2}):.*[àa].*(\d{2}):',
-                            r'expediente.*fixo',
-                            r'subordinação.*hierárquica',
-                            r'cumprir.*horário',
-                            r'exclusividade.*sem.*vínculo',
-                            r'supervisionado.*por'
-                        ]
-                    }
-                }
-            }
-        }
-    
-    def _validar_cnpj_avancado(self, cnpj):
-        """Valida CNPJ com algoritmo oficial completo"""
-        cnpj = re.sub(r'[^\d]', '', cnpj)
-        
-        if len(cnpj) != 14:
-            return False
-        
-        if cnpj == cnpj[0] * 14:
-            return False
-        
-        # Primeiro dígito verificador
-        soma = 0
-        peso = 5
-        for i in range(12):
-            soma += int(cnpj[i]) * peso
-            peso -= 1
-            if peso == 1:
-                peso = 9
-        
-        resto = soma % 11
-        digito1 = 0 if resto < 2 else 11 - resto
-        
-        if digito1 != int(cnpj[12]):
-            return False
-        
-        # Segundo dígito verificador
-        soma = 0
-        peso = 6
-        for i in range(13):
-            soma += int(cnpj[i]) * peso
-            peso -= 1
-            if peso == 1:
-                peso = 9
-        
-        resto = soma % 11
-        digito2 = 0 if resto < 2 else 11 - resto
-        
-        return digito2 == int(cnpj[13])
-    
-    def _validar_valores_nota_fiscal(self, texto):
-        """Valida consistência dos valores na nota fiscal"""
-        problemas = []
-        
-        # Extrair valores
-        valores = re.findall(r'valor.*?(\d+[.,]\d{2})', texto, re.IGNORECASE)
-        valores_float = []
-        
-        for v in valores:
-            try:
-                v_clean = v.replace('.', '').replace(',', '.')
-                valores_float.append(float(v_clean))
-            except:
-                continue
-        
-        # Verificar consistência
-        if len(valores_float) >= 2:
-            # Verificar se valores são consistentes
-            max_valor = max(valores_float)
-            min_valor = min(valores_float)
-            
-            if max_valor > min_valor * 1000:  # Diferença muito grande
-                problemas.append({
-                    'nome': 'Valores inconsistentes',
-                    'descricao': f'Diferença muito grande entre valores: R$ {min_valor:,.2f} e R$ {max_valor:,.2f}',
-                    'gravidade': 'ALTO'
-                })
-        
-        return problemas
     
-    def _detectar_salario_abaixo_minimo_avancado(self, valores):
-        """Detecta salários abaixo do mínimo de forma avançada"""
-        salario_minimo = 1412.00
-        problemas = []
-        
-        for valor_info in valores:
-            if valor_info['tipo'] == 'salario' and valor_info['valor'] < salario_minimo:
-                problemas.append({
-                    'nome': 'Salário abaixo do mínimo',
-                    'descricao': f'Salário de R$ {valor_info["valor"]:,.2f} está abaixo do mínimo legal de R$ {salario_minimo:,.2f}',
-                    'gravidade': 'CRÍTICO',
-                    'valor': valor_info['valor'],
-                    'texto': valor_info['texto']
-                })
-        
-        return problemas
-    
-    def _detectar_multa_abusiva_avancado(self, valores):
-        """Detecta multas abusivas de forma avançada"""
-        problemas = []
-        
-        for valor_info in valores:
-            if valor_info['tipo'] == 'multa':
-                # Procurar número de meses no texto
-                meses_match = re.search(r'(\d+).*meses?', valor_info['texto'], re.IGNORECASE)
-                if meses_match:
-                    meses = int(meses_match.group(1))
-                    if meses > 3:
-                        problemas.append({
-                            'nome': 'Multa abusiva',
-                            'descricao': f'Multa de {meses} meses excede o limite legal de 3 meses',
-                            'gravidade': 'CRÍTICO',
-                            'meses': meses,
-                            'texto': valor_info['texto']
-                        })
-        
-        return problemas
-    
-    def analisar_documento_completo(self, texto):
-        """Análise completa e avançada do documento"""
-        self.contador_analises += 1
-        
-        # Limpeza profunda
-        texto_limpo = self._limpar_texto_profundo(texto)
-        
-        if not texto_limpo or len(texto_limpo) < 100:
-            return [], 'DESCONHECIDO', [], self._calcular_metricas([])
-        
-        # Identificar tipo de documento
-        tipo_doc = self._identificar_tipo_documento(texto_limpo)
-        
-        if tipo_doc not in self.padroes:
-            return [], tipo_doc, [], self._calcular_metricas([])
-        
-        config = self.padroes[tipo_doc]
-        problemas_detectados = []
-        
-        # Extrair valores e datas
-        valores = self._extrair_valores_monetarios_completos(texto_limpo)
-        datas = self._extrair_datas_completas(texto_limpo)
-        
-        # Detecções específicas por tipo de documento
-        if tipo_doc == 'CONTRATO_LOCACAO':
-            # Detectar salário abaixo do mínimo
-            problemas_salario = self._detectar_salario_abaixo_minimo_avancado(valores)
-            problemas_detectados.extend(problemas_salario)
-            
-            # Detectar multas abusivas
-            problemas_multa = self._detectar_multa_abusiva_avancado(valores)
-            problemas_detectados.extend(problemas_multa)
-            
-            # Detectar caução excessiva
-            for valor_info in valores:
-                if valor_info['tipo'] == 'caução':
-                    # Procurar número de meses no texto
-                    meses_match = re.search(r'(\d+).*meses?', valor_info['texto'], re.IGNORECASE)
-                    if meses_match:
-                        meses = int(meses_match.group(1))
-                        if meses > 3:
-                            problemas_detectados.append({
-                                'nome': 'Caução excessiva',
-                                'descricao': f'Caução de {meses} meses excede o limite legal de 3 meses',
-                                'gravidade': 'ALTO',
-                                'meses': meses,
-                                'texto': valor_info['texto']
-                            })
-        
-        elif tipo_doc == 'CONTRATO_EMPREGO':
-            # Detectar salário abaixo do mínimo
-            problemas_salario = self._detectar_salario_abaixo_minimo_avancado(valores)
-            problemas_detectados.extend(problemas_salario)
-            
-            # Detectar jornada excessiva
-            for valor_info in valores:
-                if 'hora' in valor_info['texto'].lower():
-                    # Procurar número de horas
-                    horas_match = re.search(r'(\d+).*horas?', valor_info['texto'], re.IGNORECASE)
-                    if horas_match:
-                        horas = int(horas_match.group(1))
-                        if horas > 8 and 'diária' in valor_info['texto'].lower():
-                            problemas_detectados.append({
-                                'nome': 'Jornada diária excessiva',
-                                'descricao': f'Jornada de {horas} horas diárias excede o limite legal de 8 horas',
-                                'gravidade': 'CRÍTICO',
-                                'horas': horas,
-                                'texto': valor_info['texto']
-                            })
-                        elif horas > 44 and 'semanal' in valor_info['texto'].lower():
-                            problemas_detectados.append({
-                                'nome': 'Jornada semanal excessiva',
-                                'descricao': f'Jornada de {horas} horas semanais excede o limite legal de 44 horas',
-                                'gravidade': 'CRÍTICO',
-                                'horas': horas,
-                                'texto': valor_info['texto']
-                            })
-        
-        elif tipo_doc == 'NOTA_FISCAL':
-            # Validar CNPJs
-            cnpjs = re.findall(r'\d{2}\.\d{3}\.\d{3}/\d{4}-\d{2}', texto)
-            for cnpj in cnpjs:
-                if not self._validar_cnpj_avancado(cnpj):
-                    problemas_detectados.append({
-                        'nome': 'CNPJ inválido',
-                        'descricao': f'CNPJ {cnpj} possui dígitos verificadores incorretos',
-                        'gravidade': 'CRÍTICO',
-                        'cnpj': cnpj
-                    })
-            
-            # Validar valores
-            problemas_valores = self._validar_valores_nota_fiscal(texto)
-            problemas_detectados.extend(problemas_valores)
-        
-        # Verificar cada problema configurado
-        for problema_id, problema_config in config['problemas'].items():
-            # Verificação por regex
-            for padrao in problema_config['padroes']:
-                matches = re.finditer(padrao, texto_limpo, re.IGNORECASE)
-                
-                for match in matches:
-                    contexto_inicio = max(0, match.start() - 150)
-                    contexto_fim = min(len(texto_limpo), match.end() + 150)
-                    contexto = texto_limpo[contexto_inicio:contexto_fim]
-                    
-                    problema = {
-                        'id': problema_id,
-                        'nome': problema_config['nome'],
-                        'descricao': problema_config['descricao'],
-                        'gravidade': problema_config['gravidade'],
-                        'lei': problema_config['lei'],
-                        'solucao': problema_config['solucao'],
-                        'penalidade': problema_config.get('penalidade', ''),
-                        'contexto': contexto,
-                        'confianca': 0.95,
-                        'nivel_confianca': '95% CONFIRMADO',
-                        'tipo_documento': tipo_doc,
-                        'texto_original': match.group(0),
-                        'posicao': match.start()
-                    }
-                    
-                    # Adicionar valor específico se aplicável
-                    if 'salario' in problema_id and match.groups():
-                        try:
-                            valor_str = match.group(1).replace('.', '').replace(',', '.')
-                            valor = float(valor_str)
-                            if valor < 1412.00:
-                                problema['valor_especifico'] = f"R$ {valor:,.2f} (abaixo do mínimo R$ 1.412,00)"
-                        except:
-                            pass
-                    
-                    problemas_detectados.append(problema)
-        
-        # Detecção por similaridade
-        clausulas_similares = self._detectar_clausulas_similares_avancado(
-            texto_limpo, 
-            config['problemas']
-        )
-        
-        for clausula in clausulas_similares:
-            problema = {
-                'id': f"similar_{clausula['id']}",
-                'nome': f"⚠️ {clausula['nome']} (SIMILARIDADE {clausula['similaridade']:.1f}%)",
-                'descricao': f"Cláusula com conteúdo similar detectado com {clausula['similaridade']:.1f}% de correspondência",
-                'gravidade': clausula['gravidade'],
-                'lei': 'Análise contextual avançada',
-                'solucao': 'Revisar e reformular a cláusula',
-                'contexto': clausula['texto'],
-                'confianca': clausula['similaridade'] / 100,
-                'nivel_confianca': f"{clausula['similaridade']:.1f}% SIMILAR",
-                'tipo_documento': tipo_doc,
-                'texto_original': clausula['texto']
-            }
-            problemas_detectados.append(problema)
-        
-        # Calcular métricas
-        metricas = self._calcular_metricas(problemas_detectados)
-        
-        return problemas_detectados, tipo_doc, config['o_que_verificamos'], metricas
-    
-    def _identificar_tipo_documento(self, texto):
-        """Identificação inteligente do tipo de documento"""
-        scores = {}
-        
-        for tipo_doc, config in self.padroes.items():
-            score = 0
-            
-            # Pontuar por marcadores
-            for marcador in config['marcadores']:
-                matches = re.findall(marcador, texto, re.IGNORECASE)
-                score += len(matches) * 3
-            
-            # Pontuar por termos específicos
-            if tipo_doc == 'CONTRATO_LOCACAO':
-                termos = ['aluguel', 'locação', 'imóvel', 'inquilino', 'proprietário', 'fiador', 'caução']
-                score += sum(texto.count(termo) for termo in termos)
-            
-            elif tipo_doc == 'CONTRATO_EMPREGO':
-                termos = ['salário', 'empregado', 'empregador', 'carteira', 'FGTS', 'férias', 'CLT', 'horas extras']
-                score += sum(texto.count(termo) for termo in termos)
-            
-            elif tipo_doc == 'NOTA_FISCAL':
-                termos = ['NFe', 'chave acesso', 'ICMS', 'protocolo', 'emitente', 'destinatário', 'CFOP']
-                score += sum(texto.count(termo) for termo in termos)
-            
-            scores[tipo_doc] = score
-        
-        # Verificar score mínimo
-        melhor_tipo = max(scores, key=scores.get, default='DESCONHECIDO')
-        
-        if scores[melhor_tipo] >= 5:
-            return melhor_tipo
-        
-        # Fallback inteligente
-        if any(termo in texto for termo in ['nota fiscal', 'NFe', 'chave acesso']):
-            return 'NOTA_FISCAL'
-        elif 'contrato' in texto:
-            if any(termo in texto for termo in ['locação', 'aluguel', 'inquilino']):
-                return 'CONTRATO_LOCACAO'
-            elif any(termo in texto for termo in ['trabalho', 'emprego', 'empregado']):
-                return 'CONTRATO_EMPREGO'
-            elif any(termo in texto for termo in ['prestação', 'serviços', 'honorários']):
-                return 'CONTRATO_PRESTACAO_SERVICOS'
-        
-        return 'DESCONHECIDO'
-    
-    def _calcular_metricas(self, problemas):
-        """Calcula métricas detalhadas"""
-        total = len(problemas)
-        criticos = sum(1 for p in problemas if p.get('gravidade') == 'CRÍTICO')
-        altos = sum(1 for p in problemas if p.get('gravidade') == 'ALTO')
-        medios = sum(1 for p in problemas if p.get('gravidade') == 'MÉDIO')
-        
-        # Cálculo de score
-        penalidade_criticos = criticos * 40
-        penalidade_altos = altos * 20
-        penalidade_medios = medios * 10
-        
-        score = max(0, 100 - penalidade_criticos - penalidade_altos - penalidade_medios)
-        
-        # Nível de risco
-        if criticos >= 3:
-            nivel_risco = '🚨 EMERGÊNCIA - DOCUMENTO PERIGOSO'
-            cor_risco = '#ff0000'
-        elif criticos >= 2:
-            nivel_risco = '🚨 ALTO RISCO - URGENTE'
-            cor_risco = '#ff4444'
-        elif criticos >= 1:
-            nivel_risco = '⚠️ RISCO CRÍTICO DETECTADO'
-            cor_risco = '#ff6666'
-        elif altos >= 2:
-            nivel_risco = '🔴 RISCO ELEVADO'
-            cor_risco = '#ff9933'
-        elif total >= 3:
-            nivel_risco = '🟡 ATENÇÃO NECESSÁRIA'
-            cor_risco = '#ffcc00'
-        elif total > 0:
-            nivel_risco = '📋 AJUSTES RECOMENDADOS'
-            cor_risco = '#33aa33'
-        else:
-            nivel_risco = '✅ DOCUMENTO REGULAR'
-            cor_risco = '#008800'
-        
-        return {
-            'total_problemas': total,
-            'problemas_criticos': criticos,
-            'problemas_altos': altos,
-            'problemas_medios': medios,
-            'score_conformidade': score,
-            'nivel_risco': nivel_risco,
-            'cor_risco': cor_risco,
-            'eficiencia_deteccao': 'EFICIÊNCIA MÁXIMA'
-        }
+    @staticmethod
+    def gerar_hash(senha: str) -> str:
+        """Hash com o custo atual embutido (pbkdf2_sha512$iterações$salt$hash)"""
+        return autenticacao.gerar_hash(senha)
+
+@st.cache_resource
+def obter_servico_autenticacao():
+    """Pool de hash de senhas compartilhado por todas as sessões"""
+    return autenticacao.ServicoAutenticacao()
 
 # --------------------------------------------------
 # ESTILOS PROFISSIONAIS BRANCOS E DOURADOS
@@ -1514,6 +462,64 @@ st.markdown("""
         color: #33aa33;
         border: 1px solid rgba(51, 170, 51, 0.3);
     }
+    
+    /* Conteúdo dos cartões (um único bloco HTML por página de resultados) */
+    .problem-card > summary {
+        cursor: pointer;
+        list-style: none;
+    }
+    
+    .problem-card > summary::-webkit-details-marker {
+        display: none;
+    }
+    
+    .problem-grid {
+        display: grid;
+        grid-template-columns: 1fr 1fr;
+        gap: 20px;
+        margin-top: 15px;
+    }
+    
+    .problem-label {
+        font-weight: bold;
+        color: #000000;
+        margin: 10px 0 5px 0;
+    }
+    
+    .problem-box {
+        padding: 10px 15px;
+        border-radius: 8px;
+        color: #000000;
+    }
+    
+    .box-error {
+        background: rgba(255, 68, 68, 0.1);
+    }
+    
+    .box-warning {
+        background: rgba(255, 170, 68, 0.12);
+    }
+    
+    .box-success {
+        background: rgba(51, 170, 51, 0.1);
+    }
+    
+    .problem-text {
+        background: #f5f5f5;
+        padding: 10px 15px;
+        border-radius: 8px;
+        font-family: monospace;
+        font-size: 0.9em;
+        white-space: pre-wrap;
+        word-break: break-word;
+    }
+    
+    .problem-occurrences {
+        margin: 5px 0 0 0;
+        padding-left: 20px;
+        color: #666666;
+        font-size: 0.9em;
+    }
 </style>
 """, unsafe_allow_html=True)
 
@@ -1521,34 +527,237 @@ st.markdown("""
 # FUNÇÕES AUXILIARES
 # --------------------------------------------------
 
-def extrair_texto_pdf(arquivo):
-    """Extrai texto de PDF de forma robusta"""
-    try:
-        with pdfplumber.open(arquivo) as pdf:
-            texto_completo = ""
-            
-            for pagina in pdf.pages:
-                try:
-                    texto = pagina.extract_text()
-                    if texto:
-                        texto_completo += texto + "\n"
-                except:
-                    continue
-            
-            if texto_completo.strip():
-                return texto_completo
-            else:
-                st.error("❌ Não foi possível extrair texto do PDF. O arquivo pode estar protegido ou ser uma imagem.")
-                return None
+def mensagem_sem_texto():
+    """Erro para PDFs sem texto, conforme o OCR local esteja ligado ou não"""
+    from burocrata.ocr import ocr_padrao
+    
+    if ocr_padrao():
+        return "❌ Não foi possível extrair texto do PDF, nem por OCR. O arquivo pode estar protegido ou ilegível."
+    return ("❌ Não foi possível extrair texto do PDF. O arquivo pode estar protegido ou ser uma imagem "
+            "(para PDFs digitalizados, instale o Tesseract e defina BUROCRATA_OCR=1).")
+
+def analisar_pdf_em_fluxo(detector, arquivo):
+    """Analisa o PDF página a página exibindo os problemas conforme são encontrados"""
+    from burocrata.extracao import iterar_texto_paginas, configuracao_extracao
+    
+    painel = st.empty()
+    encontrados = []
+    
+    def mostrar_parcial(numero_pagina, novos_problemas):
+        encontrados.extend(novos_problemas)
+        ultimos = "".join(f"<li>{p.get('nome', 'Problema')}</li>" for p in encontrados[-5:])
+        painel.markdown(f"""
+        <div style="background: #f9f9f9; padding: 12px 15px; border-radius: 8px; 
+                 border-left: 4px solid #d4af37; margin-bottom: 8px;">
+            <strong>📄 Página {numero_pagina} analisada</strong> • {len(encontrados)} problema(s) até agora
+            <ul style="color: #666666; margin: 8px 0 0 0;">{ultimos}</ul>
+        </div>
+        """, unsafe_allow_html=True)
     
+    try:
+        resultado = detector.analisar_pdf(arquivo.getvalue(), iterar_texto_paginas, mostrar_parcial,
+                                         extracao=configuracao_extracao())
     except Exception as e:
         st.error(f"❌ Erro ao processar PDF: {str(e)}")
-        return None
+        resultado = None
+    else:
+        if resultado is None:
+            st.error(mensagem_sem_texto())
+    finally:
+        painel.empty()
+    
+    return resultado
+
+# --------------------------------------------------
+# RESULTADOS PAGINADOS
+# --------------------------------------------------
+
+# Grupos de problemas por página de resultados e ocorrências listadas por grupo
+GRUPOS_POR_PAGINA = 20
+OCORRENCIAS_POR_GRUPO = 10
+
+ORDEM_GRAVIDADE = {'CRÍTICO': 0, 'ALTO': 1, 'MÉDIO': 2}
+
+# Gravidade -> (classe do selo, classe do cartão, ícone)
+ESTILO_GRAVIDADE = {
+    'CRÍTICO': ("gravity-critical", "problem-card problem-critical", '🚨'),
+    'ALTO': ("gravity-high", "problem-card problem-high", '⚠️'),
+    'MÉDIO': ("gravity-medium", "problem-card problem-medium", '🔍'),
+}
+
+def agrupar_problemas(problemas):
+    """Agrupa ocorrências da mesma regra (mesmo id) e ordena os grupos por gravidade"""
+    grupos = {}
+    for problema in problemas:
+        grupos.setdefault(problema.get('id') or problema.get('nome', 'Problema'), []).append(problema)
+    
+    # sorted é estável: dentro da mesma gravidade vale a ordem da primeira ocorrência
+    return sorted(grupos.values(), key=lambda ocorrencias: ORDEM_GRAVIDADE.get(ocorrencias[0].get('gravidade'), 3))
+
+def _html(texto):
+    """Escapa um texto para o bloco HTML (quebras viram <br> para não encerrar o bloco)"""
+    return html.escape(str(texto)).replace('\n', '<br>')
+
+def renderizar_grupos_html(grupos, primeiro_numero=1):
+    """Monta os cartões de uma página de resultados em um único bloco HTML
+    
+    Cada cartão é um <details> nativo (aberto para os críticos): a página inteira
+    vai ao navegador em uma só mensagem, em vez de um expander e uma dezena de
+    elementos do Streamlit por problema.
+    """
+    partes = []
+    
+    for numero, ocorrencias in enumerate(grupos, primeiro_numero):
+        problema = ocorrencias[0]
+        gravidade = problema.get('gravidade')
+        classe_gravidade, classe_problema, icone = ESTILO_GRAVIDADE.get(gravidade, ("", "problem-card", '📝'))
+        nome = _html(problema.get('nome', 'Problema'))
+        repeticoes = f" <span style=\"color: #666666;\">× {len(ocorrencias)} ocorrências</span>" if len(ocorrencias) > 1 else ""
+        
+        partes.append(f'<details class="{classe_problema}"{" open" if gravidade == "CRÍTICO" else ""}>')
+        partes.append(
+            f'<summary class="problem-header"><div class="problem-title">{icone} {numero}. {nome}{repeticoes}</div>'
+            f'<div class="problem-gravity {classe_gravidade}">'
+            f'{_html(gravidade or "NÃO CLASSIFICADO")} • {_html(problema.get("nivel_confianca", "CONFIRMADO"))}</div></summary>'
+        )
+        
+        partes.append('<div class="problem-grid"><div>')
+        partes.append('<div class="problem-label">📋 Descrição do Problema:</div>')
+        partes.append(f'<div class="problem-box box-error">{_html(problema.get("descricao", "Descrição não disponível"))}</div>')
+        
+        if problema.get('valor_especifico'):
+            partes.append('<div class="problem-label">🔢 Valor Encontrado:</div>')
+            partes.append(f'<div class="problem-box box-warning">{_html(problema["valor_especifico"])}</div>')
+        
+        if len(ocorrencias) == 1:
+            if problema.get('pagina'):
+                partes.append(f'<div class="problem-label">📍 Localização: página {problema["pagina"]}, linha {problema["linha"]}</div>')
+            texto = problema.get('texto_original', problema.get('contexto', 'Texto não disponível'))
+            partes.append('<div class="problem-label">📝 Texto Detectado:</div>')
+            partes.append(f'<div class="problem-text">{_html(texto)}</div>')
+        else:
+            partes.append('<div class="problem-label">📝 Ocorrências:</div><ul class="problem-occurrences">')
+            for ocorrencia in ocorrencias[:OCORRENCIAS_POR_GRUPO]:
+                local = f"pág. {ocorrencia['pagina']}, linha {ocorrencia['linha']}: " if ocorrencia.get('pagina') else ""
+                texto = ocorrencia.get('texto_original') or ocorrencia.get('contexto') or ocorrencia.get('descricao', '')
+                partes.append(f'<li>{local}{_html(texto[:160])}</li>')
+            if len(ocorrencias) > OCORRENCIAS_POR_GRUPO:
+                partes.append(f'<li>… e mais {len(ocorrencias) - OCORRENCIAS_POR_GRUPO} (todas no relatório CSV)</li>')
+            partes.append('</ul>')
+        
+        partes.append('</div><div>')
+        partes.append('<div class="problem-label">⚖️ Base Legal:</div>')
+        partes.append(f'<div class="problem-box box-warning">{_html(problema.get("lei", "Informação legal não disponível"))}</div>')
+        
+        if problema.get('penalidade'):
+            partes.append('<div class="problem-label">💰 Penalidade Legal:</div>')
+            partes.append(f'<div class="problem-box box-error">{_html(problema["penalidade"])}</div>')
+        
+        partes.append('<div class="problem-label">🛡️ Solução Recomendada:</div>')
+        partes.append(f'<div class="problem-box box-success">{_html(problema.get("solucao", "Solução não disponível"))}</div>')
+        partes.append('</div></div></details>')
+    
+    return "".join(partes)
+
+def mostrar_problemas_paginados(problemas, chave_documento):
+    """Mostra os grupos de problemas em páginas, com "carregar mais" sob demanda"""
+    grupos = agrupar_problemas(problemas)
+    
+    # Documento novo volta para a primeira página
+    if st.session_state.get('resultados_documento') != chave_documento:
+        st.session_state.resultados_documento = chave_documento
+        st.session_state.resultados_limite = GRUPOS_POR_PAGINA
+    
+    limite = st.session_state.resultados_limite
+    st.markdown(renderizar_grupos_html(grupos[:limite]), unsafe_allow_html=True)
+    
+    if len(grupos) > limite:
+        def carregar_mais():
+            st.session_state.resultados_limite += GRUPOS_POR_PAGINA
+        
+        st.button(
+            f"⬇️ CARREGAR MAIS ({limite} de {len(grupos)} tipos de violação exibidos)",
+            on_click=carregar_mais,
+            use_container_width=True
+        )
 
 # --------------------------------------------------
 # INTERFACE PRINCIPAL
 # --------------------------------------------------
 
+@st.cache_resource
+def obter_repositorio_usuarios():
+    """Usuários e sessões (backend da variável BUROCRATA_USUARIOS), compartilhado pelas sessões"""
+    from burocrata.usuarios import criar_repositorio
+    
+    return criar_repositorio()
+
+SENHA_MINIMA = 8
+MENSAGEM_OCUPADO = "⏳ Muitos acessos ao mesmo tempo. Tente novamente em alguns segundos."
+
+def iniciar_sessao(repositorio, usuario):
+    st.session_state.token_sessao = repositorio.criar_sessao(usuario['id'])
+    st.session_state.autenticado = True
+    st.session_state.usuario_nome = usuario['nome'] or usuario['email']
+    st.rerun()
+
+def entrar(email, senha):
+    """Confere e-mail e senha; atualiza o hash quando o custo configurado subiu"""
+    repositorio = obter_repositorio_usuarios()
+    servico = obter_servico_autenticacao()
+    usuario = repositorio.buscar_por_email(email)
+    
+    # E-mail desconhecido custa o mesmo que senha errada: não revela quem tem conta
+    armazenado = usuario['hash_senha'] if usuario else autenticacao.hash_ficticio(servico.iteracoes)
+    resultado = servico.verificar(senha, armazenado)
+    if resultado is None:
+        st.warning(MENSAGEM_OCUPADO)
+        return
+    
+    valida, novo_hash = resultado
+    if not (usuario and valida):
+        st.error("❌ E-mail ou senha incorretos.")
+        return
+    if novo_hash is not None:
+        repositorio.atualizar_hash(usuario['id'], novo_hash)
+    iniciar_sessao(repositorio, usuario)
+
+def cadastrar(nome, email, senha, confirmacao):
+    """Cria a conta e já abre a sessão"""
+    if '@' not in email:
+        st.error("❌ Informe um e-mail válido.")
+        return
+    if len(senha) < SENHA_MINIMA:
+        st.error(f"❌ A senha precisa de pelo menos {SENHA_MINIMA} caracteres.")
+        return
+    if senha != confirmacao:
+        st.error("❌ As senhas não conferem.")
+        return
+    
+    hash_senha = obter_servico_autenticacao().gerar_hash(senha)
+    if hash_senha is None:
+        st.warning(MENSAGEM_OCUPADO)
+        return
+    
+    repositorio = obter_repositorio_usuarios()
+    try:
+        usuario = repositorio.criar_usuario(email, nome.strip(), hash_senha)
+    except ValueError:
+        st.error("❌ Já existe uma conta com este e-mail.")
+        return
+    iniciar_sessao(repositorio, usuario)
+
+def encerrar_sessao():
+    token = st.session_state.pop('token_sessao', None)
+    if token:
+        obter_repositorio_usuarios().encerrar_sessao(token)
+    st.session_state.autenticado = False
+
+def sessao_valida():
+    """A sessão do navegador ainda existe no repositório (não expirou nem foi encerrada)"""
+    token = st.session_state.get('token_sessao')
+    return bool(token) and obter_repositorio_usuarios().obter_sessao(token) is not None
+
 def mostrar_tela_login():
     """Tela de login profissional"""
     st.markdown("""
@@ -1560,22 +769,39 @@ def mostrar_tela_login():
         </div>
     """, unsafe_allow_html=True)
     
-    with st.form("login_form"):
-        email = st.text_input("📧 E-mail", placeholder="seu@email.com")
-        senha = st.text_input("🔒 Senha", type="password", placeholder="Sua senha")
-        
-        if st.form_submit_button("🚀 ACESSAR SISTEMA", use_container_width=True):
-            st.session_state.autenticado = True
-            st.session_state.usuario_nome = "Usuário"
-            st.rerun()
+    aba_entrar, aba_cadastro = st.tabs(["Entrar", "Criar conta"])
+    
+    with aba_entrar:
+        with st.form("login_form"):
+            email = st.text_input("📧 E-mail", placeholder="seu@email.com")
+            senha = st.text_input("🔒 Senha", type="password", placeholder="Sua senha")
+            
+            if st.form_submit_button("🚀 ACESSAR SISTEMA", use_container_width=True):
+                entrar(email, senha)
+    
+    with aba_cadastro:
+        with st.form("cadastro_form"):
+            nome = st.text_input("👤 Nome", placeholder="Seu nome")
+            email = st.text_input("📧 E-mail", placeholder="seu@email.com")
+            senha = st.text_input("🔒 Senha", type="password", placeholder=f"Mínimo de {SENHA_MINIMA} caracteres")
+            confirmacao = st.text_input("🔒 Confirme a senha", type="password")
+            
+            if st.form_submit_button("✨ CRIAR CONTA", use_container_width=True):
+                cadastrar(nome, email, senha, confirmacao)
     
     st.markdown("</div>", unsafe_allow_html=True)
 
+@st.cache_resource
+def obter_detector():
+    """Detector compartilhado por todas as sessões (regras compiladas uma vez por processo)"""
+    from burocrata.cache import CacheResultados
+    from burocrata.deteccao import SistemaDetecçãoAvancado
+    
+    return SistemaDetecçãoAvancado(cache_deteccoes=CacheResultados())
+
 def mostrar_tela_principal():
     """Tela principal profissional"""
     
-    detector = SistemaDetecçãoAvancado()
-    
     # Cabeçalho
     st.markdown("""
     <div class="fade-in">
@@ -1601,7 +827,7 @@ def mostrar_tela_principal():
             <div style="display: flex; align-items: center; gap: 15px;">
                 <div style="font-size: 2em;">👤</div>
                 <div>
-                    <strong style="color: #000000; font-size: 1.1em;">{st.session_state.usuario_nome}</strong><br>
+                    <strong style="color: #000000; font-size: 1.1em;">{html.escape(st.session_state.usuario_nome)}</strong><br>
                     <span style="color: #666666; font-size: 0.9em;">Nível Premium - Acesso Completo</span>
                 </div>
             </div>
@@ -1610,7 +836,7 @@ def mostrar_tela_principal():
     
     with col_actions:
         if st.button("🚪 Sair", use_container_width=True, type="secondary"):
-            st.session_state.autenticado = False
+            encerrar_sessao()
             st.rerun()
     
     # Sistema de Detecção
@@ -1690,10 +916,11 @@ def mostrar_tela_principal():
     # Processar
     if arquivo:
         with st.spinner("🔍 **Analisando documento com sistema avançado...**"):
-            texto = extrair_texto_pdf(arquivo)
+            detector = obter_detector()
+            resultado = analisar_pdf_em_fluxo(detector, arquivo)
             
-            if texto:
-                problemas, tipo_doc, verificacoes, metricas = detector.analisar_documento_completo(texto)
+            if resultado:
+                problemas, tipo_doc, verificacoes, metricas = resultado
                 
                 # Resultados
                 st.markdown("---")
@@ -1797,69 +1024,8 @@ def mostrar_tela_principal():
                 if problemas:
                     st.markdown(f"### 🚨 VIOLAÇÕES DETECTADAS ({len(problemas)})")
                     
-                    # Ordenar por gravidade
-                    problemas_ordenados = sorted(problemas, key=lambda x: (
-                        0 if x.get('gravidade') == 'CRÍTICO' else 
-                        1 if x.get('gravidade') == 'ALTO' else 
-                        2 if x.get('gravidade') == 'MÉDIO' else 3
-                    ))
-                    
-                    for i, problema in enumerate(problemas_ordenados, 1):
-                        if problema.get('gravidade') == 'CRÍTICO':
-                            classe_gravidade = "gravity-critical"
-                            classe_problema = "problem-card problem-critical"
-                            icone = '🚨'
-                        elif problema.get('gravidade') == 'ALTO':
-                            classe_gravidade = "gravity-high"
-                            classe_problema = "problem-card problem-high"
-                            icone = '⚠️'
-                        elif problema.get('gravidade') == 'MÉDIO':
-                            classe_gravidade = "gravity-medium"
-                            classe_problema = "problem-card problem-medium"
-                            icone = '🔍'
-                        else:
-                            classe_gravidade = ""
-                            classe_problema = "problem-card"
-                            icone = '📝'
-                        
-                        with st.expander(f"{icone} {i}. {problema.get('nome', 'Problema')}", 
-                                        expanded=(problema.get('gravidade') == 'CRÍTICO')):
-                            st.markdown(f"""
-                            <div class="{classe_problema}">
-                                <div class="problem-header">
-                                    <div class="problem-title">{problema.get('nome', 'Problema')}</div>
-                                    <div class="problem-gravity {classe_gravidade}">
-                                        {problema.get('gravidade', 'NÃO CLASSIFICADO')} • {problema.get('nivel_confianca', 'CONFIRMADO')}
-                                    </div>
-                                </div>
-                            """, unsafe_allow_html=True)
-                            
-                            col_a, col_b = st.columns(2)
-                            
-                            with col_a:
-                                st.markdown("**📋 Descrição do Problema:**")
-                                st.error(problema.get('descricao', 'Descrição não disponível'))
-                                
-                                if problema.get('valor_especifico'):
-                                    st.markdown(f"**🔢 Valor Encontrado:**")
-                                    st.warning(problema['valor_especifico'])
-                                
-                                st.markdown(f"**📝 Texto Detectado:**")
-                                st.code(problema.get('texto_original', problema.get('contexto', 'Texto não disponível')), 
-                                       language='text')
-                            
-                            with col_b:
-                                st.markdown("**⚖️ Base Legal:**")
-                                st.warning(problema.get('lei', 'Informação legal não disponível'))
-                                
-                                if problema.get('penalidade'):
-                                    st.markdown(f"**💰 Penalidade Legal:**")
-                                    st.error(problema['penalidade'])
-                                
-                                st.markdown("**🛡️ Solução Recomendada:**")
-                                st.success(problema.get('solucao', 'Solução não disponível'))
-                            
-                            st.markdown("</div>", unsafe_allow_html=True)
+                    # Agrupados por regra, críticos primeiro, uma página de cartões por vez
+                    mostrar_problemas_paginados(problemas, f"{arquivo.name}:{arquivo.size}")
                     
                     # Exportar relatório
                     st.markdown("### 📥 EXPORTAR RELATÓRIO COMPLETO")
@@ -1875,9 +1041,13 @@ def mostrar_tela_principal():
                                 'Solução': p.get('solucao', ''),
                                 'Penalidade': p.get('penalidade', ''),
                                 'Confiança': p.get('nivel_confianca', ''),
+                                'Página': p.get('pagina', ''),
+                                'Linha': p.get('linha', ''),
                                 'Contexto': p.get('contexto', '')[:200]
                             })
                         
+                        import pandas as pd
+                        
                         df = pd.DataFrame(dados)
                         csv = df.to_csv(index=False, encoding='utf-8-sig')
                         
@@ -1979,6 +1149,8 @@ def main():
     
     if 'autenticado' not in st.session_state:
         st.session_state.autenticado = False
+    elif st.session_state.autenticado and not sessao_valida():
+        encerrar_sessao()
     
     if not st.session_state.autenticado:
         mostrar_tela_login()
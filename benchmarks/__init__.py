@@ -0,0 +1 @@
+"""Benchmarks do pipeline de detecção (python -m benchmarks.deteccao)"""
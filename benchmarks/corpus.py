@@ -0,0 +1,130 @@
+"""Corpus sintético de contratos e notas fiscais para os benchmarks
+
+Cada documento combina um cabeçalho característico do tipo, cláusulas neutras,
+cláusulas que disparam regras e os próprios modelos de `padroes_similares`
+do detector, em proporções fixas e com semente determinística.
+"""
+
+import random
+
+CARACTERES_POR_PAGINA = 3000
+
+CABECALHOS = {
+    'CONTRATO_LOCACAO': [
+        "CONTRATO DE LOCAÇÃO RESIDENCIAL",
+        "Pelo presente instrumento, o LOCADOR e o LOCATÁRIO ajustam a locação do imóvel localizado em São Paulo/SP.",
+    ],
+    'CONTRATO_EMPREGO': [
+        "CONTRATO INDIVIDUAL DE TRABALHO",
+        "O EMPREGADOR e o EMPREGADO, regidos pela CLT, ajustam o contrato de trabalho com registro em carteira.",
+    ],
+    'NOTA_FISCAL': [
+        "NOTA FISCAL ELETRÔNICA - NFe",
+        "Chave de acesso 3524 0112 3456 7800 0190 5500 1000 0012 3410 0001 2345. Protocolo de autorização 135240000012345.",
+    ],
+    'CONTRATO_PRESTACAO_SERVICOS': [
+        "CONTRATO DE PRESTAÇÃO DE SERVIÇOS",
+        "O CONTRATANTE e o CONTRATADO ajustam a prestação de serviços de consultoria, com escopo do serviço definido no anexo.",
+    ],
+}
+
+CLAUSULAS_NEUTRAS = {
+    'CONTRATO_LOCACAO': [
+        "O aluguel mensal é de R$ 2.500,00, com vencimento todo dia 10.",
+        "O reajuste anual será feito pelo IGP-M acumulado no período.",
+        "O prazo de vigência é de 30 meses, com início em 01/02/2024 e término em 31/07/2026.",
+        "A vistoria do imóvel será realizada em conjunto na entrada e na saída.",
+        "As notificações serão feitas por escrito com antecedência mínima de 30 dias.",
+        "Fica eleito o foro da comarca onde está situado o imóvel.",
+    ],
+    'CONTRATO_EMPREGO': [
+        "O salário mensal é de R$ 3.200,00, pago até o quinto dia útil.",
+        "A jornada de trabalho é de 8 horas diárias e 44 horas semanais.",
+        "O empregado terá direito a férias de 30 dias acrescidas de 1/3.",
+        "Os depósitos de FGTS serão realizados mensalmente.",
+        "O período de experiência é de 90 dias a partir de 04/03/2024.",
+        "As horas extras serão remuneradas com adicional de 50%.",
+    ],
+    'NOTA_FISCAL': [
+        "Emitente: Comércio Exemplo Ltda, CNPJ 11.222.333/0001-81.",
+        "Destinatário: Cliente Exemplo S.A., CNPJ 11.444.777/0001-61.",
+        "Valor total dos produtos R$ 1.500,00. Valor do frete R$ 50,00.",
+        "ICMS 18,00% sobre a base de cálculo R$ 1.500,00. CFOP 5102.",
+        "Data de emissão: 15/03/2024.",
+    ],
+    'CONTRATO_PRESTACAO_SERVICOS': [
+        "Os honorários pelos serviços serão de R$ 8.000,00 por etapa concluída.",
+        "O prazo de execução é de 6 meses a partir de 01/04/2024.",
+        "A forma de pagamento será por transferência bancária.",
+        "O contratado definirá livremente seus horários e métodos de trabalho.",
+        "As partes manterão confidencialidade sobre as informações trocadas.",
+    ],
+}
+
+CLAUSULAS_PROBLEMATICAS = {
+    'CONTRATO_LOCACAO': [
+        "O reajuste será livre e definido pelo locador unilateralmente.",
+        "Em caso de rescisão, multa rescisória de 6 meses de aluguel.",
+        "O locatário deverá apresentar fiador e caução simultaneamente.",
+        "A caução corresponde a 5 meses de aluguel.",
+        "Fica eleito o foro da comarca de Brasília para dirimir dúvidas.",
+        "O contrato terá renovação automática por igual período.",
+        "O locatário é obrigado a realizar obras e benfeitorias no imóvel.",
+    ],
+    'CONTRATO_EMPREGO': [
+        "O salário será de R$ 1.000,00 mensais.",
+        "A jornada será de 10 horas diárias, de segunda a sábado.",
+        "O empregado renuncia ao FGTS durante o contrato.",
+        "O período de experiência será de 120 dias.",
+        "As horas extras não serão pagas.",
+    ],
+    'NOTA_FISCAL': [
+        "Emitente CNPJ 12.345.678/0001-90.",
+        "Valor total R$ 1,50 valor dos produtos R$ 15.000,00.",
+        "IPI 5,00% PIS 1,65% COFINS 7,60%.",
+        "Data de emissão 01/01/2020.",
+    ],
+    'CONTRATO_PRESTACAO_SERVICOS': [
+        "O contratado deverá cumprir horário fixo das 08:00 às 17:00.",
+        "Há subordinação hierárquica ao gerente do setor.",
+        "O contratado será supervisionado por coordenador da contratante.",
+        "Exclusividade sem vínculo empregatício com qualquer outra empresa.",
+    ],
+}
+
+TIPOS = tuple(CABECALHOS)
+
+
+def gerar_documento(tipo_doc, paginas, padroes=None, semente=0, proporcao_problemas=0.15):
+    """Gera um documento sintético com aproximadamente `paginas` páginas de texto
+
+    `padroes` (o dicionário do detector) adiciona os modelos de cláusulas
+    similares do tipo ao sorteio das cláusulas problemáticas.
+    """
+    sorteio = random.Random(f"{tipo_doc}:{paginas}:{semente}")
+
+    problematicas = list(CLAUSULAS_PROBLEMATICAS[tipo_doc])
+    if padroes and tipo_doc in padroes:
+        for problema in padroes[tipo_doc]['problemas'].values():
+            problematicas.extend(modelo.capitalize() + "." for modelo in problema.get('padroes_similares', []))
+    neutras = CLAUSULAS_NEUTRAS[tipo_doc]
+
+    texto_paginas = []
+    numero_clausula = 1
+    for numero_pagina in range(paginas):
+        linhas = list(CABECALHOS[tipo_doc]) if numero_pagina == 0 else []
+        tamanho = sum(len(linha) + 1 for linha in linhas)
+
+        while tamanho < CARACTERES_POR_PAGINA:
+            if sorteio.random() < proporcao_problemas:
+                clausula = sorteio.choice(problematicas)
+            else:
+                clausula = sorteio.choice(neutras)
+            linha = f"Cláusula {numero_clausula}. {clausula}"
+            numero_clausula += 1
+            linhas.append(linha)
+            tamanho += len(linha) + 1
+
+        texto_paginas.append("\n".join(linhas))
+
+    return texto_paginas
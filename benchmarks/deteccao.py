@@ -0,0 +1,155 @@
+"""Benchmark por etapa do pipeline de detecção com corpus sintético
+
+    python -m benchmarks.deteccao --paginas 1 10 100 --repeticoes 5
+    python -m benchmarks.deteccao --salvar-baseline benchmarks/baseline.json
+    python -m benchmarks.deteccao --comparar benchmarks/baseline.json --tolerancia 0.25
+
+Cada etapa é cronometrada isoladamente (p50/p95 em ms); o pico de memória é
+medido em uma execução separada com tracemalloc, para não distorcer os tempos.
+Com --comparar, o processo termina com código 1 se alguma etapa ficar mais
+lenta que a baseline além da tolerância, e com código 2 se a baseline foi
+gravada com outra versão das regras (regrave-a junto com a mudança de regras).
+"""
+
+import sys
+import json
+import time
+import argparse
+import platform
+import statistics
+import tracemalloc
+
+from benchmarks.corpus import TIPOS, gerar_documento
+from burocrata.deteccao import SistemaDetecçãoAvancado
+
+
+def _etapas(detector, tipo_doc, texto):
+    """Etapas do pipeline como funções sem argumento, na ordem de execução"""
+    texto_limpo = detector._limpar_texto_profundo(texto)
+    config = detector.padroes[tipo_doc]
+    indice = detector.regras[tipo_doc]['indice_similaridade']
+
+    return {
+        'limpeza': lambda: detector._limpar_texto_profundo(texto),
+        'classificacao': lambda: detector._identificar_tipo_documento(texto_limpo),
+        'valores_datas': lambda: detector._extrair_entidades(texto_limpo),
+        'regras': lambda: list(detector._iterar_matches_regras(tipo_doc, texto_limpo, [])),
+        'similaridade': lambda: detector._detectar_clausulas_similares_avancado(
+            texto_limpo, config['problemas'], indice
+        ),
+        'total': lambda: detector.analisar_documento_completo(texto),
+    }
+
+
+def _percentil(amostras, fracao):
+    ordenadas = sorted(amostras)
+    posicao = min(len(ordenadas) - 1, max(0, round(fracao * (len(ordenadas) - 1))))
+    return ordenadas[posicao]
+
+
+def medir(detector, tipos, paginas, repeticoes):
+    """Retorna {"TIPO/paginas/etapa": {"p50_ms", "p95_ms", "pico_kb"}}"""
+    resultados = {}
+
+    for tipo_doc in tipos:
+        for numero_paginas in paginas:
+            texto = "\n".join(gerar_documento(tipo_doc, numero_paginas, detector.padroes))
+            etapas = _etapas(detector, tipo_doc, texto)
+
+            for nome, etapa in etapas.items():
+                etapa()  # aquecimento
+
+                amostras = []
+                for _ in range(repeticoes):
+                    inicio = time.perf_counter()
+                    etapa()
+                    amostras.append((time.perf_counter() - inicio) * 1000)
+
+                tracemalloc.start()
+                etapa()
+                _, pico = tracemalloc.get_traced_memory()
+                tracemalloc.stop()
+
+                resultados[f"{tipo_doc}/{numero_paginas}/{nome}"] = {
+                    'p50_ms': round(statistics.median(amostras), 3),
+                    'p95_ms': round(_percentil(amostras, 0.95), 3),
+                    'pico_kb': round(pico / 1024, 1),
+                    'caracteres': len(texto)
+                }
+
+    return resultados
+
+
+def comparar(resultados, baseline, tolerancia):
+    """Lista as etapas cujo p50 piorou além da tolerância em relação à baseline"""
+    regressoes = []
+    for chave, atual in resultados.items():
+        anterior = baseline.get('resultados', {}).get(chave)
+        if anterior and atual['p50_ms'] > anterior['p50_ms'] * (1 + tolerancia):
+            regressoes.append((chave, anterior['p50_ms'], atual['p50_ms']))
+    return regressoes
+
+
+def imprimir(resultados, saida=sys.stdout):
+    print(f"{'documento/páginas/etapa':<52} {'p50 ms':>10} {'p95 ms':>10} {'pico KB':>10}", file=saida)
+    for chave, valores in resultados.items():
+        print(
+            f"{chave:<52} {valores['p50_ms']:>10.2f} {valores['p95_ms']:>10.2f} {valores['pico_kb']:>10.1f}",
+            file=saida
+        )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark por etapa do pipeline de detecção')
+    parser.add_argument('--tipos', nargs='+', choices=TIPOS, default=list(TIPOS))
+    parser.add_argument('--paginas', nargs='+', type=int, default=[1, 10, 100], help='Tamanhos (1 a 500 páginas)')
+    parser.add_argument('--repeticoes', type=int, default=5)
+    parser.add_argument('--salvar-baseline', metavar='ARQUIVO')
+    parser.add_argument('--comparar', metavar='ARQUIVO')
+    parser.add_argument('--tolerancia', type=float, default=0.25, help='Piora relativa aceita no p50 (0.25 = 25%%)')
+    parser.add_argument('--ignorar-versao-regras', action='store_true',
+                        help='Compara mesmo que a baseline tenha sido gravada com outras regras')
+    args = parser.parse_args(argv)
+
+    if any(not 1 <= paginas <= 500 for paginas in args.paginas):
+        parser.error('--paginas deve estar entre 1 e 500')
+
+    detector = SistemaDetecçãoAvancado()
+    resultados = medir(detector, args.tipos, args.paginas, args.repeticoes)
+    imprimir(resultados)
+
+    if args.salvar_baseline:
+        with open(args.salvar_baseline, 'w', encoding='utf-8') as arquivo:
+            json.dump({
+                'versao_regras': detector.versao_regras,
+                'python': platform.python_version(),
+                'resultados': resultados
+            }, arquivo, ensure_ascii=False, indent=2)
+        print(f"\nBaseline salva em {args.salvar_baseline}")
+
+    if args.comparar:
+        with open(args.comparar, encoding='utf-8') as arquivo:
+            baseline = json.load(arquivo)
+
+        # Com outras regras os tempos não são comparáveis: a baseline precisa ser regravada
+        versao_baseline = baseline.get('versao_regras')
+        if versao_baseline != detector.versao_regras:
+            print(f"\nBaseline {args.comparar} gravada com as regras {versao_baseline}; "
+                  f"as atuais são {detector.versao_regras}")
+            if not args.ignorar_versao_regras:
+                print("Regrave-a com --salvar-baseline (ou use --ignorar-versao-regras)")
+                return 2
+
+        regressoes = comparar(resultados, baseline, args.tolerancia)
+        if regressoes:
+            print(f"\n{len(regressoes)} regressão(ões) acima de {args.tolerancia:.0%}:")
+            for chave, anterior, atual in regressoes:
+                print(f"  {chave}: {anterior:.2f} ms -> {atual:.2f} ms")
+            return 1
+        print(f"\nSem regressões acima de {args.tolerancia:.0%} em relação a {args.comparar}")
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,76 @@
+"""Confere que a análise incremental e a completa dão o mesmo resultado no corpus
+
+    python -m benchmarks.equivalencia
+    python -m benchmarks.equivalencia --tipos NOTA_FISCAL --paginas 5 50 --sementes 10
+    python -m benchmarks.equivalencia --modo-regras legado --paginas 1
+
+A interface e a auditoria analisam o PDF página a página (AnaliseIncremental)
+e a API analisa o documento inteiro; as duas precisam produzir a mesma tupla
+(problemas, tipo, verificações, métricas), na mesma ordem. O processo termina
+com código 1 se algum documento divergir.
+"""
+
+import sys
+import argparse
+
+from benchmarks.corpus import TIPOS, gerar_documento
+from burocrata.deteccao import AnaliseIncremental, SistemaDetecçãoAvancado
+
+
+def analisar_incremental(detector, paginas):
+    analise = AnaliseIncremental(detector)
+    for texto_pagina in paginas:
+        analise.adicionar_pagina(texto_pagina)
+    return analise.finalizar()
+
+
+def primeira_diferenca(completo, incremental):
+    """Descrição curta da primeira divergência entre os dois resultados (ou None)"""
+    if completo[1:3] != incremental[1:3]:
+        return f"tipo/verificações: {completo[1]} x {incremental[1]}"
+    if len(completo[0]) != len(incremental[0]):
+        return f"{len(completo[0])} problemas x {len(incremental[0])}"
+    for indice, (esperado, obtido) in enumerate(zip(completo[0], incremental[0])):
+        if esperado != obtido:
+            return f"problema {indice}: {esperado.get('id', esperado['nome'])}@{esperado.get('posicao')} " \
+                   f"x {obtido.get('id', obtido['nome'])}@{obtido.get('posicao')}"
+    if completo[3] != incremental[3]:
+        return "métricas"
+    return None
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Equivalência entre análise incremental e completa')
+    parser.add_argument('--tipos', nargs='+', choices=TIPOS, default=list(TIPOS))
+    parser.add_argument('--paginas', nargs='+', type=int, default=[1, 5, 20])
+    parser.add_argument('--sementes', type=int, default=3, help='Documentos por tipo e tamanho')
+    parser.add_argument(
+        '--modo-regras',
+        choices=[SistemaDetecçãoAvancado.MODO_LIMITADO, SistemaDetecçãoAvancado.MODO_LEGADO],
+        default=SistemaDetecçãoAvancado.MODO_LIMITADO
+    )
+    args = parser.parse_args(argv)
+
+    detector = SistemaDetecçãoAvancado(modo_regras=args.modo_regras)
+    divergencias = 0
+    total = 0
+
+    for tipo_doc in args.tipos:
+        for numero_paginas in args.paginas:
+            for semente in range(args.sementes):
+                paginas = gerar_documento(tipo_doc, numero_paginas, detector.padroes, semente=semente)
+                diferenca = primeira_diferenca(
+                    detector.analisar_documento_completo(paginas),
+                    analisar_incremental(detector, paginas)
+                )
+                total += 1
+                if diferenca:
+                    divergencias += 1
+                    print(f"{tipo_doc}/{numero_paginas}/{semente}: {diferenca}")
+
+    print(f"{total - divergencias}/{total} documento(s) equivalentes")
+    return 1 if divergencias else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
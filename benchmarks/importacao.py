@@ -0,0 +1,78 @@
+"""Perfil de importação (python -X importtime) dos pontos de entrada
+
+    python -m benchmarks.importacao
+    python -m benchmarks.importacao --alvos app burocrata.deteccao --repeticoes 5 --top 15
+    python -m benchmarks.importacao --proibir pdfplumber pandas numpy
+
+Cada alvo é importado em um interpretador novo (partida a frio de um worker);
+o tempo cumulativo vem das linhas do -X importtime e é a mediana das
+repetições. Com --proibir, o processo termina com código 1 se algum dos
+módulos pesados for carregado pela importação do primeiro alvo (o script do
+app, cuja execução no topo é o que a tela de login paga).
+"""
+
+import os
+import sys
+import argparse
+import statistics
+import subprocess
+from pathlib import Path
+
+RAIZ = Path(__file__).resolve().parent.parent
+
+PESADOS = ('pdfplumber', 'pandas', 'numpy')
+
+
+def perfilar(alvo):
+    """Importa o alvo em um processo novo e retorna {módulo: (próprio µs, cumulativo µs)}"""
+    ambiente = dict(os.environ, PYTHONPATH=str(RAIZ))
+    processo = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {alvo}'],
+        cwd=RAIZ, env=ambiente, capture_output=True, text=True
+    )
+    if processo.returncode != 0:
+        raise RuntimeError(f"Falha ao importar {alvo}:\n{processo.stderr[-2000:]}")
+
+    modulos = {}
+    for linha in processo.stderr.splitlines():
+        if not linha.startswith('import time:') or 'self [us]' in linha:
+            continue
+        proprio, cumulativo, nome = linha[len('import time:'):].split('|')
+        modulos[nome.strip()] = (int(proprio), int(cumulativo))
+    return modulos
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Perfil de importação dos pontos de entrada')
+    parser.add_argument('--alvos', nargs='+', default=['app', 'burocrata.deteccao', 'burocrata.extracao'])
+    parser.add_argument('--repeticoes', type=int, default=3)
+    parser.add_argument('--top', type=int, default=10, help='Módulos mais caros listados por alvo')
+    parser.add_argument('--proibir', nargs='*', default=None, metavar='MODULO',
+                        help=f'Módulos que o primeiro alvo não pode carregar (sem valores: {" ".join(PESADOS)})')
+    args = parser.parse_args(argv)
+
+    proibidos = PESADOS if args.proibir == [] else tuple(args.proibir or ())
+    violacoes = []
+
+    for indice, alvo in enumerate(args.alvos):
+        perfis = [perfilar(alvo) for _ in range(args.repeticoes)]
+        total_ms = statistics.median(perfil[alvo][1] for perfil in perfis) / 1000
+        perfil = perfis[-1]
+        pesados = [nome for nome in PESADOS if nome in perfil]
+
+        print(f"\n{alvo}: {total_ms:.1f} ms, {len(perfil)} módulos, pesados: {', '.join(pesados) or 'nenhum'}")
+        print(f"  {'módulo':<56} {'próprio ms':>11} {'cumul. ms':>10}")
+        for nome, (proprio, cumulativo) in sorted(perfil.items(), key=lambda item: -item[1][1])[1:args.top + 1]:
+            print(f"  {nome:<56} {proprio / 1000:>11.1f} {cumulativo / 1000:>10.1f}")
+
+        if indice == 0:
+            violacoes = [nome for nome in proibidos if nome in perfil]
+
+    if violacoes:
+        print(f"\n{args.alvos[0]} carrega módulos proibidos na partida: {', '.join(violacoes)}")
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
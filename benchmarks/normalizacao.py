@@ -0,0 +1,97 @@
+"""Benchmark da normalização de texto: implementação anterior x passada única
+
+    python -m benchmarks.normalizacao --paginas 10 100 500
+
+Confere que as duas implementações produzem exatamente a mesma saída para o
+corpus sintético (com acentos, glifos de PDF e caracteres de controle
+injetados) e compara tempo e pico de memória.
+"""
+
+import re
+import sys
+import time
+import random
+import argparse
+import statistics
+import tracemalloc
+import unicodedata
+
+from benchmarks.corpus import TIPOS, gerar_documento
+from burocrata.deteccao import SistemaDetecçãoAvancado
+
+
+def limpar_texto_legado(texto):
+    """Implementação anterior (várias passadas), mantida como referência de saída"""
+    if not texto:
+        return ""
+
+    texto = re.sub(r'[\x00-\x08\x0b\x0c\x0e-\x1f\x7f-\x9f\u200b-\u200f\u2028-\u202f]', '', texto)
+
+    for codigo in range(0x80, 0x9e):
+        texto = texto.replace(chr(codigo), ' ')
+
+    texto = texto.lower()
+    texto = unicodedata.normalize('NFKD', texto)
+    texto = ''.join([c for c in texto if not unicodedata.combining(c)])
+
+    texto = re.sub(r'\s+', ' ', texto)
+    texto = re.sub(r'[\r\n\t]+', ' ', texto)
+
+    return texto.strip()
+
+
+def _sujar(texto, semente=0):
+    """Injeta ruído típico de extração de PDF: controles, glifos, espaços largos"""
+    sorteio = random.Random(semente)
+    ruidos = ['\x0c', '\x00', '\u200b', '\u00a0', '\t', '\x92', '\u2029', '\ufb01', '\u216b']
+    partes = texto.split(' ')
+    return ' '.join(parte + sorteio.choice(ruidos) if sorteio.random() < 0.05 else parte for parte in partes)
+
+
+def _medir(funcao, texto, repeticoes):
+    funcao(texto)
+    amostras = []
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        funcao(texto)
+        amostras.append((time.perf_counter() - inicio) * 1000)
+
+    tracemalloc.start()
+    funcao(texto)
+    _, pico = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return statistics.median(amostras), pico / 1024
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark da normalização de texto')
+    parser.add_argument('--paginas', nargs='+', type=int, default=[10, 100, 500])
+    parser.add_argument('--repeticoes', type=int, default=5)
+    args = parser.parse_args(argv)
+
+    detector = SistemaDetecçãoAvancado()
+    divergencias = 0
+
+    print(f"{'documento/páginas':<36} {'legado ms':>10} {'novo ms':>10} {'legado KB':>10} {'novo KB':>10}")
+    for tipo_doc in TIPOS:
+        for paginas in args.paginas:
+            texto = _sujar("\n".join(gerar_documento(tipo_doc, paginas)))
+
+            if limpar_texto_legado(texto) != detector._limpar_texto_profundo(texto):
+                divergencias += 1
+                print(f"{tipo_doc}/{paginas}: SAÍDAS DIFERENTES")
+                continue
+
+            tempo_legado, memoria_legado = _medir(limpar_texto_legado, texto, args.repeticoes)
+            tempo_novo, memoria_novo = _medir(detector._limpar_texto_profundo, texto, args.repeticoes)
+            print(
+                f"{tipo_doc + '/' + str(paginas):<36} {tempo_legado:>10.2f} {tempo_novo:>10.2f} "
+                f"{memoria_legado:>10.1f} {memoria_novo:>10.1f}"
+            )
+
+    return 1 if divergencias else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
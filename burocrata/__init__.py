@@ -0,0 +1 @@
+"""Burocrata de Bolso - núcleo de análise reutilizável fora da interface Streamlit"""
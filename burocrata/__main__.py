@@ -0,0 +1,86 @@
+"""Linha de comando
+
+    python -m burocrata auditar DIRETORIO --jobs N --out resultados.jsonl [--max-paginas N --max-mb N --ocr]
+    python -m burocrata servir --porta 8765 --workers 2 --fila 8
+"""
+
+import argparse
+import sys
+
+from burocrata.api import servir
+from burocrata.auditoria import auditar_diretorio
+from burocrata.deteccao import SistemaDetecçãoAvancado
+from burocrata.extracao import EXTRATORES
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='burocrata', description='Burocrata de Bolso - auditoria sem interface')
+    subcomandos = parser.add_subparsers(dest='comando', required=True)
+
+    auditar = subcomandos.add_parser('auditar', aliases=['audit'], help='Audita todos os PDFs de um diretório')
+    auditar.add_argument('diretorio', help='Diretório com os PDFs (busca recursiva)')
+    auditar.add_argument('-j', '--jobs', type=int, default=None, help='Processos paralelos (padrão: número de CPUs)')
+    auditar.add_argument('-o', '--out', default='resultados.jsonl', help='Arquivo JSON Lines de saída (também é o checkpoint)')
+    auditar.add_argument('--reiniciar', action='store_true', help='Ignora o checkpoint e sobrescreve a saída')
+    auditar.add_argument('--max-paginas', type=int, default=None, help='Extrai no máximo N páginas de cada PDF')
+    auditar.add_argument('--max-mb', type=float, default=None, help='Recusa PDFs maiores que N MB')
+    auditar.add_argument(
+        '--extrator', choices=sorted(EXTRATORES), default=None,
+        help='Extrator de texto (padrão: rapido, com fallback para o pdfplumber nas páginas ilegíveis)'
+    )
+    auditar.add_argument(
+        '--ocr', action='store_true', default=None,
+        help='OCR local (Tesseract) nas páginas sem texto (padrão: variável BUROCRATA_OCR)'
+    )
+
+    servidor = subcomandos.add_parser('servir', aliases=['serve'], help='Sobe a API HTTP local de análise')
+    servidor.add_argument('--host', default='127.0.0.1')
+    servidor.add_argument('--porta', '--port', type=int, default=8765)
+    servidor.add_argument('--workers', type=int, default=2, help='Processos de análise')
+    servidor.add_argument('--fila', type=int, default=8, help='Requisições aguardando além dos workers')
+    servidor.add_argument('--tempo-limite', type=float, default=120.0, help='Segundos por análise')
+
+    for subparser in (auditar, servidor):
+        subparser.add_argument(
+            '--modo-regras',
+            choices=[SistemaDetecçãoAvancado.MODO_LIMITADO, SistemaDetecçãoAvancado.MODO_LEGADO],
+            default=SistemaDetecçãoAvancado.MODO_LIMITADO
+        )
+        subparser.add_argument(
+            '--kb-classificacao', type=int, default=None,
+            help='Classifica o tipo do documento só pelos primeiros N KB de texto'
+        )
+        subparser.add_argument(
+            '--regras', metavar='DIRETORIO', default=None,
+            help='Diretório dos pacotes de regras JSON (padrão: burocrata/regras); recarregados quando mudam'
+        )
+
+    args = parser.parse_args(argv)
+    opcoes_detector = {
+        'modo_regras': args.modo_regras,
+        'kb_classificacao': args.kb_classificacao,
+        'diretorio_regras': args.regras
+    }
+
+    if args.comando in ('servir', 'serve'):
+        servir(args.host, args.porta, args.workers, args.fila, args.tempo_limite, opcoes_detector)
+        return 0
+
+    medidor = auditar_diretorio(
+        args.diretorio,
+        args.out,
+        jobs=args.jobs,
+        retomar=not args.reiniciar,
+        opcoes_detector=opcoes_detector,
+        opcoes_extracao={
+            'max_paginas': args.max_paginas,
+            'max_bytes': None if args.max_mb is None else int(args.max_mb * 2 ** 20),
+            'extrator': args.extrator,
+            'ocr': args.ocr
+        }
+    )
+    return 1 if medidor.erros else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,242 @@
+"""Serviço HTTP local de análise (stdlib), independente da interface Streamlit
+
+    POST /analyze   corpo application/pdf, text/plain ou JSON {"texto": "..."}
+    GET  /health    estado do pool e da fila
+
+A análise roda em um pool de processos limitado. Requisições além da
+capacidade (workers + fila) recebem 503 com Retry-After, em vez de se
+acumularem indefinidamente.
+"""
+
+import json
+import time
+import logging
+import threading
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FuturoTimeout
+from concurrent.futures.process import BrokenProcessPool
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from burocrata.deteccao import SistemaDetecçãoAvancado
+from burocrata.extracao import extrair_texto_paginas
+
+logger = logging.getLogger(__name__)
+
+TAMANHO_MAXIMO_CORPO = 50 * 1024 * 1024
+
+# Detector de cada processo do pool (criado uma vez pelo inicializador)
+_detector = None
+
+
+def _inicializar_worker(opcoes_detector):
+    global _detector
+    _detector = SistemaDetecçãoAvancado(**opcoes_detector)
+
+
+def _formatar_resultado(resultado, paginas=None):
+    problemas, tipo_doc, verificacoes, metricas = resultado
+    resposta = {
+        'tipo_documento': tipo_doc,
+        'problemas': problemas,
+        'verificacoes': verificacoes,
+        'metricas': metricas
+    }
+    if paginas is not None:
+        resposta['paginas'] = paginas
+    return resposta
+
+
+def analisar_pdf(dados_pdf):
+    """Extração + análise de um PDF dentro do worker"""
+    paginas = extrair_texto_paginas(dados_pdf, max_workers=1)
+    paginas = [texto_pagina or '' for texto_pagina in paginas]
+    if not any(texto_pagina.strip() for texto_pagina in paginas):
+        raise ValueError('PDF sem camada de texto')
+    return _formatar_resultado(_detector.analisar_documento_completo(paginas), len(paginas))
+
+
+def analisar_texto(texto):
+    """Análise de texto já extraído dentro do worker"""
+    return _formatar_resultado(_detector.analisar_documento_completo(texto))
+
+
+class ServicoAnalise:
+    """Pool de processos com fila limitada e métricas simples de uso"""
+
+    def __init__(self, workers=2, fila=8, tempo_limite=120.0, opcoes_detector=None):
+        self.workers = workers
+        self.capacidade = workers + fila
+        self.tempo_limite = tempo_limite
+        self._vagas = threading.BoundedSemaphore(self.capacidade)
+        self._lock = threading.Lock()
+        self.em_andamento = 0
+        self.atendidas = 0
+        self.rejeitadas = 0
+        self.pools_recriados = 0
+        self._opcoes_detector = opcoes_detector or {}
+        self._executor = self._criar_executor()
+
+    def _criar_executor(self):
+        return ProcessPoolExecutor(
+            max_workers=self.workers,
+            initializer=_inicializar_worker,
+            initargs=(self._opcoes_detector,)
+        )
+
+    def _recriar_executor(self, quebrado):
+        """Troca um pool quebrado (worker morto) por um novo; sem isso toda requisição seguinte falharia"""
+        with self._lock:
+            if self._executor is not quebrado:
+                return
+            self._executor = self._criar_executor()
+            self.pools_recriados += 1
+        logger.warning("Worker de análise morreu; pool de processos recriado")
+        quebrado.shutdown(wait=False, cancel_futures=True)
+
+    def executar(self, funcao, argumento):
+        """Executa no pool; retorna None se não houver vaga (backpressure)"""
+        if not self._vagas.acquire(blocking=False):
+            with self._lock:
+                self.rejeitadas += 1
+            return None
+
+        with self._lock:
+            self.em_andamento += 1
+            executor = self._executor
+        try:
+            try:
+                futuro = executor.submit(funcao, argumento)
+            except BrokenProcessPool:
+                self._recriar_executor(executor)
+                executor = self._executor
+                futuro = executor.submit(funcao, argumento)
+        except BaseException:
+            self._liberar_vaga()
+            raise
+
+        # A vaga só volta quando o worker termina: depois de um 504 a análise
+        # continua ocupando o processo e precisa continuar contando na capacidade
+        futuro.add_done_callback(lambda _: self._liberar_vaga())
+        try:
+            return futuro.result(timeout=self.tempo_limite)
+        except BrokenProcessPool:
+            # O worker morreu nesta análise (falta de memória, falha nativa): esta
+            # requisição falha, as próximas vão para um pool novo
+            self._recriar_executor(executor)
+            raise
+
+    def _liberar_vaga(self):
+        with self._lock:
+            self.em_andamento -= 1
+            self.atendidas += 1
+        self._vagas.release()
+
+    def estado(self):
+        with self._lock:
+            return {
+                'workers': self.workers,
+                'capacidade': self.capacidade,
+                'em_andamento': self.em_andamento,
+                'atendidas': self.atendidas,
+                'rejeitadas': self.rejeitadas,
+                'pools_recriados': self.pools_recriados
+            }
+
+    def encerrar(self):
+        self._executor.shutdown(cancel_futures=True)
+
+
+class ManipuladorAnalise(BaseHTTPRequestHandler):
+    """Rotas HTTP do serviço (o servidor expõe `servico`)"""
+
+    server_version = 'BurocrataAPI/1.0'
+
+    def _responder(self, status, corpo, cabecalhos=None):
+        dados = json.dumps(corpo, ensure_ascii=False).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(dados)))
+        for nome, valor in (cabecalhos or {}).items():
+            self.send_header(nome, valor)
+        self.end_headers()
+        self.wfile.write(dados)
+
+    def do_GET(self):
+        if self.path == '/health':
+            self._responder(200, {'status': 'ok', **self.server.servico.estado()})
+        else:
+            self._responder(404, {'erro': 'Rota não encontrada'})
+
+    def do_POST(self):
+        if self.path not in ('/analyze', '/analisar'):
+            self._responder(404, {'erro': 'Rota não encontrada'})
+            return
+
+        try:
+            tamanho = int(self.headers.get('Content-Length') or 0)
+        except ValueError:
+            self._responder(400, {'erro': 'Content-Length inválido'})
+            return
+        if tamanho <= 0:
+            self._responder(400, {'erro': 'Corpo da requisição vazio'})
+            return
+        if tamanho > TAMANHO_MAXIMO_CORPO:
+            self._responder(413, {'erro': f'Corpo maior que {TAMANHO_MAXIMO_CORPO} bytes'})
+            return
+
+        corpo = self.rfile.read(tamanho)
+        tipo_conteudo = (self.headers.get('Content-Type') or '').split(';')[0].strip().lower()
+
+        try:
+            if tipo_conteudo == 'application/pdf' or corpo.startswith(b'%PDF'):
+                funcao, argumento = analisar_pdf, corpo
+            elif tipo_conteudo == 'application/json':
+                texto = json.loads(corpo)['texto']
+                if not isinstance(texto, str):
+                    raise TypeError('"texto" deve ser uma string')
+                funcao, argumento = analisar_texto, texto
+            else:
+                funcao, argumento = analisar_texto, corpo.decode('utf-8')
+        except (ValueError, KeyError, TypeError):
+            self._responder(400, {'erro': 'Envie um PDF, texto puro ou JSON {"texto": "..."}'})
+            return
+
+        inicio = time.perf_counter()
+        try:
+            resposta = self.server.servico.executar(funcao, argumento)
+        except FuturoTimeout:
+            self._responder(504, {'erro': 'Tempo limite de análise excedido'})
+            return
+        except ValueError as e:
+            self._responder(422, {'erro': str(e)})
+            return
+        except Exception as e:
+            logger.exception("Falha na análise")
+            self._responder(500, {'erro': f"{type(e).__name__}: {e}"})
+            return
+
+        if resposta is None:
+            self._responder(503, {'erro': 'Fila de análise cheia'}, {'Retry-After': '5'})
+            return
+
+        resposta['segundos'] = round(time.perf_counter() - inicio, 4)
+        self._responder(200, resposta)
+
+    def log_message(self, formato, *args):
+        logger.info("%s - %s", self.address_string(), formato % args)
+
+
+def servir(host='127.0.0.1', porta=8765, workers=2, fila=8, tempo_limite=120.0, opcoes_detector=None):
+    """Sobe o servidor HTTP e bloqueia até Ctrl+C"""
+    servico = ServicoAnalise(workers, fila, tempo_limite, opcoes_detector)
+    servidor = ThreadingHTTPServer((host, porta), ManipuladorAnalise)
+    servidor.servico = servico
+    servidor.daemon_threads = True
+
+    print(f"Serviço de análise em http://{host}:{porta} • {workers} worker(s), fila de {fila}")
+    try:
+        servidor.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        servidor.server_close()
+        servico.encerrar()
@@ -0,0 +1,176 @@
+"""Auditoria em lote de diretórios de PDFs, sem a interface Streamlit"""
+
+import os
+import sys
+import json
+import time
+import hashlib
+from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+
+from burocrata.deteccao import AnaliseIncremental, SistemaDetecçãoAvancado
+from burocrata.extracao import MedidorPicoMemoria, iterar_texto_paginas
+
+# Detector de cada processo do pool (criado uma vez pelo inicializador)
+_detector = None
+
+
+def _inicializar_worker(opcoes_detector):
+    global _detector
+    _detector = SistemaDetecçãoAvancado(**opcoes_detector)
+
+
+def auditar_arquivo(caminho, detector=None, opcoes_extracao=None):
+    """Extrai e analisa um PDF, retornando um registro serializável em JSON
+
+    Cada página vai para a AnaliseIncremental assim que é extraída, com a página
+    do pdfplumber fechada logo após o uso e os limites de `opcoes_extracao`
+    (max_paginas, max_bytes). Só a página atual passa pela normalização (os
+    vetores por caractere); do documento ficam a janela de texto em análise,
+    os mapas de posição compactados de cada página e os problemas. Duas
+    exceções guardam o texto inteiro: documento cujo tipo não sai das primeiras
+    páginas e o modo legado das regras, analisado por completo no fim. O
+    registro traz o pico de memória residente do worker.
+    """
+    detector = detector or _detector
+    opcoes_extracao = opcoes_extracao or {}
+    inicio = time.perf_counter()
+    registro = {'arquivo': str(caminho)}
+
+    with MedidorPicoMemoria() as memoria:
+        try:
+            dados = Path(caminho).read_bytes()
+            registro['sha256'] = hashlib.sha256(dados).hexdigest()
+
+            detector.recarregar_regras()
+            analise = AnaliseIncremental(detector)
+            registro['paginas'] = 0
+            # Já estamos dentro de um worker: a extração roda no próprio processo
+            for texto_pagina in iterar_texto_paginas(dados, max_workers=1, **opcoes_extracao):
+                analise.adicionar_pagina(texto_pagina)
+                registro['paginas'] += 1
+            del dados
+
+            if not analise.possui_texto:
+                registro['erro'] = 'PDF sem camada de texto'
+            else:
+                # Com as páginas separadas, cada problema sai com página e linha
+                problemas, tipo_doc, _, metricas = analise.finalizar()
+                registro['tipo_documento'] = tipo_doc
+                registro['metricas'] = metricas
+                registro['problemas'] = problemas
+        except Exception as e:
+            registro['erro'] = f"{type(e).__name__}: {e}"
+
+    registro['segundos'] = round(time.perf_counter() - inicio, 4)
+    registro['pico_memoria_mb'] = memoria.pico_mb
+    registro['acrescimo_memoria_mb'] = memoria.acrescimo_mb
+    return registro
+
+
+def listar_pdfs(diretorio):
+    """Todos os PDFs do diretório (recursivo), em ordem estável"""
+    return sorted(
+        str(caminho) for caminho in Path(diretorio).rglob('*')
+        if caminho.is_file() and caminho.suffix.lower() == '.pdf'
+    )
+
+
+def carregar_checkpoint(caminho_saida):
+    """Arquivos já presentes no JSON Lines de saída (linhas incompletas são ignoradas)"""
+    concluidos = set()
+    if not os.path.exists(caminho_saida):
+        return concluidos
+
+    with open(caminho_saida, encoding='utf-8') as saida:
+        for linha in saida:
+            try:
+                concluidos.add(json.loads(linha)['arquivo'])
+            except (ValueError, KeyError):
+                continue
+    return concluidos
+
+
+class MedidorVazao:
+    """Acumula documentos e páginas processados e formata a vazão"""
+
+    def __init__(self):
+        self.inicio = time.perf_counter()
+        self.documentos = 0
+        self.paginas = 0
+        self.erros = 0
+        self.pico_memoria_mb = 0.0
+
+    def registrar(self, registro):
+        self.documentos += 1
+        self.paginas += registro.get('paginas', 0)
+        if 'erro' in registro:
+            self.erros += 1
+        self.pico_memoria_mb = max(self.pico_memoria_mb, registro.get('pico_memoria_mb') or 0.0)
+
+    def resumo(self):
+        decorrido = max(time.perf_counter() - self.inicio, 1e-9)
+        return (
+            f"{self.documentos} documento(s), {self.paginas} página(s), {self.erros} erro(s) "
+            f"em {decorrido:.1f}s • {self.documentos / decorrido:.2f} docs/s • {self.paginas / decorrido:.1f} páginas/s "
+            f"• pico de memória por worker {self.pico_memoria_mb:.0f} MB"
+        )
+
+
+def auditar_diretorio(diretorio, caminho_saida, jobs=None, retomar=True, opcoes_detector=None,
+                      intervalo_relatorio=10.0, saida_relatorio=sys.stderr, opcoes_extracao=None):
+    """Audita todos os PDFs de um diretório em paralelo, gravando um JSON por linha
+
+    O próprio arquivo de saída serve de checkpoint: com `retomar`, os PDFs já
+    registrados nele são pulados e os novos resultados são acrescentados.
+    """
+    jobs = jobs or os.cpu_count() or 1
+    opcoes_detector = opcoes_detector or {}
+
+    arquivos = listar_pdfs(diretorio)
+    if retomar:
+        concluidos = carregar_checkpoint(caminho_saida)
+        pendentes = [arquivo for arquivo in arquivos if arquivo not in concluidos]
+    else:
+        pendentes = arquivos
+
+    print(
+        f"{len(arquivos)} PDF(s) encontrados, {len(arquivos) - len(pendentes)} já auditados, "
+        f"{len(pendentes)} pendente(s) • {jobs} processo(s)",
+        file=saida_relatorio
+    )
+
+    medidor = MedidorVazao()
+    ultimo_relatorio = time.perf_counter()
+    modo = 'a' if retomar else 'w'
+
+    with open(caminho_saida, modo, encoding='utf-8') as saida, ProcessPoolExecutor(
+        max_workers=jobs, initializer=_inicializar_worker, initargs=(opcoes_detector,)
+    ) as executor:
+        fila = iter(pendentes)
+        em_andamento = set()
+
+        def preencher():
+            # Limita as tarefas em voo para não materializar milhares de futuros
+            for arquivo in fila:
+                em_andamento.add(executor.submit(auditar_arquivo, arquivo, None, opcoes_extracao))
+                if len(em_andamento) >= jobs * 2:
+                    break
+
+        preencher()
+        while em_andamento:
+            prontos, _ = wait(em_andamento, return_when=FIRST_COMPLETED)
+            for futuro in prontos:
+                em_andamento.discard(futuro)
+                registro = futuro.result()
+                saida.write(json.dumps(registro, ensure_ascii=False) + "\n")
+                medidor.registrar(registro)
+            saida.flush()
+            preencher()
+
+            if time.perf_counter() - ultimo_relatorio >= intervalo_relatorio:
+                print(medidor.resumo(), file=saida_relatorio)
+                ultimo_relatorio = time.perf_counter()
+
+    print(f"Concluído: {medidor.resumo()}", file=saida_relatorio)
+    return medidor
@@ -0,0 +1,220 @@
+"""Hash de senhas (PBKDF2-HMAC-SHA512) fora da thread da sessão
+
+O hash armazenado carrega o custo com que foi gerado:
+
+    pbkdf2_sha512$<iterações>$<salt>$<hash hex>
+
+Assim o custo pode subir sem invalidar as senhas existentes: no login
+bem-sucedido de um hash mais barato que o configurado, o serviço devolve um
+hash novo para ser gravado no lugar do antigo.
+
+O PBKDF2 do hashlib (OpenSSL) solta o GIL enquanto calcula, então um pool de
+threads já executa os hashes em paralelo sem travar as demais sessões. O
+pool é limitado (por padrão metade das CPUs, para sobrar núcleo para a
+análise de documentos) e a fila também: além da capacidade, a verificação
+é recusada na hora em vez de empilhar logins.
+"""
+
+import os
+import hmac
+import time
+import hashlib
+import secrets
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FuturoTimeout
+
+ALGORITMO = 'pbkdf2_sha512'
+ITERACOES_PADRAO = 1000000
+TAMANHO_HASH = 64
+AMOSTRAS_LATENCIA = 1000  # últimas verificações consideradas nos percentis
+
+
+def iteracoes_padrao():
+    """Custo do PBKDF2 para hashes novos (variável BUROCRATA_PBKDF2_ITERACOES ou 1.000.000)"""
+    try:
+        return max(1, int(os.environ.get('BUROCRATA_PBKDF2_ITERACOES', '')))
+    except ValueError:
+        return ITERACOES_PADRAO
+
+
+def workers_padrao():
+    """Threads de hash (variável BUROCRATA_WORKERS_SENHA ou metade das CPUs)"""
+    try:
+        return max(1, int(os.environ.get('BUROCRATA_WORKERS_SENHA', '')))
+    except ValueError:
+        return max(1, (os.cpu_count() or 1) // 2)
+
+
+def gerar_salt():
+    """Salt aleatório de 32 bytes (hex)"""
+    return secrets.token_hex(32)
+
+
+def derivar(senha, salt, iteracoes):
+    """Hash hex da senha; o salt entra como texto UTF-8, como no formato original do app"""
+    return hashlib.pbkdf2_hmac(
+        'sha512',
+        senha.encode('utf-8'),
+        salt.encode('utf-8'),
+        iteracoes,
+        dklen=TAMANHO_HASH
+    ).hex()
+
+
+def codificar(iteracoes, salt, hash_hex):
+    return f"{ALGORITMO}${iteracoes}${salt}${hash_hex}"
+
+
+def decodificar(armazenado):
+    """(iterações, salt, hash hex) de um hash armazenado; ValueError se o formato não for reconhecido"""
+    try:
+        algoritmo, iteracoes, salt, hash_hex = armazenado.split('$')
+        iteracoes = int(iteracoes)
+    except (AttributeError, ValueError):
+        raise ValueError("Hash de senha em formato desconhecido") from None
+    if algoritmo != ALGORITMO or iteracoes < 1:
+        raise ValueError(f"Hash de senha em formato desconhecido: {algoritmo}")
+    return iteracoes, salt, hash_hex
+
+
+def gerar_hash(senha, iteracoes=None):
+    """Hash armazenável de uma senha nova"""
+    iteracoes = iteracoes or iteracoes_padrao()
+    salt = gerar_salt()
+    return codificar(iteracoes, salt, derivar(senha, salt, iteracoes))
+
+
+def verificar_hash(senha, armazenado):
+    """Compara a senha com o hash armazenado em tempo constante"""
+    iteracoes, salt, hash_hex = decodificar(armazenado)
+    return hmac.compare_digest(derivar(senha, salt, iteracoes), hash_hex)
+
+
+def hash_ficticio(iteracoes):
+    """Hash que nunca confere, com o custo dado: verificar e-mails inexistentes contra ele iguala o tempo de resposta"""
+    return codificar(iteracoes, '0' * 64, '')
+
+
+def precisa_atualizar(armazenado, iteracoes):
+    """Verdadeiro se o hash foi gerado com custo menor que `iteracoes`"""
+    return decodificar(armazenado)[0] < iteracoes
+
+
+def _verificar_e_atualizar(senha, armazenado, iteracoes):
+    """(válida, hash novo ou None) — o hash novo só existe para senha válida com custo defasado"""
+    if not verificar_hash(senha, armazenado):
+        return False, None
+    if precisa_atualizar(armazenado, iteracoes):
+        return True, gerar_hash(senha, iteracoes)
+    return True, None
+
+
+def _percentis(amostras):
+    if not amostras:
+        return {'p50_ms': None, 'p95_ms': None, 'max_ms': None}
+    ordenadas = sorted(amostras)
+    return {
+        'p50_ms': round(ordenadas[len(ordenadas) // 2] * 1000, 1),
+        'p95_ms': round(ordenadas[min(len(ordenadas) - 1, int(len(ordenadas) * 0.95))] * 1000, 1),
+        'max_ms': round(ordenadas[-1] * 1000, 1)
+    }
+
+
+class ServicoAutenticacao:
+    """Pool de threads com fila limitada para gerar e verificar hashes, com métricas de latência"""
+
+    def __init__(self, workers=None, fila=16, tempo_limite=30.0, iteracoes=None):
+        self.workers = workers or workers_padrao()
+        self.capacidade = self.workers + fila
+        self.tempo_limite = tempo_limite
+        self.iteracoes = iteracoes or iteracoes_padrao()
+        self._vagas = threading.BoundedSemaphore(self.capacidade)
+        self._lock = threading.Lock()
+        self.em_andamento = 0
+        self.atendidas = 0
+        self.rejeitadas = 0
+        self.expiradas = 0
+        self.rehashes = 0
+        self._esperas = deque(maxlen=AMOSTRAS_LATENCIA)
+        self._totais = deque(maxlen=AMOSTRAS_LATENCIA)
+        self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='burocrata-senha')
+
+    def _executar(self, funcao, *argumentos):
+        """Executa no pool; retorna None se não houver vaga (backpressure) ou se passar do tempo limite
+
+        A vaga só volta ao semáforo quando a tarefa termina: uma verificação que
+        estourou o tempo continua ocupando o worker (ou a fila) até acabar.
+        """
+        if not self._vagas.acquire(blocking=False):
+            with self._lock:
+                self.rejeitadas += 1
+            return None
+
+        with self._lock:
+            self.em_andamento += 1
+        enviado = time.perf_counter()
+        inicio = []
+
+        def tarefa():
+            inicio.append(time.perf_counter())
+            return funcao(*argumentos)
+
+        def liberar_vaga(_):
+            fim = time.perf_counter()
+            with self._lock:
+                self.em_andamento -= 1
+                self.atendidas += 1
+                self._esperas.append((inicio[0] if inicio else fim) - enviado)
+                self._totais.append(fim - enviado)
+            self._vagas.release()
+
+        try:
+            futuro = self._executor.submit(tarefa)
+        except BaseException:
+            with self._lock:
+                self.em_andamento -= 1
+            self._vagas.release()
+            raise
+        futuro.add_done_callback(liberar_vaga)
+
+        try:
+            return futuro.result(timeout=self.tempo_limite)
+        except FuturoTimeout:
+            with self._lock:
+                self.expiradas += 1
+            return None
+
+    def gerar_hash(self, senha):
+        """Hash armazenável com o custo atual; None se o serviço estiver sem vaga ou demorar demais"""
+        return self._executar(gerar_hash, senha, self.iteracoes)
+
+    def verificar(self, senha, armazenado):
+        """(válida, hash novo ou None); None se o serviço estiver sem vaga ou demorar demais
+
+        O hash novo vem quando a senha confere mas foi gerada com custo menor
+        que o configurado: quem chamou deve gravá-lo no lugar do antigo.
+        """
+        resultado = self._executar(_verificar_e_atualizar, senha, armazenado, self.iteracoes)
+        if resultado is not None and resultado[1] is not None:
+            with self._lock:
+                self.rehashes += 1
+        return resultado
+
+    def estado(self):
+        with self._lock:
+            return {
+                'workers': self.workers,
+                'capacidade': self.capacidade,
+                'iteracoes': self.iteracoes,
+                'em_andamento': self.em_andamento,
+                'atendidas': self.atendidas,
+                'rejeitadas': self.rejeitadas,
+                'expiradas': self.expiradas,
+                'rehashes': self.rehashes,
+                'espera': _percentis(self._esperas),
+                'total': _percentis(self._totais)
+            }
+
+    def encerrar(self):
+        self._executor.shutdown(cancel_futures=True)
@@ -0,0 +1,124 @@
+"""Busca de regex em um processo filho, encerrado se passar do tempo
+
+O `re` não tem tempo limite nem solta o GIL: um padrão com retrocesso
+catastrófico fica preso dentro de um único passo do finditer, antes de
+qualquer conferência de orçamento. No modo legado das regras (curingas
+ilimitados) cada padrão é buscado em um processo à parte; se a busca passar
+do tempo, o processo é morto e outro é criado para o padrão seguinte.
+"""
+
+import re
+import threading
+import multiprocessing
+
+
+def _servir(conexao):
+    """Laço do processo filho: recebe o texto uma vez e devolve os spans dos matches de cada padrão"""
+    texto = ''
+    conexao.send('pronto')
+    while True:
+        try:
+            mensagem = conexao.recv()
+        except EOFError:
+            return
+
+        if mensagem[0] == 'texto':
+            texto = mensagem[1]
+            continue
+
+        _, padrao, flags, inicio, fim = mensagem
+        spans = []
+        for match in re.compile(padrao, flags).finditer(texto, inicio):
+            if fim is not None and match.start() >= fim:
+                break
+            spans.append(match.regs)
+        conexao.send(spans)
+
+
+class MatchIsolado:
+    """O que a montagem dos problemas usa de re.Match, a partir dos spans vindos do processo filho"""
+
+    __slots__ = ('re', 'string', 'regs')
+
+    def __init__(self, padrao, texto, regs):
+        self.re = padrao
+        self.string = texto
+        self.regs = regs
+
+    def start(self, grupo=0):
+        return self.regs[self._indice(grupo)][0]
+
+    def end(self, grupo=0):
+        return self.regs[self._indice(grupo)][1]
+
+    def span(self, grupo=0):
+        return self.regs[self._indice(grupo)]
+
+    def group(self, *grupos):
+        if len(grupos) > 1:
+            return tuple(self[grupo] for grupo in grupos)
+        return self[grupos[0] if grupos else 0]
+
+    def groups(self, padrao=None):
+        return tuple(padrao if self.regs[i][0] < 0 else self[i] for i in range(1, len(self.regs)))
+
+    def _indice(self, grupo):
+        return self.re.groupindex[grupo] if isinstance(grupo, str) else grupo
+
+    def __getitem__(self, grupo):
+        inicio, fim = self.regs[self._indice(grupo)]
+        return None if inicio < 0 else self.string[inicio:fim]
+
+
+class ProcessoBusca:
+    """Processo filho reaproveitado entre buscas (uma por vez) e recriado depois de cada estouro de tempo"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._processo = None
+        self._conexao = None
+        self._texto = None
+
+    def _iniciar(self):
+        contexto = multiprocessing.get_context('spawn')
+        self._conexao, conexao_filho = contexto.Pipe()
+        self._processo = contexto.Process(target=_servir, args=(conexao_filho,), daemon=True,
+                                          name='burocrata-regex')
+        self._processo.start()
+        conexao_filho.close()
+        self._texto = None
+        # A importação no filho não conta no tempo do primeiro padrão
+        self._conexao.recv()
+
+    def _encerrar(self):
+        self._processo.kill()
+        self._processo.join()
+        self._conexao.close()
+        self._processo = None
+
+    def buscar(self, padrao, texto, inicio=0, fim=None, tempo_maximo=None):
+        """Matches do padrão compilado que começam em [inicio, fim); None se passar de `tempo_maximo` segundos"""
+        with self._lock:
+            if self._processo is None or not self._processo.is_alive():
+                self._iniciar()
+            if self._texto is not texto:
+                self._conexao.send(('texto', texto))
+                self._texto = texto
+
+            self._conexao.send(('padrao', padrao.pattern, padrao.flags, inicio, fim))
+            try:
+                if not self._conexao.poll(tempo_maximo):
+                    self._encerrar()
+                    return None
+                spans = self._conexao.recv()
+            except (EOFError, OSError):
+                # O filho morreu no meio da busca (falta de memória, por exemplo)
+                self._encerrar()
+                return None
+
+        return [MatchIsolado(padrao, texto, regs) for regs in spans]
+
+    def fechar(self):
+        with self._lock:
+            if self._processo is not None:
+                self._encerrar()
@@ -0,0 +1,114 @@
+"""Cache persistente de resultados de análise"""
+
+import json
+import time
+import sqlite3
+import logging
+import threading
+from contextlib import contextmanager
+
+logger = logging.getLogger(__name__)
+
+# --------------------------------------------------
+# CACHE PERSISTENTE DE RESULTADOS
+# --------------------------------------------------
+
+class CacheResultados:
+    """Cache de análises em SQLite, endereçado pelo SHA-256 do PDF + versão das regras"""
+    
+    def __init__(self, caminho='burocrata_cache.sqlite3', max_entradas=500, max_bytes=64 * 1024 * 1024):
+        self.caminho = caminho
+        self.max_entradas = max_entradas
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._conexao = sqlite3.connect(caminho, timeout=5, check_same_thread=False)
+        
+        with self._conectar() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS resultados (
+                    chave TEXT PRIMARY KEY,
+                    resultado BLOB NOT NULL,
+                    tamanho INTEGER NOT NULL,
+                    criado_em REAL NOT NULL,
+                    ultimo_acesso REAL NOT NULL
+                )
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_resultados_acesso ON resultados (ultimo_acesso)")
+    
+    @contextmanager
+    def _conectar(self):
+        """Conexão única protegida por lock: segura para as threads de sessão do Streamlit"""
+        with self._lock:
+            with self._conexao:
+                yield self._conexao
+    
+    def _ler(self, chave):
+        """Valor armazenado já decodificado (ou None), marcando o acesso para o LRU"""
+        try:
+            with self._conectar() as conn:
+                linha = conn.execute("SELECT resultado FROM resultados WHERE chave = ?", (chave,)).fetchone()
+                if linha is None:
+                    return None
+                conn.execute("UPDATE resultados SET ultimo_acesso = ? WHERE chave = ?", (time.time(), chave))
+        except sqlite3.Error as e:
+            logger.warning("Falha ao ler cache de resultados: %s", e)
+            return None
+        
+        return json.loads(linha[0])
+    
+    def obter(self, chave):
+        """Retorna o resultado armazenado (ou None) e marca o acesso para o LRU"""
+        resultado = self._ler(chave)
+        if resultado is None:
+            return None
+        
+        problemas, tipo_doc, verificacoes, metricas = resultado
+        return problemas, tipo_doc, verificacoes, metricas
+    
+    def salvar(self, chave, resultado):
+        """Armazena um resultado e aplica a política de evicção (LRU por quantidade e tamanho)"""
+        dados = json.dumps(resultado, ensure_ascii=False).encode('utf-8')
+        agora = time.time()
+        
+        try:
+            with self._conectar() as conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO resultados (chave, resultado, tamanho, criado_em, ultimo_acesso) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    (chave, dados, len(dados), agora, agora)
+                )
+                self._evictar(conn)
+        except sqlite3.Error as e:
+            logger.warning("Falha ao gravar cache de resultados: %s", e)
+    
+    def _evictar(self, conn):
+        """Remove as entradas menos usadas recentemente além dos limites"""
+        conn.execute("""
+            DELETE FROM resultados WHERE chave IN (
+                SELECT chave FROM (
+                    SELECT chave,
+                           ROW_NUMBER() OVER (ORDER BY ultimo_acesso DESC) AS ordem,
+                           SUM(tamanho) OVER (ORDER BY ultimo_acesso DESC) AS acumulado
+                    FROM resultados
+                )
+                WHERE ordem > ? OR acumulado > ?
+            )
+        """, (self.max_entradas, self.max_bytes))
+    
+    def limpar(self):
+        """Remove todas as entradas"""
+        with self._conectar() as conn:
+            conn.execute("DELETE FROM resultados")
+
+
+class CacheOCR(CacheResultados):
+    """Texto reconhecido por OCR, endereçado pelo SHA-256 da imagem da página + idioma"""
+    
+    def __init__(self, caminho='burocrata_ocr.sqlite3', max_entradas=20000, max_bytes=64 * 1024 * 1024):
+        super().__init__(caminho, max_entradas, max_bytes)
+    
+    def obter(self, chave):
+        """Retorna o texto armazenado (ou None)"""
+        return self._ler(chave)
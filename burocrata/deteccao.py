@@ -0,0 +1,1734 @@
+"""Motor de detecção: regras compiladas, similaridade e análise incremental"""
+
+import re
+import unicodedata
+import hashlib
+import json
+import time
+import logging
+import threading
+from bisect import bisect_right
+from collections import Counter
+from collections.abc import Mapping
+from types import MappingProxyType
+from difflib import SequenceMatcher
+
+import numpy as np
+
+from burocrata.busca_isolada import ProcessoBusca
+from burocrata.pacotes import TIPOS_VALOR, UNIDADES, CatalogoRegras
+
+logger = logging.getLogger(__name__)
+
+# --------------------------------------------------
+# NORMALIZAÇÃO DE TEXTO
+# --------------------------------------------------
+
+# Caracteres de controle, invisíveis e separadores removidos do texto extraído, além
+# de substitutos UTF-16 avulsos (mapas ToUnicode quebrados), que não se codificam em UTF-8
+CARACTERES_REMOVIDOS = [
+    *range(0x00, 0x09), 0x0b, 0x0c, *range(0x0e, 0x20),
+    *range(0x7f, 0xa0), *range(0x200b, 0x2010), *range(0x2028, 0x2030), *range(0xd800, 0xe000)
+]
+
+
+class TabelaNormalizacao(dict):
+    """Tabela para str.translate que resolve cada caractere uma única vez
+    
+    O destino de um caractere é sua forma minúscula decomposta (NFKD) sem as
+    marcas combinantes, o mesmo que lower() + normalize('NFKD') + filtro de
+    combining() aplicados ao texto inteiro (a única diferença é o sigma final
+    grego, que lower() decide pelo contexto). Caracteres ainda não vistos são
+    calculados sob demanda e memorizados; a faixa latina já vem pronta.
+    """
+    
+    def __init__(self):
+        super().__init__((codigo, None) for codigo in CARACTERES_REMOVIDOS)
+        # Propriedades por código do plano básico (-1 = ainda não calculada)
+        self._tamanhos = np.full(0x10000, -1, dtype=np.int16)
+        self._espacos = np.full(0x10000, -1, dtype=np.int16)
+        for codigo in range(0x250):
+            self[codigo]
+    
+    def __missing__(self, codigo):
+        decomposto = unicodedata.normalize('NFKD', chr(codigo).lower())
+        destino = ''.join(c for c in decomposto if not unicodedata.combining(c))
+        self[codigo] = destino
+        return destino
+    
+    def tamanhos(self, codigos):
+        """Tamanho do destino de cada código do vetor (0 para removidos)"""
+        return self._consultar(codigos, self._tamanhos, lambda codigo: len(self[codigo] or ''))
+    
+    def espacos(self, codigos):
+        """Máscara dos códigos que str.split() trata como espaço"""
+        return self._consultar(codigos, self._espacos, lambda codigo: chr(codigo).isspace()).astype(bool)
+    
+    def _consultar(self, codigos, memoria, calcular):
+        """Propriedade por código, memorizada em vetor para o plano básico (BMP)"""
+        # Só os códigos presentes e ainda desconhecidos passam pelo Python
+        bmp = np.minimum(codigos, 0xFFFF)
+        presentes = np.flatnonzero(np.bincount(bmp, minlength=0x10000))
+        for codigo in presentes[memoria[presentes] < 0].tolist():
+            memoria[codigo] = calcular(codigo)
+        resultado = memoria[bmp].astype(np.int64)
+        
+        astrais = np.flatnonzero(codigos > 0xFFFF)
+        if astrais.size:
+            valores = {codigo: calcular(codigo) for codigo in np.unique(codigos[astrais]).tolist()}
+            resultado[astrais] = [valores[codigo] for codigo in codigos[astrais].tolist()]
+        return resultado
+
+
+TABELA_NORMALIZACAO = TabelaNormalizacao()
+
+
+def normalizar_texto(texto):
+    """Forma normalizada de um texto: tabela de tradução + colapso de espaços"""
+    return ' '.join(texto.translate(TABELA_NORMALIZACAO).split())
+
+
+def codigos_unicode(texto):
+    """Vetor com o código de cada caractere do texto"""
+    return np.frombuffer(texto.encode('utf-32-le', 'surrogatepass'), dtype=np.uint32)
+
+
+class TextoNormalizado:
+    """Texto normalizado do documento com mapa compacto para o texto original
+    
+    `texto` é exatamente o resultado da limpeza profunda (tabela de tradução +
+    colapso de espaços) das páginas unidas por quebra de linha. Como quase todo
+    caractere normalizado corresponde a um único caractere original, o mapa
+    guarda apenas os pontos em que o deslocamento muda (remoções, expansões e
+    espaços colapsados), em vetores NumPy; posição original, página e linha de
+    qualquer posição do texto normalizado saem por busca binária, sem varrer o
+    documento de novo.
+    """
+    
+    __slots__ = ('texto', 'original', '_quebras', '_deslocamentos', '_inicios_paginas', '_quebras_linha')
+    
+    def __init__(self, paginas):
+        if isinstance(paginas, str):
+            paginas = [paginas]
+        
+        self.original = '\n'.join(paginas)
+        inicios_paginas = np.zeros(len(paginas) or 1, dtype=np.int64)
+        if len(paginas) > 1:
+            inicios_paginas[1:] = np.cumsum([len(pagina) + 1 for pagina in paginas[:-1]])
+        self._inicios_paginas = inicios_paginas
+        
+        codigos = codigos_unicode(self.original)
+        self._quebras_linha = np.flatnonzero(codigos == 0x0a)
+        
+        # Origem de cada caractere após a tradução (expansões repetem a origem)
+        intermediario = self.original.translate(TABELA_NORMALIZACAO)
+        origem = np.repeat(np.arange(len(codigos), dtype=np.int64), TABELA_NORMALIZACAO.tamanhos(codigos))
+        
+        # Colapso de espaços: fica o primeiro de cada sequência, exceto nas pontas
+        espacos = TABELA_NORMALIZACAO.espacos(codigos_unicode(intermediario))
+        manter = ~espacos
+        manter[1:] |= ~espacos[:-1]
+        indices = np.flatnonzero(manter)
+        if indices.size and espacos[indices[-1]]:
+            indices = indices[:-1]
+        
+        self.texto = ' '.join(intermediario.split())
+        origem = origem[indices]
+        
+        deslocamentos = origem - np.arange(len(origem), dtype=np.int64)
+        quebras = np.flatnonzero(np.diff(deslocamentos)) + 1
+        self._quebras = np.concatenate(([0], quebras))
+        self._deslocamentos = deslocamentos[self._quebras] if len(origem) else np.zeros(1, dtype=np.int64)
+    
+    def __len__(self):
+        return len(self.texto)
+    
+    @property
+    def total_paginas(self):
+        return len(self._inicios_paginas)
+    
+    def posicao_original(self, posicao):
+        """Posição no texto original do caractere `posicao` do texto normalizado"""
+        trecho = np.searchsorted(self._quebras, posicao, side='right') - 1
+        return int(posicao + self._deslocamentos[trecho])
+    
+    def descartar_textos(self):
+        """Libera `texto` e `original`; o mapa continua e localizar() segue valendo"""
+        self.texto = None
+        self.original = None
+    
+    def localizar(self, posicao):
+        """Página e linha (a partir de 1) e posição original de uma posição normalizada"""
+        original = self.posicao_original(posicao)
+        pagina = int(np.searchsorted(self._inicios_paginas, original, side='right')) - 1
+        linhas_antes = np.searchsorted(self._quebras_linha, original)
+        linhas_antes_pagina = np.searchsorted(self._quebras_linha, self._inicios_paginas[pagina])
+        return {
+            'pagina': pagina + 1,
+            'linha': int(linhas_antes - linhas_antes_pagina) + 1,
+            'posicao_original': original
+        }
+
+# --------------------------------------------------
+# ENTIDADES: VALORES MONETÁRIOS E DATAS
+# --------------------------------------------------
+
+# Números no formato brasileiro (1.234,56) e americano (1,234.56)
+_NUMERO_BR = r'(?:\d{1,3}(?:\.\d{3})+|\d+)(?:,\d{2})?'
+_NUMERO_US = r'(?:\d{1,3}(?:,\d{3})+|\d+)(?:\.\d{2})?'
+
+MESES = {
+    'janeiro': 1, 'fevereiro': 2, 'marco': 3, 'abril': 4, 'maio': 5, 'junho': 6,
+    'julho': 7, 'agosto': 8, 'setembro': 9, 'outubro': 10, 'novembro': 11, 'dezembro': 12
+}
+
+# Padrão combinado sobre o texto limpo: datas primeiro (mesma posição de início),
+# depois valores e quantidades (meses, horas). A antecipação inicial descarta de
+# imediato as posições que não podem começar uma entidade.
+PADRAO_ENTIDADES = re.compile(rf'''
+  (?=[\d€ursamv]) (?:
+    (?<!\d)(?P<dia>\d{{2}})[/\-.](?P<mes>\d{{2}})[/\-.](?P<ano>\d{{4}}|\d{{2}})(?!\d)
+  | (?<!\d)(?P<ano_iso>\d{{4}})[/\-.](?P<mes_iso>\d{{2}})[/\-.](?P<dia_iso>\d{{2}})(?!\d)
+  | (?<!\d)(?P<dia_extenso>\d{{1,2}})\s+de\s+(?P<mes_extenso>{'|'.join(MESES)})\s+de\s+(?P<ano_extenso>\d{{4}})
+  | us\$\s*(?P<dolar>{_NUMERO_US})
+  | (?:r\$|€)\s*(?P<real>{_NUMERO_BR})
+  | (?:salario|aluguel|multa|valor)\s*(?:de\s*)?[:\-]?\s*r?\$?\s*(?P<rotulado>{_NUMERO_BR})(?!\d|[.,]\d|\s*(?:mes|hora))
+  | (?<![\d.,])(?P<por_extenso>{_NUMERO_BR})\s*reais
+  | (?<![\d.,])(?P<quantidade>\d{{1,3}})\s*(?P<unidade>mes(?:es)?|horas?)(?:\s+(?P<periodo>diaria|semana)[a-z]*)?
+  )
+''', re.VERBOSE)
+
+# Palavras que dão o tipo de uma entidade; vale a mais próxima antes do número
+PALAVRAS_TIPO_VALOR = re.compile(r'(salario)|(aluguel)|(multa)|(caucao|garantia)|(honorario)')
+PALAVRAS_TIPO_DATA = re.compile(r'\b(?:(vigencia)|(assinatura|assinad[oa])|(inicio)|(termino|fim))\b')
+
+
+class EntidadesDocumento:
+    """Valores monetários e datas de um texto, em colunas NumPy
+    
+    Uma linha por entidade e sem duplicatas: a extração é uma única varredura
+    com o padrão combinado, então cada trecho do texto pertence a no máximo uma
+    entidade. Os trechos não são copiados; saem do texto pelas posições.
+    """
+    
+    TIPOS_VALOR = TIPOS_VALOR
+    UNIDADES = UNIDADES
+    TIPOS_DATA = ('data_genérica', 'vigência', 'assinatura', 'início', 'término')
+    
+    def __init__(self, texto, valores, datas):
+        self.texto = texto
+        
+        # valores: (valor, início, fim, tipo, unidade); datas: (dia, mês, ano, início, fim, tipo)
+        self.valores = np.array([valor[0] for valor in valores], dtype=np.float64)
+        self.posicoes_valores = np.array([valor[1] for valor in valores], dtype=np.int64)
+        self.fins_valores = np.array([valor[2] for valor in valores], dtype=np.int64)
+        self.tipos_valores = np.array([valor[3] for valor in valores], dtype=np.int8)
+        self.unidades_valores = np.array([valor[4] for valor in valores], dtype=np.int8)
+        
+        self.datas = np.array([data[:3] for data in datas], dtype=np.int32).reshape(-1, 3)
+        self.posicoes_datas = np.array([data[3] for data in datas], dtype=np.int64)
+        self.fins_datas = np.array([data[4] for data in datas], dtype=np.int64)
+        self.tipos_datas = np.array([data[5] for data in datas], dtype=np.int8)
+    
+    def mascara_valores(self, tipo=None, unidade=None):
+        """Máscara das linhas de valores com o tipo e a unidade dados (None = qualquer)"""
+        mascara = np.ones(len(self.valores), dtype=bool)
+        if tipo is not None:
+            mascara &= self.tipos_valores == self.TIPOS_VALOR.index(tipo)
+        if unidade is not None:
+            mascara &= self.unidades_valores == self.UNIDADES.index(unidade)
+        return mascara
+    
+    def texto_valor(self, indice):
+        return self.texto[self.posicoes_valores[indice]:self.fins_valores[indice]]
+    
+    def lista_valores(self, mascara=None):
+        """Valores no formato de dicionário (opcionalmente só as linhas da máscara)"""
+        indices = range(len(self.valores)) if mascara is None else np.flatnonzero(mascara).tolist()
+        return [
+            {
+                'valor': float(self.valores[i]),
+                'texto': self.texto_valor(i),
+                'posicao': int(self.posicoes_valores[i]),
+                'tipo': self.TIPOS_VALOR[self.tipos_valores[i]],
+                'unidade': self.UNIDADES[self.unidades_valores[i]]
+            }
+            for i in indices
+        ]
+    
+    def lista_datas(self, mascara=None):
+        """Datas no formato de dicionário (opcionalmente só as linhas da máscara)"""
+        indices = range(len(self.datas)) if mascara is None else np.flatnonzero(mascara).tolist()
+        return [
+            {
+                'data': '{:02d}/{:02d}/{}'.format(*self.datas[i].tolist()),
+                'texto': self.texto[self.posicoes_datas[i]:self.fins_datas[i]],
+                'posicao': int(self.posicoes_datas[i]),
+                'tipo': self.TIPOS_DATA[self.tipos_datas[i]]
+            }
+            for i in indices
+        ]
+
+# --------------------------------------------------
+# ÍNDICE DE SIMILARIDADE DE CLÁUSULAS
+# --------------------------------------------------
+
+class IndiceSimilaridade:
+    """Índice vetorial sobre os modelos de cláusulas (construído uma vez por tipo)
+    
+    Cada modelo vira um vetor de contagem de caracteres. Para qualquer par de
+    textos, 2 * interseção das contagens / soma dos tamanhos é um limite
+    superior exato de SequenceMatcher.ratio() (é o quick_ratio do difflib), então
+    só os pares cujo limite passa do limiar são conferidos pelo SequenceMatcher.
+    """
+    
+    LIMIAR = 0.75
+    TAMANHO_LOTE = 256
+    
+    def __init__(self, padroes_proibidos):
+        # Modelos e palavras-chave na mesma forma normalizada das sentenças
+        self.modelos = tuple(dict.fromkeys(
+            (problema_id, normalizar_texto(modelo))
+            for problema_id, config in padroes_proibidos.items()
+            for modelo in config.get('padroes_similares', [])
+        ))
+        self.palavras_chave = {
+            problema_id: tuple(dict.fromkeys(normalizar_texto(palavra) for palavra in config.get('palavras_chave', [])))
+            for problema_id, config in padroes_proibidos.items()
+        }
+        
+        # Índices dos modelos agrupados por problema, na ordem original
+        por_problema = {}
+        for i, (problema_id, _) in enumerate(self.modelos):
+            por_problema.setdefault(problema_id, []).append(i)
+        self.modelos_por_problema = {problema_id: tuple(indices) for problema_id, indices in por_problema.items()}
+        
+        # Alfabeto dos modelos; qualquer outro caractere cai na coluna "outros"
+        alfabeto = sorted(set(''.join(modelo for _, modelo in self.modelos)))
+        self.tamanho_alfabeto = len(alfabeto)
+        self.mapa_colunas = np.full(0x10000, self.tamanho_alfabeto, dtype=np.int64)
+        for coluna, caractere in enumerate(alfabeto):
+            if ord(caractere) < 0x10000:
+                self.mapa_colunas[ord(caractere)] = coluna
+        
+        self.contagens_modelos, self.tamanhos_modelos = self._vetorizar([modelo for _, modelo in self.modelos])
+        self.contagens_modelos.setflags(write=False)
+        self.tamanhos_modelos.setflags(write=False)
+    
+    def _vetorizar(self, textos):
+        """Matriz (textos x alfabeto) de contagens de caracteres e vetor de tamanhos"""
+        colunas = self.tamanho_alfabeto + 1
+        tamanhos = np.fromiter((len(t) for t in textos), dtype=np.int64, count=len(textos))
+        
+        codigos = codigos_unicode(''.join(textos))
+        codigos = np.minimum(codigos, 0xFFFF)
+        linhas = np.repeat(np.arange(len(textos), dtype=np.int64), tamanhos)
+        
+        contagens = np.bincount(
+            linhas * colunas + self.mapa_colunas[codigos],
+            minlength=len(textos) * colunas
+        ).reshape(len(textos), colunas)
+        
+        return contagens[:, :self.tamanho_alfabeto], tamanhos
+    
+    def candidatos(self, sentencas):
+        """Para cada sentença, o conjunto de modelos que podem superar o limiar"""
+        if not self.modelos or not sentencas:
+            return [frozenset() for _ in sentencas]
+        
+        resultado = []
+        for inicio in range(0, len(sentencas), self.TAMANHO_LOTE):
+            lote = sentencas[inicio:inicio + self.TAMANHO_LOTE]
+            contagens, tamanhos = self._vetorizar(lote)
+            
+            intersecao = np.minimum(contagens[:, None, :], self.contagens_modelos[None, :, :]).sum(axis=2)
+            limite = 2.0 * intersecao / (tamanhos[:, None] + self.tamanhos_modelos[None, :])
+            
+            for linha in limite > self.LIMIAR:
+                resultado.append(frozenset(np.flatnonzero(linha).tolist()))
+        
+        return resultado
+
+# --------------------------------------------------
+# CLASSIFICADOR DE TIPO DE DOCUMENTO
+# --------------------------------------------------
+
+class ClassificadorTipos:
+    """Classificador vetorial do tipo de documento (construído uma vez)
+    
+    Cada marcador e cada termo vira uma sequência de posições, cada posição com
+    as palavras aceitas. O texto é tokenizado uma única vez e as contagens das
+    palavras do vocabulário formam um vetor esparso; um produto matricial dá a
+    contagem de cada posição, o mínimo entre as posições de uma expressão é o
+    limite superior do número de matches dela, e um segundo produto aplica os
+    pesos (3 por marcador, 1 por termo) de todos os tipos de uma vez.
+    """
+    
+    PESO_MARCADOR = 3
+    PESO_TERMO = 1
+    TAMANHO_MINIMO_PALAVRA = 3
+    PALAVRA = re.compile(r'[a-z0-9]+')
+    
+    def __init__(self, marcadores_por_tipo, termos_por_tipo):
+        self.tipos = tuple(marcadores_por_tipo)
+        self.vocabulario = {}
+        posicoes = []      # palavras aceitas em cada posição, de todas as expressões
+        inicios = []       # primeira posição de cada expressão
+        pesos = []         # (tipo, peso) de cada expressão
+        
+        for coluna, tipo_doc in enumerate(self.tipos):
+            fontes = [(marcador, self.PESO_MARCADOR) for marcador in marcadores_por_tipo[tipo_doc]]
+            fontes += [(termo, self.PESO_TERMO) for termo in termos_por_tipo.get(tipo_doc, ())]
+            
+            for expressao, peso in fontes:
+                posicoes_expressao = self._posicoes(expressao)
+                if not posicoes_expressao:
+                    continue
+                inicios.append(len(posicoes))
+                pesos.append((coluna, peso))
+                for alternativas in posicoes_expressao:
+                    posicoes.append([self.vocabulario.setdefault(palavra, len(self.vocabulario)) for palavra in alternativas])
+        
+        # Palavra -> posição (vocabulário x posições) e expressão -> tipo (expressões x tipos)
+        self.palavras_posicoes = np.zeros((len(self.vocabulario), len(posicoes)))
+        for indice, linhas in enumerate(posicoes):
+            self.palavras_posicoes[linhas, indice] = 1.0
+        
+        self.inicios_expressoes = np.asarray(inicios, dtype=np.intp)
+        self.pesos_expressoes = np.zeros((len(pesos), len(self.tipos)))
+        for indice, (coluna, peso) in enumerate(pesos):
+            self.pesos_expressoes[indice, coluna] = peso
+    
+    @classmethod
+    def _posicoes(cls, expressao):
+        """Palavras aceitas em cada posição: 'contrato.*(trabalho|emprego)' -> [(contrato,), (trabalho, emprego)]"""
+        posicoes = []
+        for trecho in re.split(r'\.[*+]|\.\{\d*,?\d*\}|\s+', expressao):
+            alternativas = tuple(dict.fromkeys(
+                palavra
+                for alternativa in trecho.split('|')
+                for palavra in cls.PALAVRA.findall(alternativa)
+                if len(palavra) >= cls.TAMANHO_MINIMO_PALAVRA
+            ))
+            if alternativas:
+                posicoes.append(alternativas)
+        return posicoes
+    
+    def pontuar(self, texto):
+        """Pontuação de cada tipo para um texto já normalizado"""
+        contagens = Counter(self.PALAVRA.findall(texto))
+        
+        # Vetor esparso: só as palavras do texto que estão no vocabulário
+        linhas = []
+        valores = []
+        for palavra, quantidade in contagens.items():
+            linha = self.vocabulario.get(palavra)
+            if linha is not None:
+                linhas.append(linha)
+                valores.append(quantidade)
+        
+        if not linhas or not len(self.inicios_expressoes):
+            return dict.fromkeys(self.tipos, 0.0)
+        
+        contagens_posicoes = np.asarray(valores, dtype=np.float64) @ self.palavras_posicoes[linhas]
+        contagens_expressoes = np.minimum.reduceat(contagens_posicoes, self.inicios_expressoes)
+        pontuacoes = contagens_expressoes @ self.pesos_expressoes
+        return dict(zip(self.tipos, pontuacoes.tolist()))
+
+
+class RegrasPorTipo(Mapping):
+    """Regras de cada tipo de documento, compiladas no primeiro acesso
+    
+    Um documento só usa as regras do tipo identificado; os padrões e o
+    índice de similaridade dos demais tipos não são montados até serem pedidos.
+    """
+    
+    def __init__(self, pacotes, compilar, compiladas=None):
+        self._pacotes = pacotes
+        self._compilar = compilar
+        self._compiladas = dict(compiladas or {})
+        self._trava = threading.Lock()
+    
+    def __getitem__(self, tipo_doc):
+        regras_tipo = self._compiladas.get(tipo_doc)
+        if regras_tipo is not None:
+            return regras_tipo
+    
+        config = self._pacotes[tipo_doc]
+        with self._trava:
+            if tipo_doc not in self._compiladas:
+                self._compiladas[tipo_doc] = self._compilar(tipo_doc, config)
+            return self._compiladas[tipo_doc]
+    
+    def __contains__(self, tipo_doc):
+        return tipo_doc in self._pacotes
+    
+    def __iter__(self):
+        return iter(self._pacotes)
+    
+    def __len__(self):
+        return len(self._pacotes)
+    
+    @property
+    def compiladas(self):
+        """Somente os tipos já compilados (sem disparar compilação)"""
+        return MappingProxyType(self._compiladas)
+
+
+class ConjuntoRegras:
+    """Retrato imutável das regras em uso: pacotes, regras por tipo, classificador e versão
+    
+    A recarga monta um conjunto novo e o troca de uma só vez no detector; cada
+    análise captura o conjunto no início e o usa até o fim, de modo que uma
+    recarga feita por outra sessão no meio de um documento não mistura regras
+    de versões diferentes.
+    """
+    
+    __slots__ = ('padroes', 'regras', 'termos_tipo', 'classificador', 'versao')
+    
+    def __init__(self, padroes, regras, termos_tipo, classificador, versao):
+        for nome, valor in zip(self.__slots__, (padroes, regras, termos_tipo, classificador, versao)):
+            object.__setattr__(self, nome, valor)
+    
+    def __setattr__(self, nome, valor):
+        raise AttributeError("ConjuntoRegras é imutável")
+
+# --------------------------------------------------
+# SISTEMA DE DETECÇÃO SUPER AVANÇADO
+# --------------------------------------------------
+
+class SistemaDetecçãoAvancado:
+    """Sistema de detecção com eficiência máxima"""
+    
+    # Modos de avaliação das regras
+    MODO_LIMITADO = 'limitado'  # curingas .* / .+ limitados a uma lacuna máxima
+    MODO_LEGADO = 'legado'      # padrões exatamente como escritos
+    
+    # Formato e semântica dos problemas (2: página e linha; 3: regras normalizadas
+    # como o texto; 4: classificador vetorial; 5: valores e datas em varredura única;
+    # 6: regras numéricas sobre quantidades de meses e horas; 7: detecções sobrepostas
+    # da mesma regra fundidas)
+    VERSAO_RESULTADO = 7
+    
+    CONFIANCA_REGRA = 0.95  # confiança de um match de regex (similaridade usa a razão medida)
+    
+    # Comparações aceitas nas regras numéricas dos pacotes
+    COMPARACOES = MappingProxyType({
+        '<': np.less,
+        '<=': np.less_equal,
+        '>': np.greater,
+        '>=': np.greater_equal
+    })
+    
+    def __init__(self, modo_regras=MODO_LIMITADO, lacuna_maxima=120, tempo_maximo_regra=0.5, cache_deteccoes=None,
+                 kb_classificacao=None, diretorio_regras=None, intervalo_recarga=2.0):
+        if modo_regras not in (self.MODO_LIMITADO, self.MODO_LEGADO):
+            raise ValueError(f"Modo de regras inválido: {modo_regras}")
+        
+        self.modo_regras = modo_regras
+        self.lacuna_maxima = lacuna_maxima
+        self.tempo_maximo_regra = tempo_maximo_regra
+        # Modo legado: padrões buscados em um processo filho, encerrado no tempo limite
+        self._busca_isolada = ProcessoBusca() if modo_regras == self.MODO_LEGADO else None
+        self.kb_classificacao = kb_classificacao  # classifica só pelos primeiros N KB (None = texto inteiro)
+        self.intervalo_recarga = intervalo_recarga  # segundos entre verificações dos pacotes (None = sem recarga)
+        self.catalogo = CatalogoRegras(diretorio_regras)
+        self.conjunto = None
+        self._trava_recarga = threading.Lock()
+        self._ultima_verificacao = time.monotonic()
+        self._aplicar_pacotes(self.catalogo.pacotes)
+        self.cache_deteccoes = cache_deteccoes
+        self.contador_analises = 0
+    
+    def _aplicar_pacotes(self, alterados):
+        """Monta um ConjuntoRegras a partir do catálogo e o publica, mantendo compilados os tipos inalterados
+        
+        Os marcadores e termos de todos os tipos entram no classificador (só
+        normalizados); padrões e índice de similaridade de cada tipo são
+        compilados no primeiro documento daquele tipo.
+        """
+        padroes = self.catalogo.pacotes
+        
+        compiladas = {}
+        if self.conjunto is not None:
+            compiladas = {
+                tipo_doc: regras_tipo for tipo_doc, regras_tipo in self.conjunto.regras.compiladas.items()
+                if tipo_doc in padroes and tipo_doc not in alterados
+            }
+        
+        termos_tipo = {
+            tipo_doc: tuple(dict.fromkeys(normalizar_texto(termo) for termo in config.get('termos', ())))
+            for tipo_doc, config in padroes.items()
+        }
+        classificador = ClassificadorTipos(
+            {
+                tipo_doc: self._normalizar_regras(tipo_doc, 'marcadores', config['marcadores'], [])
+                for tipo_doc, config in padroes.items()
+            },
+            termos_tipo
+        )
+        
+        # Uma única atribuição: quem já capturou o conjunto anterior continua com ele
+        self.conjunto = ConjuntoRegras(
+            padroes,
+            RegrasPorTipo(padroes, self._compilar_tipo, compiladas),
+            termos_tipo,
+            classificador,
+            self._calcular_versao_regras()
+        )
+    
+    @property
+    def padroes(self):
+        return self.conjunto.padroes
+    
+    @property
+    def regras(self):
+        return self.conjunto.regras
+    
+    @property
+    def termos_tipo(self):
+        return self.conjunto.termos_tipo
+    
+    @property
+    def classificador(self):
+        return self.conjunto.classificador
+    
+    @property
+    def versao_regras(self):
+        return self.conjunto.versao
+    
+    def recarregar_regras(self, forcar=False):
+        """Relê os pacotes de regras alterados em disco (no máximo a cada `intervalo_recarga` s)
+        
+        Retorna True quando algum tipo mudou; a versão das regras muda junto e
+        os resultados em cache das regras antigas deixam de ser usados. Só uma
+        thread recarrega por vez; as demais seguem com o conjunto atual.
+        """
+        if not forcar:
+            if self.intervalo_recarga is None:
+                return False
+            if time.monotonic() - self._ultima_verificacao < self.intervalo_recarga:
+                return False
+        
+        if not self._trava_recarga.acquire(blocking=forcar):
+            return False
+        try:
+            self._ultima_verificacao = time.monotonic()
+            alterados = self.catalogo.recarregar()
+            if not alterados:
+                return False
+            
+            self._aplicar_pacotes(alterados)
+        finally:
+            self._trava_recarga.release()
+        
+        logger.info("Pacotes de regras recarregados: %s (versão %s)", ', '.join(sorted(alterados)), self.versao_regras)
+        return True
+    
+    @property
+    def alertas_regras(self):
+        """Alertas do linter dos tipos já compilados"""
+        return tuple(alerta for regras_tipo in self.regras.compiladas.values() for alerta in regras_tipo['alertas'])
+    
+    @property
+    def regras_descartadas(self):
+        """Padrões descartados na normalização dos tipos já compilados"""
+        return tuple(
+            descartada for regras_tipo in self.regras.compiladas.values() for descartada in regras_tipo['descartadas']
+        )
+    
+    def _calcular_versao_regras(self):
+        """Hash dos pacotes de regras, do modo de avaliação e do formato do resultado (invalida o cache quando mudam)"""
+        conteudo = json.dumps(
+            [self.catalogo.versao, self.modo_regras, self.lacuna_maxima, self.kb_classificacao, self.VERSAO_RESULTADO],
+            ensure_ascii=False,
+            sort_keys=True
+        )
+        return hashlib.sha256(conteudo.encode('utf-8')).hexdigest()[:16]
+    
+    def chave_documento(self, dados_pdf, conjunto=None, extracao=None):
+        """Chave de cache: SHA-256 do arquivo + versão das regras (+ hash das opções de extração, se dadas)"""
+        versao = (conjunto or self.conjunto).versao
+        chave = f"{hashlib.sha256(dados_pdf).hexdigest()}:{versao}"
+        if extracao is not None:
+            conteudo = json.dumps(extracao, ensure_ascii=False, sort_keys=True)
+            chave += f":{hashlib.sha256(conteudo.encode('utf-8')).hexdigest()[:16]}"
+        return chave
+    
+    def analisar_pdf(self, dados_pdf, extrair_paginas, ao_progredir=None, extracao=None):
+        """Analisa os bytes de um PDF página a página, reaproveitando o cache quando possível
+        
+        `extrair_paginas(dados_pdf)` deve gerar o texto de cada página em ordem;
+        `ao_progredir(numero_pagina, novos_problemas)` recebe os resultados parciais.
+        `extracao` descreve as opções que mudam o texto extraído (ver
+        extracao.configuracao_extracao) e entra na chave do cache. Resultados com
+        regras interrompidas pelo tempo limite não são guardados: dependem da
+        carga da máquina e sairiam incompletos em todas as consultas seguintes.
+        """
+        self.recarregar_regras()
+        conjunto = self.conjunto
+        chave = self.chave_documento(dados_pdf, conjunto, extracao)
+        
+        if self.cache_deteccoes is not None:
+            resultado = self.cache_deteccoes.obter(chave)
+            if resultado is not None:
+                return resultado
+        
+        analise = AnaliseIncremental(self, conjunto=conjunto)
+        for texto_pagina in extrair_paginas(dados_pdf):
+            novos_problemas = analise.adicionar_pagina(texto_pagina)
+            if ao_progredir is not None:
+                ao_progredir(analise.paginas_processadas, novos_problemas)
+        
+        if not analise.possui_texto:
+            return None
+        
+        resultado = analise.finalizar()
+        
+        if self.cache_deteccoes is not None and not resultado[3]['regras_interrompidas']:
+            self.cache_deteccoes.salvar(chave, resultado)
+        
+        return resultado
+    
+    def _preparar_padrao(self, padrao):
+        """Aplica o modo de avaliação configurado a um padrão antes da compilação"""
+        if self.modo_regras == self.MODO_LIMITADO:
+            return self._limitar_lacunas(padrao, self.lacuna_maxima)
+        return padrao
+    
+    @staticmethod
+    def _limitar_lacunas(padrao, lacuna_maxima):
+        """Troca curingas ilimitados (.* e .+) por lacunas limitadas (.{0,N} e .{1,N})"""
+        resultado = []
+        em_classe = False
+        i = 0
+        
+        while i < len(padrao):
+            c = padrao[i]
+            
+            if c == '\\':
+                resultado.append(padrao[i:i + 2])
+                i += 2
+                continue
+            
+            if em_classe:
+                em_classe = c != ']'
+            elif c == '[':
+                em_classe = True
+            elif c == '.' and padrao[i + 1:i + 2] in ('*', '+'):
+                minimo = 0 if padrao[i + 1] == '*' else 1
+                resultado.append(f'.{{{minimo},{lacuna_maxima}}}')
+                i += 2
+                continue
+            
+            resultado.append(c)
+            i += 1
+        
+        return ''.join(resultado)
+    
+    @staticmethod
+    def _diagnosticar_padrao(padrao):
+        """Lista construções com risco de backtracking catastrófico em um padrão"""
+        alertas = []
+        
+        curingas = len(re.findall(r'(?<!\\)\.[*+]', padrao))
+        if curingas >= 3:
+            alertas.append(f'{curingas} curingas ilimitados encadeados')
+        
+        if re.search(r'(?<!\\)\.[*+]\??\(\?<?[!=]', padrao):
+            alertas.append('lookaround após curinga ilimitado')
+        
+        if re.search(r'\([^()]*[*+][^()]*\)[*+{]', padrao):
+            alertas.append('quantificador aninhado')
+        
+        if padrao.startswith(('.*', '.+')):
+            alertas.append('início sem âncora literal')
+        
+        return alertas
+    
+    def _auditar_padroes(self, padroes):
+        """Linter de inicialização: aponta marcadores e padrões patológicos"""
+        alertas = []
+        
+        for tipo_doc, config in padroes.items():
+            regras = [('marcadores', marcador) for marcador in config['marcadores']]
+            regras += [
+                (problema_id, padrao)
+                for problema_id, problema_config in config['problemas'].items()
+                for padrao in problema_config['padroes']
+            ]
+            
+            for regra, padrao in regras:
+                diagnostico = self._diagnosticar_padrao(padrao)
+                if diagnostico:
+                    alertas.append({
+                        'tipo_documento': tipo_doc,
+                        'regra': regra,
+                        'padrao': padrao,
+                        'alertas': tuple(diagnostico)
+                    })
+        
+        return tuple(alertas)
+    
+    @staticmethod
+    def _normalizar_padrao(padrao):
+        """Passa os literais de um padrão pela mesma normalização do texto analisado
+        
+        Sequências de escape e o cabeçalho de grupos nomeados ficam intactos;
+        letras acentuadas e maiúsculas viram a forma que aparece no texto limpo.
+        """
+        resultado = []
+        i = 0
+        
+        while i < len(padrao):
+            c = padrao[i]
+            
+            if c == '\\':
+                resultado.append(padrao[i:i + 2])
+                i += 2
+                continue
+            
+            if padrao.startswith('(?P', i):
+                resultado.append('(?P')
+                i += 3
+                continue
+            
+            resultado.append(c.translate(TABELA_NORMALIZACAO))
+            i += 1
+        
+        return ''.join(resultado)
+    
+    @staticmethod
+    def _nunca_casa(padrao):
+        """Indica se o padrão exige algo que o texto limpo nunca contém
+        
+        O texto limpo não tem quebras de linha, tabulações nem espaços seguidos;
+        só literais fora de classes de caracteres são considerados.
+        """
+        em_classe = False
+        i = 0
+        
+        while i < len(padrao):
+            c = padrao[i]
+            
+            if c == '\\':
+                if not em_classe and padrao[i + 1:i + 2] in ('n', 't', 'r', 'f', 'v'):
+                    return True
+                i += 2
+                continue
+            
+            if em_classe:
+                em_classe = c != ']'
+            elif c == '[':
+                em_classe = True
+            elif c in '\n\t\r\f\v':
+                return True
+            elif padrao.startswith('  ', i) and padrao[i + 2:i + 3] not in ('*', '?', '{'):
+                return True
+            
+            i += 1
+        
+        return False
+    
+    def _normalizar_regras(self, tipo_doc, regra, padroes, descartadas):
+        """Normaliza uma lista de padrões, sem duplicatas e sem os que nunca casam"""
+        normalizados = {}
+        
+        for padrao in padroes:
+            normalizado = self._normalizar_padrao(padrao)
+            
+            if self._nunca_casa(normalizado):
+                motivo = 'nunca casa com o texto normalizado'
+            elif normalizado in normalizados:
+                motivo = f'duplicata de {normalizados[normalizado]!r} após a normalização'
+            else:
+                normalizados[normalizado] = padrao
+                continue
+            
+            descartadas.append({'tipo_documento': tipo_doc, 'regra': regra, 'padrao': padrao, 'motivo': motivo})
+        
+        return tuple(normalizados)
+    
+    def _compilar_tipo(self, tipo_doc, config):
+        """Compila marcadores, padrões e regras numéricas de um tipo em um conjunto imutável
+        
+        Os padrões são compilados na forma normalizada (a mesma do texto limpo);
+        duplicatas e padrões que nunca casam ficam em 'descartadas' e os alertas
+        do linter de padrões em 'alertas'.
+        """
+        alertas = self._auditar_padroes({tipo_doc: config})
+        descartadas = []
+        marcadores = self._normalizar_regras(tipo_doc, 'marcadores', config['marcadores'], descartadas)
+        padroes_problemas = {
+            problema_id: self._normalizar_regras(tipo_doc, problema_id, problema_config['padroes'], descartadas)
+            for problema_id, problema_config in config['problemas'].items()
+        }
+        
+        # Sem IGNORECASE: texto limpo e literais dos padrões já estão em minúsculas, e
+        # assim o re usa a busca rápida pelo prefixo literal de cada padrão para
+        # saltar direto às posições candidatas
+        problemas = {
+            problema_id: tuple(re.compile(self._preparar_padrao(padrao)) for padrao in padroes_problema)
+            for problema_id, padroes_problema in padroes_problemas.items()
+        }
+        
+        # Regras numéricas: a comparação do pacote ('<', '>', ...) vira a ufunc do NumPy
+        regras_numericas = tuple(
+            MappingProxyType({**regra, 'comparacao': self.COMPARACOES[regra['comparacao']]})
+            for regra in config.get('regras_numericas', ())
+        )
+        
+        # No modo limitado os curingas já estão contidos; só o modo legado corre risco real
+        nivel_log = logging.WARNING if self.modo_regras == self.MODO_LEGADO else logging.INFO
+        for alerta in alertas:
+            logger.log(
+                nivel_log,
+                "Padrão potencialmente patológico em %s/%s: %r (%s)",
+                alerta['tipo_documento'], alerta['regra'], alerta['padrao'], '; '.join(alerta['alertas'])
+            )
+        for descartada in descartadas:
+            logger.info(
+                "Regra descartada em %s/%s: %r (%s)",
+                descartada['tipo_documento'], descartada['regra'], descartada['padrao'], descartada['motivo']
+            )
+        
+        return MappingProxyType({
+            'marcadores': marcadores,
+            'problemas': MappingProxyType(problemas),
+            'indice_similaridade': IndiceSimilaridade(config['problemas']),
+            'regras_numericas': regras_numericas,
+            'alertas': alertas,
+            'descartadas': tuple(descartadas)
+        })
+    
+    def _limpar_texto_profundo(self, texto):
+        """Limpeza ultra profunda em passada única (tabela de tradução + colapso de espaços)"""
+        if not texto:
+            return ""
+        
+        # Controles e glifos inválidos removidos, minúsculas e acentos retirados;
+        # espaços múltiplos, quebras de linha e tabulações viram um único espaço
+        return normalizar_texto(texto)
+    
+    JANELA_CONTEXTO = 40  # caracteres antes de uma entidade usados para identificar o tipo
+    
+    def _extrair_entidades(self, texto, inicio=0, fim=None):
+        """Extrai valores monetários e datas em uma única varredura, tipados e sem duplicatas
+        
+        Com `inicio`/`fim`, só as entidades que começam em [inicio, fim); as
+        posições continuam relativas a `texto`.
+        """
+        valores = []
+        datas = []
+        
+        for match in PADRAO_ENTIDADES.finditer(texto, inicio):
+            if fim is not None and match.start() >= fim:
+                break
+            grupo = match.lastgroup
+            
+            if grupo in ('ano', 'dia_iso', 'ano_extenso'):
+                if grupo == 'ano':
+                    # DD/MM/YYYY ou DD/MM/YY
+                    dia, mes, ano = int(match['dia']), int(match['mes']), int(match['ano'])
+                    if ano < 100:  # Se ano tem 2 dígitos
+                        ano += 2000 if ano < 50 else 1900
+                elif grupo == 'dia_iso':
+                    # YYYY-MM-DD
+                    dia, mes, ano = int(match['dia_iso']), int(match['mes_iso']), int(match['ano_iso'])
+                else:
+                    # DD de Mês de YYYY
+                    dia, mes, ano = int(match['dia_extenso']), MESES[match['mes_extenso']], int(match['ano_extenso'])
+                
+                contexto = self._contexto_anterior(texto, match.start(), match.start())
+                datas.append((dia, mes, ano, match.start(), match.end(), self._identificar_tipo_data(contexto)))
+            elif match['quantidade'] is not None:
+                # Quantidade de meses ou horas (6 meses, 10 horas diárias)
+                if match['unidade'].startswith('mes'):
+                    unidade = 'meses'
+                else:
+                    unidade = {None: 'horas', 'diaria': 'horas_diarias', 'semana': 'horas_semanais'}[match['periodo']]
+                
+                contexto = self._contexto_anterior(texto, match.start(), match.start())
+                valores.append((
+                    float(match['quantidade']), match.start(), match.end(),
+                    self._identificar_tipo_valor(contexto), EntidadesDocumento.UNIDADES.index(unidade)
+                ))
+            else:
+                numero = match[grupo]
+                if grupo == 'dolar':
+                    # Formato 1,234.56 (US)
+                    valor = float(numero.replace(',', ''))
+                else:
+                    # Formato 1.234,56
+                    valor = float(numero.replace('.', '').replace(',', '.'))
+                
+                contexto = self._contexto_anterior(texto, match.start(), match.start(grupo))
+                valores.append((valor, match.start(), match.end(), self._identificar_tipo_valor(contexto), 0))
+        
+        return EntidadesDocumento(texto, valores, datas)
+    
+    def _contexto_anterior(self, texto, inicio, fim):
+        """Janela antes de uma entidade (até o número), sem atravessar o fim da sentença anterior"""
+        janela = texto[max(0, inicio - self.JANELA_CONTEXTO):fim]
+        corte = max(janela.rfind('. '), janela.rfind('; '), janela.rfind('! '), janela.rfind('? '))
+        return janela[corte + 2:] if corte >= 0 else janela
+    
+    def _identificar_tipo_valor(self, contexto):
+        """Código do tipo de valor monetário (EntidadesDocumento.TIPOS_VALOR) pela palavra mais próxima"""
+        ultima = None
+        for ultima in PALAVRAS_TIPO_VALOR.finditer(contexto):
+            pass
+        return ultima.lastindex if ultima else 0
+    
+    def _identificar_tipo_data(self, contexto):
+        """Código do tipo de data (EntidadesDocumento.TIPOS_DATA) pela palavra mais próxima"""
+        ultima = None
+        for ultima in PALAVRAS_TIPO_DATA.finditer(contexto):
+            pass
+        return ultima.lastindex if ultima else 0
+    
+    # Maior sentença comparada inteira: texto sem pontuação (OCR, tabelas) é dividido
+    # em pedaços, o que também limita o que a análise incremental mantém em aberto
+    TAMANHO_MAXIMO_SENTENCA = 2000
+    
+    def _detectar_clausulas_similares_avancado(self, texto, padroes_proibidos, indice=None):
+        """Detecta cláusulas similares com algoritmo avançado"""
+        clausulas_detectadas = []
+        
+        if indice is None:
+            indice = IndiceSimilaridade(padroes_proibidos)
+        
+        # Dividir texto em sentenças, guardando onde cada uma começa; trechos sem
+        # pontuação maiores que TAMANHO_MAXIMO_SENTENCA viram pedaços desse tamanho
+        sentencas = []
+        posicoes = []
+        for trecho in re.finditer(r'[^.;!?]+', texto):
+            for inicio in range(trecho.start(), trecho.end(), self.TAMANHO_MAXIMO_SENTENCA):
+                pedaco = texto[inicio:min(trecho.end(), inicio + self.TAMANHO_MAXIMO_SENTENCA)]
+                sentenca = pedaco.strip()
+                if len(sentenca) >= 15:
+                    sentencas.append(sentenca)
+                    posicoes.append(inicio + len(pedaco) - len(pedaco.lstrip()))
+        sentencas_minusculas = [s.lower() for s in sentencas]
+        
+        # Pré-seleção vetorizada: só pares que podem passar de 75% vão ao SequenceMatcher
+        candidatos = indice.candidatos(sentencas_minusculas)
+        comparadores = {}
+        
+        for sentenca, posicao, sentenca_minuscula, modelos_candidatos in zip(sentencas, posicoes, sentencas_minusculas, candidatos):
+            for padrao_nome, config in padroes_proibidos.items():
+                # Verificar padrões similares
+                for i in indice.modelos_por_problema.get(padrao_nome, ()):
+                    if i not in modelos_candidatos:
+                        continue
+                    
+                    if i not in comparadores:
+                        comparadores[i] = SequenceMatcher(None, b=indice.modelos[i][1])
+                    comparador = comparadores[i]
+                    comparador.set_seq1(sentenca_minuscula)
+                    similaridade = comparador.ratio()
+                    
+                    if similaridade > 0.75:  # 75% de similaridade
+                        clausulas_detectadas.append({
+                            'id': padrao_nome,
+                            'regra': padrao_nome,
+                            'nome': config['nome'],
+                            'texto': sentenca,
+                            'similaridade': similaridade * 100,
+                            'gravidade': config['gravidade'],
+                            'posicao': posicao
+                        })
+                
+                # Verificar palavras-chave
+                for palavra in indice.palavras_chave.get(padrao_nome, ()):
+                    if palavra in sentenca_minuscula:
+                        clausulas_detectadas.append({
+                            'id': f"{padrao_nome}_palavra_chave",
+                            'regra': padrao_nome,
+                            'nome': f"{config['nome']} (PALAVRA-CHAVE)",
+                            'texto': sentenca,
+                            'similaridade': 90,
+                            'gravidade': config['gravidade'],
+                            'posicao': posicao
+                        })
+        
+        return clausulas_detectadas
+    
+    def _validar_cnpj_avancado(self, cnpj):
+        """Valida CNPJ com algoritmo oficial completo"""
+        cnpj = re.sub(r'[^\d]', '', cnpj)
+        
+        if len(cnpj) != 14:
+            return False
+        
+        if cnpj == cnpj[0] * 14:
+            return False
+        
+        # Primeiro dígito verificador
+        soma = 0
+        peso = 5
+        for i in range(12):
+            soma += int(cnpj[i]) * peso
+            peso -= 1
+            if peso == 1:
+                peso = 9
+        
+        resto = soma % 11
+        digito1 = 0 if resto < 2 else 11 - resto
+        
+        if digito1 != int(cnpj[12]):
+            return False
+        
+        # Segundo dígito verificador
+        soma = 0
+        peso = 6
+        for i in range(13):
+            soma += int(cnpj[i]) * peso
+            peso -= 1
+            if peso == 1:
+                peso = 9
+        
+        resto = soma % 11
+        digito2 = 0 if resto < 2 else 11 - resto
+        
+        return digito2 == int(cnpj[13])
+    
+    # "valor" seguido de um número com centavos a no máximo 60 caracteres: a lacuna
+    # limitada mantém a busca linear no texto limpo, que não tem quebras de linha
+    PADRAO_VALOR_NOTA = re.compile(r'valor.{0,60}?(\d+[.,]\d{2})')
+    
+    def _valores_nota_fiscal(self, texto, inicio=0, fim=None):
+        """(valor, posição) de cada valor da nota, varrendo a partir de `inicio` até a posição `fim`"""
+        valores_float = []
+        for match in self.PADRAO_VALOR_NOTA.finditer(texto, inicio):
+            if fim is not None and match.start(1) >= fim:
+                break
+            try:
+                v_clean = match.group(1).replace('.', '').replace(',', '.')
+                valores_float.append((float(v_clean), match.start(1)))
+            except ValueError:
+                continue
+        return valores_float
+    
+    def _validar_valores_nota_fiscal(self, valores_float):
+        """Valida consistência dos valores na nota fiscal ((valor, posição) de _valores_nota_fiscal)"""
+        problemas = []
+        
+        # Verificar consistência
+        if len(valores_float) >= 2:
+            # Verificar se valores são consistentes
+            max_valor, posicao_max = max(valores_float, key=lambda valor: valor[0])
+            min_valor, _ = min(valores_float, key=lambda valor: valor[0])
+            
+            if max_valor > min_valor * 1000:  # Diferença muito grande
+                problemas.append({
+                    'nome': 'Valores inconsistentes',
+                    'descricao': f'Diferença muito grande entre valores: R$ {min_valor:,.2f} e R$ {max_valor:,.2f}',
+                    'gravidade': 'ALTO',
+                    'posicao': posicao_max
+                })
+        
+        return problemas
+    
+    def analisar_documento_completo(self, texto):
+        """Análise completa e avançada do documento
+        
+        `texto` pode ser o texto extraído, a lista de textos das páginas ou um
+        TextoNormalizado já pronto; com as páginas, cada problema localizado
+        recebe também página e linha no documento original.
+        """
+        self.recarregar_regras()
+        self.contador_analises += 1
+        
+        # Limpeza profunda (uma única representação para todas as etapas)
+        documento = texto if isinstance(texto, TextoNormalizado) else TextoNormalizado(texto)
+        return self._analisar_documento(documento, self.conjunto)
+    
+    def _analisar_documento(self, documento, conjunto):
+        """Análise completa de um TextoNormalizado com um conjunto de regras já fixado"""
+        texto_limpo = documento.texto
+        
+        if not texto_limpo or len(texto_limpo) < 100:
+            return [], 'DESCONHECIDO', [], self._calcular_metricas([])
+        
+        # Identificar tipo de documento
+        tipo_doc = self._identificar_tipo_documento(texto_limpo, conjunto)
+        
+        if tipo_doc not in conjunto.padroes:
+            return [], tipo_doc, [], self._calcular_metricas([])
+        
+        config = conjunto.padroes[tipo_doc]
+        problemas_detectados = []
+        regras_interrompidas = []
+        
+        # Extrair valores e datas (uma única varredura)
+        entidades = self._extrair_entidades(texto_limpo)
+        
+        # Detecções específicas por tipo de documento
+        problemas_detectados.extend(self._detectar_por_valores(tipo_doc, entidades, conjunto=conjunto))
+        
+        if tipo_doc == 'NOTA_FISCAL':
+            problemas_detectados.extend(self._detectar_nota_fiscal(texto_limpo))
+        
+        # Verificar cada problema configurado (matches guardam só offsets até a fusão)
+        matches = list(self._iterar_matches_regras(tipo_doc, texto_limpo, regras_interrompidas, conjunto=conjunto))
+        
+        # Detecção por similaridade
+        clausulas_similares = self._detectar_clausulas_similares_avancado(
+            texto_limpo, 
+            config['problemas'],
+            conjunto.regras[tipo_doc]['indice_similaridade']
+        )
+        
+        # Fundir detecções sobrepostas da mesma regra; só as que restam viram problemas com contexto
+        intervalos = [(problema_id, match.start(), match.end(), self.CONFIANCA_REGRA) for problema_id, match in matches]
+        intervalos += [
+            (clausula['regra'], clausula['posicao'], clausula['posicao'] + len(clausula['texto']), clausula['similaridade'] / 100)
+            for clausula in clausulas_similares
+        ]
+        
+        for indice, quantidade in self._mesclar_deteccoes(intervalos):
+            if indice < len(matches):
+                problema_id, match = matches[indice]
+                problema = self._montar_problema_regra(tipo_doc, problema_id, match, texto_limpo, conjunto)
+            else:
+                problema = self._montar_problema_similaridade(tipo_doc, clausulas_similares[indice - len(matches)])
+            if quantidade > 1:
+                problema['deteccoes_fundidas'] = quantidade
+            problemas_detectados.append(problema)
+        
+        self._localizar_problemas(problemas_detectados, documento)
+        
+        # Calcular métricas
+        metricas = self._calcular_metricas(problemas_detectados)
+        metricas['regras_interrompidas'] = regras_interrompidas
+        
+        return problemas_detectados, tipo_doc, config['o_que_verificamos'], metricas
+    
+    @staticmethod
+    def _mesclar_deteccoes(intervalos):
+        """Funde detecções sobrepostas da mesma regra em O(n log n)
+        
+        `intervalos` traz (regra, início, fim, confiança) de cada detecção. Os
+        intervalos são ordenados por regra e início e varridos uma vez; cada grupo
+        de intervalos encadeados por sobreposição fica representado pela detecção
+        de maior confiança (a primeira, no empate). Retorna (índice do
+        representante, detecções no grupo), na ordem original dos representantes.
+        """
+        ordem = sorted(range(len(intervalos)), key=lambda i: (intervalos[i][0], intervalos[i][1]))
+        grupos = []
+        regra_grupo = None
+        fim_grupo = 0
+        
+        for i in ordem:
+            regra, inicio, fim, confianca = intervalos[i]
+            
+            if grupos and regra == regra_grupo and inicio < fim_grupo:
+                grupo = grupos[-1]
+                grupo[1] += 1
+                representante = intervalos[grupo[0]][3]
+                if confianca > representante or (confianca == representante and i < grupo[0]):
+                    grupo[0] = i
+                fim_grupo = max(fim_grupo, fim)
+            else:
+                grupos.append([i, 1])
+                regra_grupo, fim_grupo = regra, fim
+        
+        return sorted((indice, quantidade) for indice, quantidade in grupos)
+    
+    @staticmethod
+    def _localizar_problemas(problemas, documento, deslocamento=0):
+        """Acrescenta página, linha e posição original aos problemas com posição"""
+        for problema in problemas:
+            if 'posicao' in problema:
+                problema.update(documento.localizar(problema['posicao'] - deslocamento))
+    
+    def _detectar_por_valores(self, tipo_doc, entidades, mascara=None, conjunto=None):
+        """Regras numéricas avaliadas como máscaras sobre as colunas de entidades"""
+        problemas_detectados = []
+        
+        for regra in (conjunto or self.conjunto).regras[tipo_doc]['regras_numericas']:
+            selecao = entidades.mascara_valores(regra['tipo'], regra['unidade'])
+            selecao &= regra['comparacao'](entidades.valores, regra['limite'])
+            if mascara is not None:
+                selecao &= mascara
+            
+            for i in np.flatnonzero(selecao).tolist():
+                quantidade = float(entidades.valores[i])
+                if regra['unidade'] != 'moeda':
+                    quantidade = int(quantidade)
+                
+                problemas_detectados.append({
+                    'nome': regra['nome'],
+                    'descricao': regra['descricao'].format(quantidade=quantidade, limite=regra['limite']),
+                    'gravidade': regra['gravidade'],
+                    regra['campo']: quantidade,
+                    'texto': entidades.texto_valor(i),
+                    'posicao': int(entidades.posicoes_valores[i])
+                })
+        
+        return problemas_detectados
+    
+    def _detectar_nota_fiscal(self, texto_limpo):
+        """Checagens da nota fiscal sobre o texto limpo (CNPJs e consistência de valores)"""
+        problemas_detectados = self._cnpjs_invalidos(texto_limpo)
+        
+        # Validar valores
+        problemas_valores = self._validar_valores_nota_fiscal(self._valores_nota_fiscal(texto_limpo))
+        problemas_detectados.extend(problemas_valores)
+        
+        return problemas_detectados
+    
+    # CNPJ formatado (dígitos e pontuação passam intactos pela limpeza)
+    PADRAO_CNPJ = re.compile(r'\d{2}\.\d{3}\.\d{3}/\d{4}-\d{2}')
+    
+    def _cnpjs_invalidos(self, texto_limpo, inicio=0, fim=None):
+        """Problemas dos CNPJs com dígitos verificadores errados, varrendo a partir de `inicio` até a posição `fim`"""
+        problemas_detectados = []
+        
+        for match in self.PADRAO_CNPJ.finditer(texto_limpo, inicio):
+            if fim is not None and match.start() >= fim:
+                break
+            cnpj = match.group(0)
+            if not self._validar_cnpj_avancado(cnpj):
+                problemas_detectados.append({
+                    'nome': 'CNPJ inválido',
+                    'descricao': f'CNPJ {cnpj} possui dígitos verificadores incorretos',
+                    'gravidade': 'CRÍTICO',
+                    'cnpj': cnpj,
+                    'posicao': match.start()
+                })
+        
+        return problemas_detectados
+    
+    def _iterar_matches_regras(self, tipo_doc, texto_limpo, regras_interrompidas, inicio=0, fim=None, retomadas=None,
+                               conjunto=None):
+        """Gera (problema_id, match) para cada padrão configurado do tipo de documento
+        
+        Só matches que começam em [inicio, fim) são gerados; `retomadas` dá, por
+        padrão, a posição em que o último match aceito terminou, para que a
+        varredura de uma janela continue a sequência de matches da anterior.
+        
+        Padrões que passam de `tempo_maximo_regra` são interrompidos e listados
+        em `regras_interrompidas`. No modo limitado as lacunas são curtas e cada
+        passo do finditer também; o tempo é conferido entre um match e outro e
+        os matches anteriores ao corte são mantidos. No modo legado um único
+        passo pode retroceder por minutos, então a busca roda em um processo
+        filho, encerrado no tempo limite, e o padrão interrompido não gera match.
+        """
+        conjunto = conjunto or self.conjunto
+        regras_tipo = conjunto.regras[tipo_doc]
+        
+        for problema_id in conjunto.padroes[tipo_doc]['problemas']:
+            # Verificação por regex (padrões pré-compilados)
+            for padrao in regras_tipo['problemas'][problema_id]:
+                inicio_padrao = max(inicio, retomadas.get(padrao, 0)) if retomadas else inicio
+                
+                if self._busca_isolada is not None:
+                    matches = self._busca_isolada.buscar(padrao, texto_limpo, inicio_padrao, fim,
+                                                         self.tempo_maximo_regra)
+                    if matches is None:
+                        regras_interrompidas.append({'id': problema_id, 'padrao': padrao.pattern})
+                        continue
+                    for match in matches:
+                        yield problema_id, match
+                    continue
+                
+                # Orçamento de tempo por regra, conferido entre um match e outro
+                inicio_regra = time.perf_counter()
+                for match in padrao.finditer(texto_limpo, inicio_padrao):
+                    if fim is not None and match.start() >= fim:
+                        break
+                    if time.perf_counter() - inicio_regra > self.tempo_maximo_regra:
+                        regras_interrompidas.append({'id': problema_id, 'padrao': padrao.pattern})
+                        break
+                    
+                    yield problema_id, match
+    
+    def _montar_problema_regra(self, tipo_doc, problema_id, match, texto_limpo, conjunto=None):
+        """Monta o dicionário de problema para um match de regex"""
+        problema_config = (conjunto or self.conjunto).padroes[tipo_doc]['problemas'][problema_id]
+        
+        contexto_inicio = max(0, match.start() - 150)
+        contexto_fim = min(len(texto_limpo), match.end() + 150)
+        contexto = texto_limpo[contexto_inicio:contexto_fim]
+        
+        problema = {
+            'id': problema_id,
+            'nome': problema_config['nome'],
+            'descricao': problema_config['descricao'],
+            'gravidade': problema_config['gravidade'],
+            'lei': problema_config['lei'],
+            'solucao': problema_config['solucao'],
+            'penalidade': problema_config.get('penalidade', ''),
+            'contexto': contexto,
+            'confianca': self.CONFIANCA_REGRA,
+            'nivel_confianca': f'{self.CONFIANCA_REGRA:.0%} CONFIRMADO',
+            'tipo_documento': tipo_doc,
+            'texto_original': match.group(0),
+            'regra': problema_id,
+            'posicao': match.start(),
+            'fim': match.end()
+        }
+        
+        # Adicionar valor específico se aplicável
+        if 'salario' in problema_id and match.groups():
+            try:
+                valor_str = match.group(1).replace('.', '').replace(',', '.')
+                valor = float(valor_str)
+                if valor < 1412.00:
+                    problema['valor_especifico'] = f"R$ {valor:,.2f} (abaixo do mínimo R$ 1.412,00)"
+            except:
+                pass
+        
+        return problema
+    
+    def _montar_problema_similaridade(self, tipo_doc, clausula):
+        """Monta o dicionário de problema para uma cláusula similar"""
+        return {
+            'id': f"similar_{clausula['id']}",
+            'nome': f"⚠️ {clausula['nome']} (SIMILARIDADE {clausula['similaridade']:.1f}%)",
+            'descricao': f"Cláusula com conteúdo similar detectado com {clausula['similaridade']:.1f}% de correspondência",
+            'gravidade': clausula['gravidade'],
+            'lei': 'Análise contextual avançada',
+            'solucao': 'Revisar e reformular a cláusula',
+            'contexto': clausula['texto'],
+            'confianca': clausula['similaridade'] / 100,
+            'nivel_confianca': f"{clausula['similaridade']:.1f}% SIMILAR",
+            'tipo_documento': tipo_doc,
+            'texto_original': clausula['texto'],
+            'regra': clausula['regra'],
+            'posicao': clausula['posicao'],
+            'fim': clausula['posicao'] + len(clausula['texto'])
+        }
+    
+    def _identificar_tipo_documento(self, texto, conjunto=None):
+        """Identificação inteligente do tipo de documento"""
+        if self.kb_classificacao:
+            texto = texto[:self.kb_classificacao * 1024]
+        
+        # Marcadores e termos pontuados de uma vez (uma tokenização, um produto matricial)
+        scores = (conjunto or self.conjunto).classificador.pontuar(texto)
+        
+        # Verificar score mínimo
+        melhor_tipo = max(scores, key=scores.get, default='DESCONHECIDO')
+        
+        if scores[melhor_tipo] >= 5:
+            return melhor_tipo
+        
+        # Fallback inteligente (termos na forma do texto limpo)
+        if any(termo in texto for termo in ['nota fiscal', 'nfe', 'chave acesso']):
+            return 'NOTA_FISCAL'
+        elif 'contrato' in texto:
+            if any(termo in texto for termo in ['locacao', 'aluguel', 'inquilino']):
+                return 'CONTRATO_LOCACAO'
+            elif any(termo in texto for termo in ['trabalho', 'emprego', 'empregado']):
+                return 'CONTRATO_EMPREGO'
+            elif any(termo in texto for termo in ['prestacao', 'servicos', 'honorarios']):
+                return 'CONTRATO_PRESTACAO_SERVICOS'
+        
+        return 'DESCONHECIDO'
+    
+    def _calcular_metricas(self, problemas):
+        """Calcula métricas detalhadas"""
+        total = len(problemas)
+        criticos = sum(1 for p in problemas if p.get('gravidade') == 'CRÍTICO')
+        altos = sum(1 for p in problemas if p.get('gravidade') == 'ALTO')
+        medios = sum(1 for p in problemas if p.get('gravidade') == 'MÉDIO')
+        
+        # Cálculo de score
+        penalidade_criticos = criticos * 40
+        penalidade_altos = altos * 20
+        penalidade_medios = medios * 10
+        
+        score = max(0, 100 - penalidade_criticos - penalidade_altos - penalidade_medios)
+        
+        # Nível de risco
+        if criticos >= 3:
+            nivel_risco = '🚨 EMERGÊNCIA - DOCUMENTO PERIGOSO'
+            cor_risco = '#ff0000'
+        elif criticos >= 2:
+            nivel_risco = '🚨 ALTO RISCO - URGENTE'
+            cor_risco = '#ff4444'
+        elif criticos >= 1:
+            nivel_risco = '⚠️ RISCO CRÍTICO DETECTADO'
+            cor_risco = '#ff6666'
+        elif altos >= 2:
+            nivel_risco = '🔴 RISCO ELEVADO'
+            cor_risco = '#ff9933'
+        elif total >= 3:
+            nivel_risco = '🟡 ATENÇÃO NECESSÁRIA'
+            cor_risco = '#ffcc00'
+        elif total > 0:
+            nivel_risco = '📋 AJUSTES RECOMENDADOS'
+            cor_risco = '#33aa33'
+        else:
+            nivel_risco = '✅ DOCUMENTO REGULAR'
+            cor_risco = '#008800'
+        
+        return {
+            'total_problemas': total,
+            'problemas_criticos': criticos,
+            'problemas_altos': altos,
+            'problemas_medios': medios,
+            'score_conformidade': score,
+            'nivel_risco': nivel_risco,
+            'cor_risco': cor_risco,
+            'eficiencia_deteccao': 'EFICIÊNCIA MÁXIMA'
+        }
+
+# --------------------------------------------------
+# ANÁLISE INCREMENTAL (PÁGINA A PÁGINA)
+# --------------------------------------------------
+
+class AnaliseIncremental:
+    """Análise em fluxo: cada página é avaliada assim que extraída
+    
+    O texto limpo das páginas entra em um buffer. Regras e valores são avaliados
+    apenas para matches que começam no trecho novo, e os últimos `sobreposicao`
+    caracteres ficam reservados para a próxima página, de modo que cláusulas que
+    atravessam a quebra de página sejam vistas inteiras. A similaridade compara
+    somente sentenças completas (ou pedaços completos das longas demais). O tipo
+    do documento é decidido nas primeiras páginas; se continuar desconhecido, a
+    decisão fica para `finalizar()`.
+    
+    Da página fica só o mapa de posições do TextoNormalizado; o texto dela vive
+    no buffer até sair da janela. Enquanto o tipo não é decidido, o buffer
+    guarda todo o texto lido. No modo legado os curingas ilimitados alcançam
+    além de qualquer sobreposição: as páginas são guardadas e `finalizar()`
+    faz a análise completa, para o resultado ser o mesmo de
+    analisar_documento_completo.
+    """
+    
+    CONTEXTO = 150  # caracteres de contexto mantidos antes de cada match
+    
+    def __init__(self, detector, sobreposicao=1000, paginas_para_classificar=3, conjunto=None):
+        self.detector = detector
+        self.conjunto = conjunto or detector.conjunto  # as mesmas regras do início ao fim do documento
+        self.sobreposicao = sobreposicao
+        self.paginas_para_classificar = paginas_para_classificar
+        self.tipo_doc = None
+        self.paginas_processadas = 0
+        self.tamanho_texto = 0
+        self._tamanho_original = 0
+        # Por página com texto: início no texto limpo global, início no original, número e mapa
+        self._inicios_paginas = []
+        self._paginas = []
+        self._buffer = ''
+        self._inicio_buffer = 0      # posição global do primeiro caractere do buffer
+        self._fronteira = 0          # matches que começam antes daqui já foram avaliados
+        self._inicio_sentencas = 0   # início da primeira sentença ainda não comparada
+        self._especificos = []
+        self._regras = []
+        self._similares = []
+        self._regras_interrompidas = []
+        self._retomadas = {}         # padrão -> posição global do fim do último match
+        self._ordem_padroes = None
+        self._ordem_numericas = None
+        self._cnpjs = []
+        self._valores_nota = []
+        self._paginas_legado = [] if detector.modo_regras == detector.MODO_LEGADO else None
+    
+    @property
+    def possui_texto(self):
+        return self.tamanho_texto > 0
+    
+    def adicionar_pagina(self, texto_pagina):
+        """Acrescenta o texto de uma página e retorna os problemas novos encontrados"""
+        self.paginas_processadas += 1
+        texto_pagina = texto_pagina or ''
+        
+        if self._paginas_legado is not None:
+            self._paginas_legado.append(texto_pagina)
+            self.tamanho_texto += len(normalizar_texto(texto_pagina))
+            return []
+        
+        documento = TextoNormalizado(texto_pagina)
+        texto_limpo = documento.texto
+        if texto_limpo:
+            if self.tamanho_texto:
+                self._buffer += ' '
+                self.tamanho_texto += 1
+            self._inicios_paginas.append(self.tamanho_texto)
+            self._paginas.append((self._tamanho_original, self.paginas_processadas, documento))
+            self._buffer += texto_limpo
+            self.tamanho_texto += len(texto_limpo)
+            documento.descartar_textos()
+        
+        # Mesmas posições originais de TextoNormalizado(paginas): páginas unidas por quebra de linha
+        self._tamanho_original += len(texto_pagina) + 1
+        
+        if self.tipo_doc is None:
+            if self.paginas_processadas > self.paginas_para_classificar or self.tamanho_texto < 100:
+                return []
+            
+            tipo_doc = self.detector._identificar_tipo_documento(self._buffer, self.conjunto)
+            if tipo_doc == 'DESCONHECIDO':
+                return []
+            self.tipo_doc = tipo_doc
+        
+        return self._processar(final=False)
+    
+    def _processar(self, final):
+        """Avalia o trecho do buffer entre a fronteira atual e o novo limite"""
+        detector = self.detector
+        tipo_doc = self.tipo_doc
+        conjunto = self.conjunto
+        if tipo_doc not in conjunto.padroes:
+            return []
+        
+        config = conjunto.padroes[tipo_doc]
+        texto = self._buffer
+        base = self._inicio_buffer
+        
+        if self._ordem_padroes is None:
+            # Chaves para reproduzir a ordem da análise completa (regra, padrão, posição)
+            regras_tipo = conjunto.regras[tipo_doc]
+            self._ordem_padroes = {
+                padrao: (ordem, indice)
+                for ordem, problema_id in enumerate(config['problemas'])
+                for indice, padrao in enumerate(regras_tipo['problemas'][problema_id])
+            }
+            self._ordem_numericas = {}
+            for ordem, regra in enumerate(regras_tipo['regras_numericas']):
+                self._ordem_numericas.setdefault(regra['nome'], ordem)
+        
+        fim = base + len(texto)
+        limite = fim if final else max(self._fronteira, fim - self.sobreposicao)
+        inicio_local = self._fronteira - base
+        limite_local = limite - base
+        novos = []
+        
+        # Valores monetários que começam no trecho novo (a varredura começa um pouco
+        # antes, no contexto mantido, para retomar a sequência de matches anterior)
+        entidades = detector._extrair_entidades(texto, max(0, inicio_local - self.CONTEXTO), limite_local)
+        posicoes = entidades.posicoes_valores
+        especificos = detector._detectar_por_valores(
+            tipo_doc, entidades, (posicoes >= inicio_local) & (posicoes < limite_local), conjunto
+        )
+        for problema in especificos:
+            problema['posicao'] += base
+            self._especificos.append(((self._ordem_numericas[problema['nome']], problema['posicao']), problema))
+        novos.extend(especificos)
+        
+        # Nota fiscal: CNPJs e valores da janela; a consistência dos valores sai em finalizar()
+        if tipo_doc == 'NOTA_FISCAL':
+            inicio_varredura = max(0, inicio_local - self.CONTEXTO)
+            for problema in detector._cnpjs_invalidos(texto, inicio_varredura, limite_local):
+                if problema['posicao'] >= inicio_local:
+                    problema['posicao'] += base
+                    self._cnpjs.append(problema)
+            self._valores_nota.extend(
+                (valor, base + posicao)
+                for valor, posicao in detector._valores_nota_fiscal(texto, inicio_varredura, limite_local)
+                if posicao >= inicio_local
+            )
+        
+        # Regras de regex com a mesma restrição de posição; cada padrão retoma de onde
+        # terminou seu último match, como no finditer sobre o documento inteiro
+        retomadas = {padrao: posicao - base for padrao, posicao in self._retomadas.items()}
+        for problema_id, match in detector._iterar_matches_regras(
+            tipo_doc, texto, self._regras_interrompidas, inicio_local, limite_local, retomadas, conjunto
+        ):
+            problema = detector._montar_problema_regra(tipo_doc, problema_id, match, texto, conjunto)
+            problema['posicao'] += base
+            problema['fim'] += base
+            self._retomadas[match.re] = base + match.end()
+            self._regras.append(((*self._ordem_padroes[match.re], problema['posicao']), problema))
+            novos.append(problema)
+        
+        # Similaridade apenas sobre sentenças completas
+        inicio_sentencas = self._inicio_sentencas - base
+        if final:
+            fim_sentencas = len(texto)
+        else:
+            ultimo_delimitador = max(texto.rfind(c, inicio_sentencas, limite_local) for c in '.;!?')
+            fim_sentencas = ultimo_delimitador + 1 if ultimo_delimitador >= 0 else inicio_sentencas
+            # Sentença em aberto sem pontuação: os pedaços completos (os mesmos da análise
+            # completa) já podem ser comparados, e o buffer não cresce com o documento
+            tamanho_pedaco = detector.TAMANHO_MAXIMO_SENTENCA
+            fim_sentencas += (limite_local - fim_sentencas) // tamanho_pedaco * tamanho_pedaco
+        
+        if fim_sentencas > inicio_sentencas:
+            clausulas = detector._detectar_clausulas_similares_avancado(
+                texto[inicio_sentencas:fim_sentencas],
+                config['problemas'],
+                conjunto.regras[tipo_doc]['indice_similaridade']
+            )
+            for clausula in clausulas:
+                problema = detector._montar_problema_similaridade(tipo_doc, clausula)
+                problema['posicao'] += base + inicio_sentencas
+                problema['fim'] += base + inicio_sentencas
+                self._similares.append(problema)
+                novos.append(problema)
+            self._inicio_sentencas = base + fim_sentencas
+        
+        self._fronteira = limite
+        self._localizar(novos)
+        
+        # Descartar o que não será mais necessário (mantém contexto e a sentença em aberto)
+        corte = min(self._fronteira - self.CONTEXTO, self._inicio_sentencas) - base
+        if corte > 0:
+            self._buffer = texto[corte:]
+            self._inicio_buffer = base + corte
+        
+        return novos
+    
+    def _localizar(self, problemas):
+        """Página, linha e posição original a partir da posição global no texto limpo"""
+        for problema in problemas:
+            if 'posicao' not in problema:
+                continue
+            indice = max(0, bisect_right(self._inicios_paginas, problema['posicao']) - 1)
+            inicio_original, numero_pagina, documento = self._paginas[indice]
+            localizacao = documento.localizar(problema['posicao'] - self._inicios_paginas[indice])
+            problema.update(
+                pagina=numero_pagina,
+                linha=localizacao['linha'],
+                posicao_original=inicio_original + localizacao['posicao_original']
+            )
+    
+    def finalizar(self):
+        """Processa o restante do texto e retorna o resultado no formato de analisar_documento_completo"""
+        detector = self.detector
+        detector.contador_analises += 1
+        
+        if self._paginas_legado is not None:
+            return detector._analisar_documento(TextoNormalizado(self._paginas_legado), self.conjunto)
+        
+        if self.tipo_doc is None:
+            if self.tamanho_texto < 100:
+                return [], 'DESCONHECIDO', [], detector._calcular_metricas([])
+            # Nenhuma página foi processada ainda: o buffer contém o documento inteiro
+            self.tipo_doc = detector._identificar_tipo_documento(self._buffer, self.conjunto)
+        
+        if self.tipo_doc not in self.conjunto.padroes:
+            return [], self.tipo_doc, [], detector._calcular_metricas([])
+        
+        self._processar(final=True)
+        
+        especificos = [problema for _, problema in sorted(self._especificos, key=lambda item: item[0])]
+        if self.tipo_doc == 'NOTA_FISCAL':
+            nota_fiscal = self._cnpjs + detector._validar_valores_nota_fiscal(self._valores_nota)
+            self._localizar(nota_fiscal)
+            especificos.extend(nota_fiscal)
+        
+        # Mesma ordem da análise completa: regra, padrão e posição
+        regras = [problema for _, problema in sorted(self._regras, key=lambda item: item[0])]
+        
+        # Mesma fusão de detecções sobrepostas da análise completa
+        candidatos = regras + self._similares
+        fundidos = []
+        for indice, quantidade in detector._mesclar_deteccoes([
+            (problema['regra'], problema['posicao'], problema['fim'], problema['confianca']) for problema in candidatos
+        ]):
+            problema = candidatos[indice]
+            if quantidade > 1:
+                problema['deteccoes_fundidas'] = quantidade
+            fundidos.append(problema)
+        
+        problemas_detectados = especificos + fundidos
+        metricas = detector._calcular_metricas(problemas_detectados)
+        metricas['regras_interrompidas'] = self._regras_interrompidas
+        
+        return problemas_detectados, self.tipo_doc, self.conjunto.padroes[self.tipo_doc]['o_que_verificamos'], metricas
@@ -0,0 +1,378 @@
+"""Extração de texto de PDFs, sequencial ou paralela por intervalos de páginas"""
+
+import io
+import os
+import re
+import logging
+import tempfile
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+import pdfplumber
+from pdfminer.pdfdevice import PDFTextDevice
+from pdfminer.pdffont import PDFUnicodeNotDefined
+from pdfminer.pdfinterp import PDFPageInterpreter
+
+logger = logging.getLogger(__name__)
+
+# Abaixo disso o custo de distribuir o trabalho supera o ganho do paralelismo
+PAGINAS_MINIMAS_PARALELO = 16
+
+_executores = {}
+_lock_executores = threading.Lock()
+
+
+def workers_padrao():
+    """Quantidade de processos de extração (variável BUROCRATA_WORKERS_PDF ou número de CPUs)"""
+    try:
+        return max(1, int(os.environ.get('BUROCRATA_WORKERS_PDF', '')))
+    except ValueError:
+        return os.cpu_count() or 1
+
+
+def _obter_executor(max_workers):
+    """Pool de processos reaproveitado entre chamadas (um por quantidade de workers)"""
+    with _lock_executores:
+        executor = _executores.get(max_workers)
+        if executor is None:
+            # spawn: seguro mesmo quando o processo pai tem várias threads (Streamlit)
+            executor = ProcessPoolExecutor(
+                max_workers=max_workers,
+                mp_context=multiprocessing.get_context('spawn')
+            )
+            _executores[max_workers] = executor
+        return executor
+
+
+def _abrir(origem):
+    """Abre o PDF a partir de um caminho ou dos bytes do arquivo"""
+    if isinstance(origem, (bytes, bytearray)):
+        return pdfplumber.open(io.BytesIO(origem))
+    return pdfplumber.open(origem)
+
+
+# --------------------------------------------------
+# EXTRATORES DE TEXTO POR PÁGINA
+# --------------------------------------------------
+
+class _DispositivoTexto(PDFTextDevice):
+    """Dispositivo do pdfminer que só concatena o texto do fluxo de conteúdo
+
+    Não cria objetos de layout nem agrupa palavras e linhas: quebra a linha
+    quando a base do caractere muda e põe um espaço quando há um vão horizontal
+    maior que uma fração da altura da fonte. Conta as quebras que voltam para o
+    alto da página, sinal de que a ordem do fluxo não é a ordem de leitura.
+    """
+
+    FRACAO_ESPACO = 0.15  # vão (em alturas de fonte) que conta como espaço entre palavras
+
+    def __init__(self, rsrcmgr):
+        super().__init__(rsrcmgr)
+        self.partes = []
+        self.quebras = 0
+        self.subidas = 0
+        self._x = None
+        self._y = None
+
+    def render_char(self, matrix, font, fontsize, scaling, rise, cid, ncs, graphicstate):
+        try:
+            texto = font.to_unichr(cid)
+        except PDFUnicodeNotDefined:
+            texto = '\ufffd'
+
+        avanco = font.char_width(cid) * fontsize * scaling
+        a, _, _, d, x, y = matrix
+        altura = fontsize * (abs(d) or 1)
+
+        if self._y is not None:
+            if abs(y - self._y) > altura / 2:
+                self.partes.append('\n')
+                self.quebras += 1
+                if y > self._y:
+                    self.subidas += 1
+            elif x - self._x > altura * self.FRACAO_ESPACO and texto != ' ':
+                self.partes.append(' ')
+
+        self.partes.append(texto)
+        self._x = x + avanco * a
+        self._y = y
+        return avanco
+
+
+def extrair_fluxo_texto(pagina):
+    """Extrator rápido: texto do fluxo de conteúdo da página, sem análise de layout
+
+    Retorna None quando a ordem do fluxo parece não seguir a leitura (muitas
+    linhas voltando para o alto da página), para que a página use o fallback.
+    """
+    dispositivo = _DispositivoTexto(pagina.pdf.rsrcmgr)
+    PDFPageInterpreter(pagina.pdf.rsrcmgr, dispositivo).process_page(pagina.page_obj)
+
+    if dispositivo.subidas > max(2, dispositivo.quebras // 5):
+        return None
+    return ''.join(dispositivo.partes)
+
+
+def extrair_layout(pagina):
+    """Extrator completo: extract_text() do pdfplumber, com análise de layout"""
+    return pagina.extract_text() or ""
+
+
+# Nome -> função(página do pdfplumber) que retorna o texto, ou None para cair no fallback.
+# Extratores de fora deste módulo precisam ser registrados na importação de algum
+# módulo, já que a extração paralela roda em processos novos (spawn).
+EXTRATORES = {
+    'rapido': extrair_fluxo_texto,
+    'pdfplumber': extrair_layout,
+}
+
+EXTRATOR_FALLBACK = 'pdfplumber'
+
+# Caracteres que indicam texto sem mapeamento Unicode confiável (CID sem ToUnicode,
+# fontes com codificação própria): substituição, uso privado e controles
+_CARACTERES_SUSPEITOS = re.compile(r'[\ufffd\ue000-\uf8ff\x00-\x08\x0b-\x1f]|\(cid:\d+\)')
+
+
+def extrator_padrao():
+    """Extrator usado por padrão (variável BUROCRATA_EXTRATOR_PDF ou 'rapido')"""
+    nome = os.environ.get('BUROCRATA_EXTRATOR_PDF', 'rapido')
+    return nome if nome in EXTRATORES else 'rapido'
+
+
+def texto_ilegivel(texto):
+    """Heurística de qualidade: o texto extraído parece corrompido?
+
+    Considera corrompido o texto com mais de 5% de caracteres suspeitos, com
+    menos da metade de letras e dígitos ou, em trechos longos, sem espaços
+    suficientes entre as palavras (posicionamento sem caractere de espaço).
+    """
+    conteudo = ''.join(texto.split())
+    if not conteudo:
+        return False
+
+    if len(_CARACTERES_SUSPEITOS.findall(texto)) > len(conteudo) * 0.05:
+        return True
+
+    if sum(c.isalnum() for c in conteudo) < len(conteudo) * 0.5:
+        return True
+
+    return len(conteudo) > 200 and len(texto.split()) < len(conteudo) / 25
+
+
+def _texto_pagina(pagina, extrator='rapido'):
+    """Texto de uma página pelo extrator escolhido, com fallback para o pdfplumber
+
+    Só as páginas em que o extrator falha, desiste (None) ou produz texto
+    ilegível passam pela análise de layout. Em seguida libera os objetos e
+    caches que o pdfplumber guardou na página.
+    """
+    try:
+        if extrator != EXTRATOR_FALLBACK:
+            try:
+                texto = EXTRATORES[extrator](pagina)
+            except Exception:
+                texto = None
+            if texto is not None and not texto_ilegivel(texto):
+                return texto
+        return EXTRATORES[EXTRATOR_FALLBACK](pagina)
+    except Exception:
+        return ""
+    finally:
+        pagina.close()
+
+
+def _extrair_intervalo(origem, inicio, fim, extrator='rapido'):
+    """Extrai o texto das páginas [inicio, fim); cada worker abre o PDF por conta própria"""
+    with _abrir(origem) as pdf:
+        return [_texto_pagina(pagina, extrator) for pagina in pdf.pages[inicio:fim]]
+
+
+def contar_paginas(dados_pdf):
+    """Número de páginas do PDF"""
+    with _abrir(dados_pdf) as pdf:
+        return len(pdf.pages)
+
+
+def _dividir_intervalos(total_paginas, partes):
+    """Divide [0, total_paginas) em até `partes` intervalos contíguos"""
+    partes = max(1, min(partes, total_paginas))
+    tamanho, resto = divmod(total_paginas, partes)
+    intervalos = []
+    inicio = 0
+    for i in range(partes):
+        fim = inicio + tamanho + (1 if i < resto else 0)
+        intervalos.append((inicio, fim))
+        inicio = fim
+    return intervalos
+
+
+def _verificar_tamanho(dados_pdf, max_bytes):
+    if max_bytes is not None and len(dados_pdf) > max_bytes:
+        raise ValueError(f"PDF com {len(dados_pdf)} bytes excede o limite de {max_bytes} bytes")
+
+
+def iterar_texto_paginas(dados_pdf, max_workers=None, paginas_minimas_paralelo=PAGINAS_MINIMAS_PARALELO,
+                         max_paginas=None, max_bytes=None, extrator=None, ocr=None):
+    """Gera o texto de cada página, em ordem, à medida que fica pronto
+
+    PDFs pequenos (ou max_workers=1) são extraídos no próprio processo, página a
+    página; os demais têm as páginas divididas em intervalos entre processos,
+    que reabrem o arquivo a partir de uma cópia temporária em disco. Cada
+    intervalo é entregue assim que ele e os anteriores terminam.
+
+    Cada página é fechada logo depois de extraída, para que os caracteres e
+    objetos do layout não fiquem vivos até o fim do documento. `max_paginas`
+    limita as páginas extraídas (as demais são ignoradas) e `max_bytes` recusa
+    arquivos maiores com ValueError.
+
+    `extrator` é um nome de EXTRATORES (padrão: extrator_padrao()); fora do
+    próprio pdfplumber, páginas ilegíveis são refeitas com a análise de layout.
+
+    Com `ocr` (padrão: variável BUROCRATA_OCR) as páginas que continuam sem
+    texto passam pelo OCR local de burocrata.ocr, em paralelo com o restante.
+    """
+    _verificar_tamanho(dados_pdf, max_bytes)
+
+    if max_workers is None:
+        max_workers = workers_padrao()
+    if extrator is None:
+        extrator = extrator_padrao()
+    elif extrator not in EXTRATORES:
+        raise ValueError(f"Extrator de PDF desconhecido: {extrator}")
+
+    paginas = _iterar_camada_texto(dados_pdf, max_workers, paginas_minimas_paralelo, max_paginas, extrator)
+    if ocr is None or ocr:
+        from burocrata import ocr as modulo_ocr
+
+        if ocr is None:
+            ocr = modulo_ocr.ocr_padrao()
+        elif not modulo_ocr.ocr_disponivel():
+            logger.warning("OCR pedido, mas o Tesseract não foi encontrado; páginas sem texto ficam vazias")
+            ocr = False
+        if ocr:
+            paginas = modulo_ocr.completar_com_ocr(paginas, dados_pdf, max_workers=None if max_workers > 1 else 1)
+    yield from paginas
+
+
+def _iterar_camada_texto(dados_pdf, max_workers, paginas_minimas_paralelo, max_paginas, extrator):
+    """Texto da camada de texto de cada página, em ordem (ver iterar_texto_paginas)"""
+    total_paginas = contar_paginas(dados_pdf)
+    if max_paginas is not None:
+        total_paginas = min(total_paginas, max_paginas)
+
+    if max_workers <= 1 or total_paginas < paginas_minimas_paralelo:
+        with _abrir(dados_pdf) as pdf:
+            for pagina in pdf.pages[:total_paginas]:
+                yield _texto_pagina(pagina, extrator)
+        return
+
+    with tempfile.NamedTemporaryFile(suffix='.pdf', delete=False) as temporario:
+        temporario.write(dados_pdf)
+        caminho = temporario.name
+
+    futuros = []
+    try:
+        executor = _obter_executor(max_workers)
+        # Intervalos menores que o total por worker: equilibra a carga e antecipa a primeira entrega
+        intervalos = _dividir_intervalos(total_paginas, max_workers * 4)
+        futuros = [executor.submit(_extrair_intervalo, caminho, inicio, fim, extrator) for inicio, fim in intervalos]
+
+        for futuro in futuros:
+            yield from futuro.result()
+    finally:
+        for futuro in futuros:
+            futuro.cancel()
+        os.unlink(caminho)
+
+
+def configuracao_extracao(max_paginas=None, extrator=None, ocr=None):
+    """Opções efetivas de iterar_texto_paginas que mudam o texto extraído (entram na chave do cache de resultados)
+
+    Resolve os padrões como iterar_texto_paginas: extrator pela variável
+    BUROCRATA_EXTRATOR_PDF e OCR pela BUROCRATA_OCR, só se o Tesseract existir.
+    """
+    if extrator is None:
+        extrator = extrator_padrao()
+    elif extrator not in EXTRATORES:
+        raise ValueError(f"Extrator de PDF desconhecido: {extrator}")
+
+    from burocrata import ocr as modulo_ocr
+
+    ocr = modulo_ocr.ocr_padrao() if ocr is None else bool(ocr) and modulo_ocr.ocr_disponivel()
+    return {
+        'extrator': extrator,
+        'ocr': modulo_ocr.idioma_padrao() if ocr else None,
+        'max_paginas': max_paginas
+    }
+
+
+def extrair_texto_paginas(dados_pdf, max_workers=None, paginas_minimas_paralelo=PAGINAS_MINIMAS_PARALELO,
+                          max_paginas=None, max_bytes=None, extrator=None, ocr=None):
+    """Retorna a lista com o texto de cada página, em ordem"""
+    return list(iterar_texto_paginas(dados_pdf, max_workers, paginas_minimas_paralelo, max_paginas, max_bytes,
+                                     extrator, ocr))
+
+
+# --------------------------------------------------
+# PICO DE MEMÓRIA POR DOCUMENTO
+# --------------------------------------------------
+
+def memoria_residente():
+    """Memória residente do processo em bytes (None fora do Linux)"""
+    try:
+        with open('/proc/self/statm') as statm:
+            return int(statm.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+class MedidorPicoMemoria:
+    """Amostra a memória residente em uma thread enquanto o bloco executa
+
+        with MedidorPicoMemoria() as medidor:
+            ...
+        medidor.pico_mb, medidor.acrescimo_mb
+
+    `pico_mb` é o maior RSS observado no bloco e `acrescimo_mb` quanto ele
+    passou do RSS da entrada. Só mede o próprio processo (a extração paralela
+    roda em outros); sem /proc os valores ficam None.
+    """
+
+    def __init__(self, intervalo=0.02):
+        self.intervalo = intervalo
+        self.inicial = None
+        self.pico = None
+        self._parar = threading.Event()
+        self._thread = None
+
+    def _amostrar(self):
+        while not self._parar.wait(self.intervalo):
+            self._registrar()
+
+    def _registrar(self):
+        atual = memoria_residente()
+        if atual is not None and (self.pico is None or atual > self.pico):
+            self.pico = atual
+
+    def __enter__(self):
+        self.inicial = memoria_residente()
+        self.pico = self.inicial
+        if self.inicial is not None:
+            self._thread = threading.Thread(target=self._amostrar, name='medidor-memoria', daemon=True)
+            self._thread.start()
+        return self
+
+    def __exit__(self, *_):
+        if self._thread is not None:
+            self._parar.set()
+            self._thread.join()
+            self._registrar()
+
+    @property
+    def pico_mb(self):
+        return None if self.pico is None else round(self.pico / 2 ** 20, 1)
+
+    @property
+    def acrescimo_mb(self):
+        return None if self.pico is None else round((self.pico - self.inicial) / 2 ** 20, 1)
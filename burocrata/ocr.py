@@ -0,0 +1,205 @@
+"""OCR local (Tesseract via subprocess) para páginas sem camada de texto
+
+Nada sai da máquina: cada página é renderizada pelo PDFium (que já vem com o
+pdfplumber), passada ao executável `tesseract` por pipe e o texto reconhecido
+fica em cache pelo SHA-256 da imagem. Sem o Tesseract instalado o OCR
+simplesmente não acontece e as páginas continuam vazias.
+"""
+
+import io
+import os
+import shutil
+import hashlib
+import logging
+import tempfile
+import threading
+import subprocess
+import multiprocessing
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+logger = logging.getLogger(__name__)
+
+IDIOMA_PADRAO = 'por'
+RESOLUCAO_PADRAO = 300          # dpi da imagem entregue ao Tesseract
+TEMPO_MAXIMO_PAGINA = 120       # segundos por página antes de desistir
+CACHE_PADRAO = 'burocrata_ocr.sqlite3'
+
+_executores = {}
+_lock_executores = threading.Lock()
+_caches = {}
+
+
+def caminho_tesseract():
+    """Executável do Tesseract (variável BUROCRATA_TESSERACT ou o do PATH); None se ausente"""
+    return os.environ.get('BUROCRATA_TESSERACT') or shutil.which('tesseract')
+
+
+def ocr_disponivel():
+    return caminho_tesseract() is not None
+
+
+def ocr_padrao():
+    """OCR ligado pela variável BUROCRATA_OCR (1/sim) e com o Tesseract disponível"""
+    return os.environ.get('BUROCRATA_OCR', '').strip().lower() in ('1', 'sim', 'true') and ocr_disponivel()
+
+
+def idioma_padrao():
+    """Idiomas do Tesseract (variável BUROCRATA_OCR_IDIOMA, ex.: 'por+eng')"""
+    return os.environ.get('BUROCRATA_OCR_IDIOMA') or IDIOMA_PADRAO
+
+
+def workers_padrao():
+    """Processos de OCR (variável BUROCRATA_WORKERS_OCR ou número de CPUs)"""
+    try:
+        return max(1, int(os.environ.get('BUROCRATA_WORKERS_OCR', '')))
+    except ValueError:
+        return os.cpu_count() or 1
+
+
+def _obter_executor(max_workers):
+    """Pool de processos de OCR reaproveitado entre chamadas (um por quantidade de workers)"""
+    with _lock_executores:
+        executor = _executores.get(max_workers)
+        if executor is None:
+            executor = ProcessPoolExecutor(
+                max_workers=max_workers,
+                mp_context=multiprocessing.get_context('spawn')
+            )
+            _executores[max_workers] = executor
+        return executor
+
+
+def _obter_cache(caminho_cache):
+    """Uma conexão de cache por processo e arquivo (os workers compartilham o SQLite em WAL)"""
+    if caminho_cache is None:
+        return None
+    cache = _caches.get(caminho_cache)
+    if cache is None:
+        from burocrata.cache import CacheOCR
+        cache = _caches[caminho_cache] = CacheOCR(caminho_cache)
+    return cache
+
+
+# --------------------------------------------------
+# RENDERIZAÇÃO E RECONHECIMENTO
+# --------------------------------------------------
+
+def renderizar_pagina(origem, indice, resolucao=RESOLUCAO_PADRAO):
+    """PNG em tons de cinza da página `indice` do PDF (caminho ou bytes)"""
+    import pypdfium2 as pdfium
+
+    documento = pdfium.PdfDocument(origem)
+    try:
+        pagina = documento[indice]
+        try:
+            imagem = pagina.render(scale=resolucao / 72, grayscale=True).to_pil()
+        finally:
+            pagina.close()
+    finally:
+        documento.close()
+
+    saida = io.BytesIO()
+    imagem.save(saida, format='PNG')
+    return saida.getvalue()
+
+
+def reconhecer_imagem(imagem, idioma=IDIOMA_PADRAO, tempo_maximo=TEMPO_MAXIMO_PAGINA):
+    """Texto da imagem pelo Tesseract, com entrada e saída por pipe (sem arquivos temporários)"""
+    executavel = caminho_tesseract()
+    if executavel is None:
+        raise RuntimeError("Tesseract não encontrado (instale-o ou defina BUROCRATA_TESSERACT)")
+
+    # Uma thread por processo do Tesseract: o paralelismo vem do pool de páginas
+    ambiente = dict(os.environ, OMP_THREAD_LIMIT='1')
+    processo = subprocess.run(
+        [executavel, 'stdin', 'stdout', '-l', idioma],
+        input=imagem, capture_output=True, timeout=tempo_maximo, env=ambiente
+    )
+    if processo.returncode != 0:
+        erro = processo.stderr.decode('utf-8', errors='replace').strip()
+        raise RuntimeError(f"Tesseract falhou (código {processo.returncode}): {erro[-500:]}")
+    return processo.stdout.decode('utf-8', errors='replace')
+
+
+def ocr_pagina(origem, indice, idioma=IDIOMA_PADRAO, resolucao=RESOLUCAO_PADRAO, caminho_cache=CACHE_PADRAO):
+    """Texto reconhecido da página, consultando antes o cache pela imagem renderizada
+
+    A chave é o SHA-256 do PNG mais o idioma: a mesma página digitalizada em
+    outro arquivo (ou reenviada) não passa pelo Tesseract de novo.
+    """
+    imagem = renderizar_pagina(origem, indice, resolucao)
+    chave = f"{hashlib.sha256(imagem).hexdigest()}:{idioma}"
+
+    cache = _obter_cache(caminho_cache)
+    texto = cache.obter(chave) if cache is not None else None
+    if texto is None:
+        texto = reconhecer_imagem(imagem, idioma)
+        if cache is not None:
+            cache.salvar(chave, texto)
+    return texto
+
+
+def _ocr_pagina_seguro(origem, indice, idioma, resolucao, caminho_cache):
+    """ocr_pagina para os workers: uma página que falha fica vazia em vez de derrubar o documento"""
+    try:
+        return ocr_pagina(origem, indice, idioma, resolucao, caminho_cache)
+    except Exception as e:
+        logger.warning("OCR da página %d falhou: %s", indice + 1, e)
+        return ""
+
+
+# --------------------------------------------------
+# PÁGINAS SEM TEXTO NO FLUXO DA EXTRAÇÃO
+# --------------------------------------------------
+
+def completar_com_ocr(paginas, dados_pdf, max_workers=None, idioma=None, resolucao=RESOLUCAO_PADRAO,
+                      caminho_cache=CACHE_PADRAO):
+    """Gera os textos de `paginas`, trocando cada página vazia pelo OCR dela, em ordem
+
+    Só as páginas sem texto vão para o OCR, distribuídas entre processos que
+    reabrem o PDF de uma cópia temporária (escrita na primeira página vazia);
+    a extração das demais continua enquanto o OCR roda. Com max_workers=1 o
+    OCR roda no próprio processo, como dentro de um worker da auditoria.
+    """
+    if max_workers is None:
+        max_workers = workers_padrao()
+    if idioma is None:
+        idioma = idioma_padrao()
+
+    if max_workers <= 1:
+        for indice, texto in enumerate(paginas):
+            if not texto.strip():
+                texto = _ocr_pagina_seguro(dados_pdf, indice, idioma, resolucao, caminho_cache)
+            yield texto
+        return
+
+    pendentes = deque()  # texto pronto ou futuro do OCR, na ordem das páginas
+    caminho = None
+    try:
+        for indice, texto in enumerate(paginas):
+            if texto.strip():
+                pendentes.append(texto)
+            else:
+                if caminho is None:
+                    with tempfile.NamedTemporaryFile(suffix='.pdf', delete=False) as temporario:
+                        temporario.write(dados_pdf)
+                        caminho = temporario.name
+                futuro = _obter_executor(max_workers).submit(
+                    _ocr_pagina_seguro, caminho, indice, idioma, resolucao, caminho_cache
+                )
+                pendentes.append(futuro)
+
+            while pendentes and (isinstance(pendentes[0], str) or pendentes[0].done()):
+                pronto = pendentes.popleft()
+                yield pronto if isinstance(pronto, str) else pronto.result()
+
+        while pendentes:
+            pronto = pendentes.popleft()
+            yield pronto if isinstance(pronto, str) else pronto.result()
+    finally:
+        for pronto in pendentes:
+            if not isinstance(pronto, str):
+                pronto.cancel()
+        if caminho is not None:
+            os.unlink(caminho)
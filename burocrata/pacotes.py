@@ -0,0 +1,164 @@
+"""Pacotes de regras versionados: um arquivo JSON por tipo de documento"""
+
+import hashlib
+import json
+import logging
+import re
+import threading
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+DIRETORIO_PADRAO = Path(__file__).resolve().parent / 'regras'
+
+CAMPOS_PACOTE = ('tipo_documento', 'versao', 'nome', 'marcadores', 'o_que_verificamos', 'problemas')
+CAMPOS_PROBLEMA = ('nome', 'descricao', 'gravidade', 'lei', 'solucao', 'padroes')
+CAMPOS_REGRA_NUMERICA = ('nome', 'gravidade', 'tipo', 'unidade', 'comparacao', 'limite', 'campo', 'descricao')
+COMPARACOES = ('<', '<=', '>', '>=')
+
+# Colunas de tipo e unidade das entidades extraídas (EntidadesDocumento); None = qualquer
+TIPOS_VALOR = ('valor_genérico', 'salario', 'aluguel', 'multa', 'caução', 'honorário')
+UNIDADES = ('moeda', 'meses', 'horas', 'horas_diarias', 'horas_semanais')
+
+# O classificador de tipos lê cada marcador como sequência de palavras: só aceita
+# palavras, lacunas (.*, .+, .{m,n}) ou espaços entre elas e grupos de
+# alternativas como (trabalho|emprego). Classes ([çc]), opcionais (s?) e escapes
+# (\d) virariam fragmentos que nunca coincidem com uma palavra do texto.
+_PALAVRA_MARCADOR = r'[^\s.^$*+?{}\[\]\\|()]+'
+_TERMO_MARCADOR = rf'(?:{_PALAVRA_MARCADOR}|\({_PALAVRA_MARCADOR}(?:\|{_PALAVRA_MARCADOR})*\))'
+_LACUNA_MARCADOR = r'(?:\.[*+]|\.\{\d*,?\d*\}|\s+)'
+MARCADOR_VALIDO = re.compile(
+    rf'{_LACUNA_MARCADOR}*{_TERMO_MARCADOR}(?:{_LACUNA_MARCADOR}+{_TERMO_MARCADOR})*{_LACUNA_MARCADOR}*'
+)
+
+
+def ler_pacote(caminho):
+    """Lê e valida um pacote de regras; retorna (conteúdo, SHA-256 do arquivo)"""
+    dados = Path(caminho).read_bytes()
+
+    try:
+        pacote = json.loads(dados)
+    except ValueError as e:
+        raise ValueError(f"Pacote de regras inválido em {caminho}: {e}") from e
+
+    if not isinstance(pacote, dict):
+        raise ValueError(f"Pacote de regras inválido em {caminho}: o conteúdo deve ser um objeto")
+
+    faltando = [campo for campo in CAMPOS_PACOTE if campo not in pacote]
+    if faltando:
+        raise ValueError(f"Pacote de regras inválido em {caminho}: faltam {', '.join(faltando)}")
+
+    for marcador in pacote['marcadores']:
+        if not isinstance(marcador, str) or not MARCADOR_VALIDO.fullmatch(marcador):
+            raise ValueError(
+                f"Pacote de regras inválido em {caminho}: marcador {marcador!r} não é uma sequência de palavras "
+                "(use palavras separadas por .*, .+, .{m,n} ou espaço e alternativas como (a|b); "
+                "classes como [çc], opcionais e escapes não são aceitos)"
+            )
+
+    for problema_id, problema in pacote['problemas'].items():
+        faltando = [campo for campo in CAMPOS_PROBLEMA if campo not in problema]
+        if faltando:
+            raise ValueError(f"Pacote de regras inválido em {caminho}: problema {problema_id} sem {', '.join(faltando)}")
+
+    for regra in pacote.get('regras_numericas', []):
+        faltando = [campo for campo in CAMPOS_REGRA_NUMERICA if campo not in regra]
+        if faltando:
+            raise ValueError(f"Pacote de regras inválido em {caminho}: regra numérica sem {', '.join(faltando)}")
+        if regra['comparacao'] not in COMPARACOES:
+            raise ValueError(f"Pacote de regras inválido em {caminho}: comparação {regra['comparacao']!r} desconhecida")
+        if regra['tipo'] is not None and regra['tipo'] not in TIPOS_VALOR:
+            raise ValueError(f"Pacote de regras inválido em {caminho}: tipo de valor {regra['tipo']!r} desconhecido")
+        if regra['unidade'] is not None and regra['unidade'] not in UNIDADES:
+            raise ValueError(f"Pacote de regras inválido em {caminho}: unidade {regra['unidade']!r} desconhecida")
+
+    return pacote, hashlib.sha256(dados).hexdigest()
+
+
+class CatalogoRegras:
+    """Pacotes de regras de um diretório, relidos quando os arquivos mudam
+    
+    O catálogo só lê e valida os arquivos; a compilação fica com o detector,
+    sob demanda por tipo. A ordem dos tipos segue o campo `ordem` dos pacotes
+    (desempate da classificação) e `versao` combina os hashes de conteúdo.
+    """
+    
+    def __init__(self, diretorio=None):
+        self.diretorio = Path(diretorio) if diretorio else DIRETORIO_PADRAO
+        self.pacotes = {}
+        self.hashes = {}
+        self._assinaturas = {}        # caminho -> (mtime_ns, tamanho)
+        self._tipos_por_caminho = {}
+        self._trava = threading.Lock()
+        self.recarregar(estrito=True)
+    
+    @property
+    def versao(self):
+        conteudo = json.dumps(sorted(self.hashes.items()))
+        return hashlib.sha256(conteudo.encode('utf-8')).hexdigest()[:16]
+    
+    def _assinar_arquivos(self):
+        assinaturas = {}
+        for caminho in sorted(self.diretorio.glob('*.json')):
+            try:
+                estado = caminho.stat()
+            except OSError:
+                continue
+            assinaturas[caminho] = (estado.st_mtime_ns, estado.st_size)
+        return assinaturas
+    
+    def recarregar(self, estrito=False):
+        """Relê os pacotes novos ou alterados e retorna os tipos que mudaram
+        
+        Na recarga a quente (estrito=False) um pacote inválido é ignorado com um
+        erro no log e a versão anterior dele continua valendo.
+        """
+        with self._trava:
+            assinaturas = self._assinar_arquivos()
+            if assinaturas == self._assinaturas:
+                return set()
+        
+            pacotes = {}
+            hashes = {}
+            tipos_por_caminho = {}
+        
+            for caminho, assinatura in assinaturas.items():
+                tipo_anterior = self._tipos_por_caminho.get(caminho)
+        
+                if tipo_anterior is not None and self._assinaturas.get(caminho) == assinatura:
+                    pacote, hash_pacote = self.pacotes[tipo_anterior], self.hashes[tipo_anterior]
+                else:
+                    try:
+                        pacote, hash_pacote = ler_pacote(caminho)
+                    except (OSError, ValueError) as e:
+                        if estrito:
+                            raise
+                        logger.error("Pacote de regras ignorado: %s", e)
+                        if tipo_anterior is None:
+                            continue
+                        pacote, hash_pacote = self.pacotes[tipo_anterior], self.hashes[tipo_anterior]
+        
+                tipo_doc = pacote['tipo_documento']
+                if tipo_doc in pacotes:
+                    mensagem = f"Tipo {tipo_doc} definido em mais de um pacote ({caminho})"
+                    if estrito:
+                        raise ValueError(mensagem)
+                    logger.error("Pacote de regras ignorado: %s", mensagem)
+                    continue
+        
+                pacotes[tipo_doc] = pacote
+                hashes[tipo_doc] = hash_pacote
+                tipos_por_caminho[caminho] = tipo_doc
+        
+            alterados = {
+                tipo_doc for tipo_doc in pacotes.keys() | self.pacotes.keys()
+                if hashes.get(tipo_doc) != self.hashes.get(tipo_doc)
+            }
+        
+            ordem = sorted(pacotes, key=lambda tipo_doc: (pacotes[tipo_doc].get('ordem', 0), tipo_doc))
+            self.pacotes = {tipo_doc: pacotes[tipo_doc] for tipo_doc in ordem}
+            self.hashes = hashes
+            self._tipos_por_caminho = tipos_por_caminho
+            self._assinaturas = assinaturas
+        
+            return alterados
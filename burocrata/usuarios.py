@@ -0,0 +1,421 @@
+"""Usuários e sessões atrás de uma interface única, com backends plugáveis
+
+    sqlite          arquivo local em WAL, e-mail indexado e pool de conexões (padrão)
+    supabase        tabelas `usuarios` e `sessoes` de um projeto Supabase
+                    (exige SUPABASE_URL e SUPABASE_KEY)
+    supabase_local  o mesmo backend sobre ClienteSupabaseLocal, em memória,
+                    para testes (só quando escolhido explicitamente)
+
+O backend vem da variável BUROCRATA_USUARIOS. O token de sessão só existe do
+lado do cliente: os backends guardam o SHA-256 dele.
+"""
+
+import os
+import copy
+import time
+import queue
+import sqlite3
+import hashlib
+import secrets
+import threading
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+
+VALIDADE_SESSAO = 12 * 3600  # segundos
+TAMANHO_POOL = 4
+
+
+def normalizar_email(email):
+    return (email or '').strip().lower()
+
+
+def gerar_token():
+    """Token de sessão (retornado ao cliente) e o hash dele (o que vai para o banco)"""
+    token = secrets.token_urlsafe(32)
+    return token, hash_token(token)
+
+
+def hash_token(token):
+    return hashlib.sha256(token.encode('utf-8')).hexdigest()
+
+
+class RepositorioUsuarios(ABC):
+    """Interface dos backends: usuários são dicts com id, email, nome e hash_senha
+
+    criar_usuario levanta ValueError se o e-mail já existir; obter_sessao
+    devolve o usuário dono de um token válido (ou None).
+    """
+
+    @abstractmethod
+    def buscar_por_email(self, email):
+        ...
+
+    @abstractmethod
+    def criar_usuario(self, email, nome, hash_senha):
+        ...
+
+    @abstractmethod
+    def atualizar_hash(self, usuario_id, hash_senha):
+        ...
+
+    @abstractmethod
+    def criar_sessao(self, usuario_id, validade=VALIDADE_SESSAO):
+        """Abre uma sessão e retorna o token"""
+        ...
+
+    @abstractmethod
+    def obter_sessao(self, token):
+        ...
+
+    @abstractmethod
+    def encerrar_sessao(self, token):
+        ...
+
+    def fechar(self):
+        pass
+
+
+# --------------------------------------------------
+# BACKEND SQLITE
+# --------------------------------------------------
+
+class PoolConexoes:
+    """Conexões SQLite reaproveitadas entre as threads de sessão do Streamlit
+
+    Cada thread pega uma conexão livre (ou abre uma nova, até `tamanho`) e a
+    devolve ao sair do bloco; com todas ocupadas, espera até `espera`
+    segundos. As conexões guardam as instruções preparadas (cached_statements),
+    então as consultas fixas do repositório são compiladas uma vez por
+    conexão. Após um fork o pool é descartado: conexões não atravessam processos.
+    """
+
+    def __init__(self, caminho, tamanho=TAMANHO_POOL, espera=10.0, inicializar=None):
+        self.caminho = caminho
+        self.tamanho = tamanho
+        self.espera = espera
+        self._inicializar = inicializar
+        self._livres = queue.LifoQueue()
+        self._abertas = 0
+        self._lock = threading.Lock()
+        self._pid = os.getpid()
+
+    def _abrir(self):
+        conn = sqlite3.connect(self.caminho, timeout=5, check_same_thread=False, cached_statements=64)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA foreign_keys=ON")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        if self._inicializar is not None:
+            self._inicializar(conn)
+        return conn
+
+    def _reiniciar_se_bifurcado(self):
+        if os.getpid() != self._pid:
+            with self._lock:
+                if os.getpid() != self._pid:
+                    self._livres = queue.LifoQueue()
+                    self._abertas = 0
+                    self._pid = os.getpid()
+
+    @contextmanager
+    def conexao(self):
+        """Conexão em transação: commit ao sair do bloco, rollback em exceção"""
+        self._reiniciar_se_bifurcado()
+        try:
+            conn = self._livres.get_nowait()
+        except queue.Empty:
+            with self._lock:
+                abrir = self._abertas < self.tamanho
+                if abrir:
+                    self._abertas += 1
+            if abrir:
+                try:
+                    conn = self._abrir()
+                except BaseException:
+                    with self._lock:
+                        self._abertas -= 1
+                    raise
+            else:
+                try:
+                    conn = self._livres.get(timeout=self.espera)
+                except queue.Empty:
+                    raise TimeoutError("Nenhuma conexão livre no pool de usuários") from None
+
+        try:
+            with conn:
+                yield conn
+        finally:
+            self._livres.put(conn)
+
+    def fechar(self):
+        while True:
+            try:
+                self._livres.get_nowait().close()
+            except queue.Empty:
+                break
+
+
+class RepositorioSQLite(RepositorioUsuarios):
+    """Usuários e sessões em um arquivo SQLite (WAL)"""
+
+    def __init__(self, caminho='burocrata_usuarios.sqlite3', tamanho_pool=TAMANHO_POOL):
+        self.caminho = caminho
+        self._pool = PoolConexoes(caminho, tamanho_pool)
+
+        with self._pool.conexao() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS usuarios (
+                    id INTEGER PRIMARY KEY,
+                    email TEXT NOT NULL,
+                    nome TEXT NOT NULL,
+                    hash_senha TEXT NOT NULL,
+                    criado_em REAL NOT NULL
+                )
+            """)
+            conn.execute("CREATE UNIQUE INDEX IF NOT EXISTS idx_usuarios_email ON usuarios (email)")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS sessoes (
+                    token_hash TEXT PRIMARY KEY,
+                    usuario_id INTEGER NOT NULL REFERENCES usuarios (id) ON DELETE CASCADE,
+                    expira_em REAL NOT NULL
+                )
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_sessoes_usuario ON sessoes (usuario_id)")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_sessoes_expiracao ON sessoes (expira_em)")
+
+    @staticmethod
+    def _usuario(linha):
+        return None if linha is None else {chave: linha[chave] for chave in ('id', 'email', 'nome', 'hash_senha')}
+
+    def buscar_por_email(self, email):
+        with self._pool.conexao() as conn:
+            linha = conn.execute(
+                "SELECT id, email, nome, hash_senha FROM usuarios WHERE email = ?", (normalizar_email(email),)
+            ).fetchone()
+        return self._usuario(linha)
+
+    def criar_usuario(self, email, nome, hash_senha):
+        email = normalizar_email(email)
+        try:
+            with self._pool.conexao() as conn:
+                cursor = conn.execute(
+                    "INSERT INTO usuarios (email, nome, hash_senha, criado_em) VALUES (?, ?, ?, ?)",
+                    (email, nome, hash_senha, time.time())
+                )
+        except sqlite3.IntegrityError:
+            raise ValueError(f"E-mail já cadastrado: {email}") from None
+        return {'id': cursor.lastrowid, 'email': email, 'nome': nome, 'hash_senha': hash_senha}
+
+    def atualizar_hash(self, usuario_id, hash_senha):
+        with self._pool.conexao() as conn:
+            conn.execute("UPDATE usuarios SET hash_senha = ? WHERE id = ?", (hash_senha, usuario_id))
+
+    def criar_sessao(self, usuario_id, validade=VALIDADE_SESSAO):
+        token, token_hash = gerar_token()
+        agora = time.time()
+        with self._pool.conexao() as conn:
+            # Limpeza oportunista: as sessões vencidas saem pelo índice de expiração
+            conn.execute("DELETE FROM sessoes WHERE expira_em <= ?", (agora,))
+            conn.execute(
+                "INSERT INTO sessoes (token_hash, usuario_id, expira_em) VALUES (?, ?, ?)",
+                (token_hash, usuario_id, agora + validade)
+            )
+        return token
+
+    def obter_sessao(self, token):
+        with self._pool.conexao() as conn:
+            linha = conn.execute(
+                "SELECT u.id, u.email, u.nome, u.hash_senha FROM sessoes s "
+                "JOIN usuarios u ON u.id = s.usuario_id WHERE s.token_hash = ? AND s.expira_em > ?",
+                (hash_token(token), time.time())
+            ).fetchone()
+        return self._usuario(linha)
+
+    def encerrar_sessao(self, token):
+        with self._pool.conexao() as conn:
+            conn.execute("DELETE FROM sessoes WHERE token_hash = ?", (hash_token(token),))
+
+    def fechar(self):
+        self._pool.fechar()
+
+
+# --------------------------------------------------
+# BACKEND SUPABASE (OU COMPATÍVEL)
+# --------------------------------------------------
+
+class RepositorioSupabase(RepositorioUsuarios):
+    """Usuários e sessões em tabelas de um cliente com a API do supabase-py
+
+    Espera as tabelas `usuarios` (id gerado, email único, nome, hash_senha) e
+    `sessoes` (token_hash, usuario_id, expira_em em segundos desde a época).
+    """
+
+    def __init__(self, cliente):
+        self.cliente = cliente
+
+    def buscar_por_email(self, email):
+        resposta = (
+            self.cliente.table('usuarios').select('id, email, nome, hash_senha')
+            .eq('email', normalizar_email(email)).limit(1).execute()
+        )
+        return resposta.data[0] if resposta.data else None
+
+    def criar_usuario(self, email, nome, hash_senha):
+        email = normalizar_email(email)
+        if self.buscar_por_email(email) is not None:
+            raise ValueError(f"E-mail já cadastrado: {email}")
+        resposta = self.cliente.table('usuarios').insert(
+            {'email': email, 'nome': nome, 'hash_senha': hash_senha}
+        ).execute()
+        return resposta.data[0]
+
+    def atualizar_hash(self, usuario_id, hash_senha):
+        self.cliente.table('usuarios').update({'hash_senha': hash_senha}).eq('id', usuario_id).execute()
+
+    def criar_sessao(self, usuario_id, validade=VALIDADE_SESSAO):
+        token, token_hash = gerar_token()
+        self.cliente.table('sessoes').insert(
+            {'token_hash': token_hash, 'usuario_id': usuario_id, 'expira_em': time.time() + validade}
+        ).execute()
+        return token
+
+    def obter_sessao(self, token):
+        resposta = (
+            self.cliente.table('sessoes').select('usuario_id')
+            .eq('token_hash', hash_token(token)).gt('expira_em', time.time()).limit(1).execute()
+        )
+        if not resposta.data:
+            return None
+        usuarios = (
+            self.cliente.table('usuarios').select('id, email, nome, hash_senha')
+            .eq('id', resposta.data[0]['usuario_id']).limit(1).execute()
+        )
+        return usuarios.data[0] if usuarios.data else None
+
+    def encerrar_sessao(self, token):
+        self.cliente.table('sessoes').delete().eq('token_hash', hash_token(token)).execute()
+
+
+class _RespostaLocal:
+    def __init__(self, data):
+        self.data = data
+
+
+class _ConsultaLocal:
+    """Subconjunto do construtor de consultas do supabase-py usado por RepositorioSupabase"""
+
+    def __init__(self, cliente, tabela):
+        self._cliente = cliente
+        self._tabela = tabela
+        self._operacao = 'select'
+        self._valores = None
+        self._colunas = None
+        self._filtros = []
+        self._limite = None
+
+    def select(self, colunas='*'):
+        self._operacao = 'select'
+        self._colunas = None if colunas.strip() == '*' else [coluna.strip() for coluna in colunas.split(',')]
+        return self
+
+    def insert(self, valores):
+        self._operacao, self._valores = 'insert', valores
+        return self
+
+    def update(self, valores):
+        self._operacao, self._valores = 'update', valores
+        return self
+
+    def delete(self):
+        self._operacao = 'delete'
+        return self
+
+    def eq(self, coluna, valor):
+        self._filtros.append(lambda linha: linha.get(coluna) == valor)
+        return self
+
+    def gt(self, coluna, valor):
+        self._filtros.append(lambda linha: linha.get(coluna) is not None and linha[coluna] > valor)
+        return self
+
+    def limit(self, quantidade):
+        self._limite = quantidade
+        return self
+
+    def _projetar(self, linha):
+        linha = copy.deepcopy(linha)
+        return linha if self._colunas is None else {coluna: linha.get(coluna) for coluna in self._colunas}
+
+    def execute(self):
+        with self._cliente.lock:
+            linhas = self._cliente.tabelas.setdefault(self._tabela, [])
+
+            if self._operacao == 'insert':
+                novas = self._valores if isinstance(self._valores, list) else [self._valores]
+                inseridas = []
+                for valores in novas:
+                    linha = dict(valores)
+                    if 'id' not in linha:
+                        self._cliente.sequencia += 1
+                        linha['id'] = self._cliente.sequencia
+                    linhas.append(linha)
+                    inseridas.append(copy.deepcopy(linha))
+                return _RespostaLocal(inseridas)
+
+            selecionadas = [linha for linha in linhas if all(filtro(linha) for filtro in self._filtros)]
+            if self._limite is not None:
+                selecionadas = selecionadas[:self._limite]
+
+            if self._operacao == 'update':
+                for linha in selecionadas:
+                    linha.update(self._valores)
+            elif self._operacao == 'delete':
+                ids = {id(linha) for linha in selecionadas}
+                linhas[:] = [linha for linha in linhas if id(linha) not in ids]
+            return _RespostaLocal([self._projetar(linha) for linha in selecionadas])
+
+
+class ClienteSupabaseLocal:
+    """Substituto em memória do cliente Supabase (table/select/eq/gt/limit/insert/update/delete)"""
+
+    def __init__(self):
+        self.tabelas = {}
+        self.sequencia = 0
+        self.lock = threading.Lock()
+
+    def table(self, nome):
+        return _ConsultaLocal(self, nome)
+
+
+def _criar_supabase():
+    url = os.environ.get('SUPABASE_URL')
+    chave = os.environ.get('SUPABASE_KEY')
+    if not url or not chave:
+        raise ValueError("Backend de usuários 'supabase' exige SUPABASE_URL e SUPABASE_KEY")
+
+    from supabase import create_client
+    return RepositorioSupabase(create_client(url, chave))
+
+
+def _criar_supabase_local():
+    return RepositorioSupabase(ClienteSupabaseLocal())
+
+
+BACKENDS = {
+    'sqlite': RepositorioSQLite,
+    'supabase': _criar_supabase,
+    'supabase_local': _criar_supabase_local,
+}
+
+
+def backend_padrao():
+    """Backend de usuários (variável BUROCRATA_USUARIOS: um nome de BACKENDS)"""
+    nome = os.environ.get('BUROCRATA_USUARIOS', 'sqlite')
+    return nome if nome in BACKENDS else 'sqlite'
+
+
+def criar_repositorio(backend=None):
+    backend = backend or backend_padrao()
+    if backend not in BACKENDS:
+        raise ValueError(f"Backend de usuários desconhecido: {backend}")
+    return BACKENDS[backend]()